@@ -0,0 +1,149 @@
+"""Threaded camera capture into a ring buffer of preallocated frames.
+
+A background thread grabs frames from an opened ``cv2.VideoCapture`` straight
+into slots of one preallocated ``(slots, H, W, C)`` numpy array. Consumers
+(preview, ML analytics, multi-face monitor, iris preview) call ``latest()``
+and get a *view* of the newest slot – no copy. A view stays valid until the
+writer wraps around to that slot again, i.e. for ``slots - 1`` further
+frames; consumers that hold a frame longer must ``.copy()`` it.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+class FrameRing:
+    """Fixed-size ring of preallocated frames with sequence numbers."""
+
+    def __init__(self, slots: int, shape: Tuple[int, ...], dtype=np.uint8):
+        if slots < 2:
+            raise ValueError("FrameRing needs at least 2 slots")
+        self.frames = np.empty((slots,) + tuple(shape), dtype=dtype)
+        self._seqs = [0] * slots
+        self._read = [True] * slots
+        self._latest = -1
+        self._next_seq = 1
+        self._lock = threading.Lock()
+        self.overwritten_unread = 0
+
+    @property
+    def slots(self) -> int:
+        return self.frames.shape[0]
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.frames.shape[1:]
+
+    def next_slot(self) -> Tuple[int, np.ndarray]:
+        """Slot the writer should fill next (never the one just published)."""
+        idx = (self._latest + 1) % self.slots
+        return idx, self.frames[idx]
+
+    def publish(self, idx: int) -> int:
+        with self._lock:
+            if not self._read[idx] and self._seqs[idx]:
+                self.overwritten_unread += 1
+            seq = self._next_seq
+            self._next_seq += 1
+            self._seqs[idx] = seq
+            self._read[idx] = False
+            self._latest = idx
+            return seq
+
+    def latest(self) -> Tuple[int, Optional[np.ndarray]]:
+        """(seq, view of newest frame); (0, None) before the first frame."""
+        with self._lock:
+            if self._latest < 0:
+                return 0, None
+            idx = self._latest
+            self._read[idx] = True
+            return self._seqs[idx], self.frames[idx]
+
+
+class CameraStream:
+    """Owns the capture thread for an opened ``cv2.VideoCapture``."""
+
+    def __init__(self, capture, slots: int = 4, fps_window: int = 60):
+        self.capture = capture
+        self.slots = slots
+        self.ring: Optional[FrameRing] = None
+        self.read_failures = 0
+        self._stamps: deque = deque(maxlen=fps_window)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="camera-capture", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def latest(self) -> Tuple[int, Optional[np.ndarray]]:
+        if self.ring is None:
+            return 0, None
+        return self.ring.latest()
+
+    def _run(self) -> None:
+        consecutive_failures = 0
+        while not self._stop.is_set():
+            if self.ring is None:
+                ok, frame = self.capture.read()
+                if ok and frame is not None:
+                    self.ring = FrameRing(self.slots, frame.shape, frame.dtype)
+                    _, slot = self.ring.next_slot()
+                    np.copyto(slot, frame)
+                    self._published(0)
+                    consecutive_failures = 0
+                    continue
+            else:
+                idx, slot = self.ring.next_slot()
+                # cv2 decodes into `slot` when shape/dtype match
+                ok, frame = self.capture.read(slot)
+                if ok and frame is not None:
+                    if frame is not slot and frame.base is not slot:
+                        if frame.shape != self.ring.shape:
+                            # resolution changed: reallocate the ring
+                            self.ring = None
+                            continue
+                        np.copyto(slot, frame)
+                    self._published(idx)
+                    consecutive_failures = 0
+                    continue
+            self.read_failures += 1
+            consecutive_failures += 1
+            if consecutive_failures > 50:
+                # camera gone; let owners notice via running()
+                break
+            time.sleep(0.01)
+
+    def _published(self, idx: int) -> None:
+        self.ring.publish(idx)
+        self._stamps.append(time.perf_counter())
+
+    def stats(self) -> Dict[str, Any]:
+        """Effective FPS over the recent window and drop counters."""
+        stamps = list(self._stamps)
+        fps = 0.0
+        if len(stamps) >= 2 and stamps[-1] > stamps[0]:
+            fps = (len(stamps) - 1) / (stamps[-1] - stamps[0])
+        return {
+            "fps": round(fps, 1),
+            "dropped": self.ring.overwritten_unread if self.ring else 0,
+            "read_failures": self.read_failures,
+        }
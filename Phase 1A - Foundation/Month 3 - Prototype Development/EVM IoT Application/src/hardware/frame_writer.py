@@ -0,0 +1,132 @@
+"""Background writer for annotated camera frames.
+
+The capture loop hands frames to ``FrameWriter.submit``, which never blocks:
+frames go onto a bounded queue drained by worker threads (JPEG encoding and
+``cv2.VideoWriter`` release the GIL). When storage cannot keep up the queue
+overflows and frames are dropped per policy – ``"oldest"`` keeps the most
+recent frames, ``"newest"`` keeps the backlog – so capture and inference
+speed do not depend on disk speed. Frames must not be modified after submit.
+"""
+
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import cv2
+
+_STOP = object()
+
+
+class FrameWriter:
+    """Writes frames as JPEG files or into a single MJPEG/AVI container."""
+
+    def __init__(
+        self,
+        out_dir,
+        workers: int = 2,
+        queue_size: int = 32,
+        drop: str = "oldest",
+        sample_every: int = 1,
+        video_path: Optional[str] = None,
+        fps: float = 15.0,
+        jpeg_quality: int = 90,
+    ):
+        if drop not in ("oldest", "newest"):
+            raise ValueError("drop must be 'oldest' or 'newest'")
+        self.out_dir = Path(out_dir)
+        self.drop = drop
+        self.sample_every = max(1, sample_every)
+        self.video_path = Path(video_path) if video_path else None
+        self.fps = fps
+        self.jpeg_quality = jpeg_quality
+        # A container is written sequentially: one worker only
+        self.workers = 1 if self.video_path else max(1, workers)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+        self._threads: List[threading.Thread] = []
+        self._video = None
+        self._seen = 0
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "written": 0, "dropped": 0, "skipped": 0, "errors": 0}
+
+    def start(self) -> "FrameWriter":
+        if self.video_path is not None:
+            self.video_path.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"frame-writer-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def submit(self, frame) -> bool:
+        """Queue a frame; False if it was sampled out or dropped."""
+        self._seen += 1
+        if (self._seen - 1) % self.sample_every:
+            self._count("skipped")
+            return False
+        item = (datetime.now().strftime("%Y%m%d_%H%M%S_%f"), frame)
+        self._count("submitted")
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return True
+            except queue.Full:
+                if self.drop == "newest":
+                    self._count("dropped")
+                    return False
+            try:
+                self._queue.get_nowait()
+                self._count("dropped")
+            except queue.Empty:
+                pass
+
+    def close(self, timeout: Optional[float] = None) -> Dict[str, int]:
+        """Write what is queued, stop the workers and return the stats."""
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+        if self._video is not None:
+            self._video.release()
+            self._video = None
+        return dict(self.stats)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            stamp, frame = item
+            try:
+                if self.video_path is not None:
+                    self._write_video(frame)
+                else:
+                    self._write_jpeg(stamp, frame)
+                self._count("written")
+            except Exception:
+                self._count("errors")
+
+    def _write_jpeg(self, stamp: str, frame) -> None:
+        ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise IOError("JPEG encoding failed")
+        (self.out_dir / f"frame_{stamp}.jpg").write_bytes(buf.tobytes())
+
+    def _write_video(self, frame) -> None:
+        if self._video is None:
+            h, w = frame.shape[:2]
+            self._video = cv2.VideoWriter(
+                str(self.video_path), cv2.VideoWriter_fourcc(*"MJPG"), self.fps, (w, h)
+            )
+            if not self._video.isOpened():
+                self._video = None
+                raise IOError(f"Cannot open video writer: {self.video_path}")
+        self._video.write(frame)
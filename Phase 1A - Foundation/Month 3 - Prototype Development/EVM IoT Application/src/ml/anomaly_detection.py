@@ -2,11 +2,145 @@
 Anomaly Detection Calibration
 Language: Python
 Handles: Fine-tuning thresholds for anomaly detection
+
+Thresholds are estimated with the P² algorithm (Jain & Chlamtac, 1985),
+which tracks a quantile with five markers in constant memory, so score
+streams of any length can be calibrated without keeping the history.
+Batches are scored with one vectorized comparison.
 """
 
+from typing import Iterable, Optional
+
 import numpy as np
 
 
+class P2Quantile:
+    def __init__(self, q: float = 0.95):
+        """
+        Online estimate of the `q` quantile of a stream.
+        :param q: Quantile in (0, 1).
+        """
+        if not 0.0 < q < 1.0:
+            raise ValueError("q must be in (0, 1)")
+        self.q = q
+        self.count = 0
+        self._heights: list = []
+        self._pos = [0.0, 1.0, 2.0, 3.0, 4.0]
+        self._desired = [0.0, 2 * q, 4 * q, 2 + 2 * q, 4.0]
+        self._step = [0.0, q / 2, q, (1 + q) / 2, 1.0]
+
+    @property
+    def value(self) -> Optional[float]:
+        """Current estimate (exact while fewer than five values were seen)."""
+        if self.count == 0:
+            return None
+        if self.count < 5:
+            return float(np.percentile(self._heights, self.q * 100))
+        return self._heights[2]
+
+    def update(self, x: float) -> None:
+        self.extend((x,))
+
+    def extend(self, values: Iterable[float]) -> None:
+        """Feed a batch (any iterable or array) of observations."""
+        h, n, desired, step = self._heights, self._pos, self._desired, self._step
+        if hasattr(values, "__len__"):
+            values = np.asarray(values, dtype=np.float64).ravel().tolist()
+        for x in values:
+            x = float(x)
+            self.count += 1
+            if self.count <= 5:
+                h.append(x)
+                if self.count == 5:
+                    h.sort()
+                continue
+            if x < h[0]:
+                h[0] = x
+                k = 0
+            elif x >= h[4]:
+                h[4] = x
+                k = 3
+            elif x < h[1]:
+                k = 0
+            elif x < h[2]:
+                k = 1
+            elif x < h[3]:
+                k = 2
+            else:
+                k = 3
+            for i in range(k + 1, 5):
+                n[i] += 1
+            for i in range(5):
+                desired[i] += step[i]
+            for i in (1, 2, 3):
+                d = desired[i] - n[i]
+                if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                    d = 1.0 if d > 0 else -1.0
+                    # Piecewise-parabolic prediction; fall back to linear
+                    hp = h[i] + d / (n[i + 1] - n[i - 1]) * (
+                        (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+                        + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+                    )
+                    if not h[i - 1] < hp < h[i + 1]:
+                        j = i + int(d)
+                        hp = h[i] + d * (h[j] - h[i]) / (n[j] - n[i])
+                    h[i] = hp
+                    n[i] += d
+
+
+class StreamingAnomalyDetector:
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        window: Optional[int] = None,
+        initial_threshold: float = 0.5,
+        min_samples: int = 100,
+    ):
+        """
+        Streaming detector: flags scores above a running quantile.
+        :param quantile: Quantile used as the threshold.
+        :param window: Observations per recalibration window; None keeps one
+            sketch over the whole stream. With a window, a fresh sketch is
+            started every `window` observations (the previous threshold is
+            kept until it has `min_samples`), so it tracks drift.
+        :param initial_threshold: Threshold until `min_samples` were seen.
+        :param min_samples: Observations needed before the sketch is trusted.
+        """
+        self.quantile = quantile
+        self.window = window
+        self.min_samples = min_samples
+        self.threshold = initial_threshold
+        self._sketch = P2Quantile(quantile)
+        self.seen = 0
+        self.flagged = 0
+
+    def update(self, scores) -> None:
+        """Feed scores into the sketch and refresh the threshold."""
+        scores = np.asarray(scores, dtype=np.float64).ravel()
+        while len(scores):
+            take = len(scores)
+            if self.window:
+                take = min(take, self.window - self._sketch.count)
+            self._sketch.extend(scores[:take])
+            scores = scores[take:]
+            self.seen += take
+            if self._sketch.count >= self.min_samples:
+                self.threshold = self._sketch.value
+            if self.window and self._sketch.count >= self.window:
+                self._sketch = P2Quantile(self.quantile)
+
+    def score(self, scores) -> np.ndarray:
+        """Boolean mask of scores above the current threshold."""
+        return np.asarray(scores, dtype=np.float64) > self.threshold
+
+    def process(self, scores) -> np.ndarray:
+        """Flag a batch against the current threshold, then learn from it."""
+        mask = self.score(scores)
+        self.flagged += int(mask.sum())
+        self.update(scores)
+        return mask
+
+
 class AnomalyDetection:
     def __init__(self):
         self.threshold = 0.5  # Default threshold
@@ -14,19 +148,29 @@ class AnomalyDetection:
     def calibrate_threshold(self, data):
         """
         Calibrate the anomaly detection threshold based on data.
-        :param data: List of anomaly scores.
+        :param data: Anomaly scores. Arrays and lists get the exact 95th
+            percentile; other iterables (e.g. a generator over a log) are
+            consumed in constant memory with a P² estimate.
         """
-        self.threshold = np.percentile(data, 95)  # Set threshold to 95th percentile
+        if hasattr(data, "__len__"):
+            if len(data):
+                self.threshold = float(np.percentile(data, 95))  # 95th percentile
+        else:
+            sketch = P2Quantile(0.95)
+            sketch.extend(data)
+            if sketch.value is not None:
+                self.threshold = sketch.value
         print(f"[Anomaly Detection] Threshold calibrated to: {self.threshold}")
 
     def detect_anomalies(self, data):
         """
         Detect anomalies based on the calibrated threshold.
-        :param data: List of anomaly scores.
-        :return: List of detected anomalies.
+        :param data: Array or list of anomaly scores.
+        :return: Array of detected anomalies.
         """
-        anomalies = [score for score in data if score > self.threshold]
-        print(f"[Anomaly Detection] Detected anomalies: {anomalies}")
+        scores = np.asarray(data, dtype=np.float64)
+        anomalies = scores[scores > self.threshold]
+        print(f"[Anomaly Detection] Detected {len(anomalies)} anomalies")
         return anomalies
 
 
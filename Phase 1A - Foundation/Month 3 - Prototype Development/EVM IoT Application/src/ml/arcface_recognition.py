@@ -4,32 +4,124 @@ Language: Python
 Handles: Highly accurate face recognition using ArcFace
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import cv2
 import numpy as np
-import tensorflow as tf
-from sklearn.preprocessing import normalize
 
 
 class ArcFaceRecognition:
-    def __init__(self, model_path):
+    INPUT_SIZE = 112
+
+    def __init__(self, model_path, batch_size=64, workers=4, model=None):
         """
         Initialize the ArcFace model.
         :param model_path: Path to the pre-trained ArcFace model.
+        :param batch_size: Images per inference call in `get_embeddings`.
+        :param workers: Threads decoding/resizing images in `get_embeddings`.
+        :param model: Already loaded model (skips loading `model_path`).
         """
-        self.model = tf.keras.models.load_model(model_path)
+        if model is None:
+            import tensorflow as tf
+
+            model = tf.keras.models.load_model(model_path)
+        self.model = model
+        self.batch_size = batch_size
+        self.workers = workers
+
+    def _load(self, image):
+        """BGR image from a path, or an already decoded BGR array."""
+        if isinstance(image, (str, Path)):
+            decoded = cv2.imread(str(image))
+            if decoded is None:
+                raise ValueError(f"Could not read image: {image}")
+            return decoded
+        return image
+
+    @staticmethod
+    def _as_bgr8(image):
+        """3-channel uint8 view/copy of a gray, BGR or BGRA image."""
+        if image.dtype != np.uint8:
+            image = np.clip(image, 0, 255).astype(np.uint8)
+        if image.ndim == 2 or image.shape[2] == 1:
+            return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        if image.shape[2] == 4:
+            return cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+        return image
+
+    def _load_resized(self, image, out):
+        # dst is only written in place when shape and dtype match exactly,
+        # hence the normalization and the check on what resize returned
+        resized = cv2.resize(
+            self._as_bgr8(self._load(image)), (self.INPUT_SIZE, self.INPUT_SIZE), dst=out
+        )
+        if not np.shares_memory(resized, out):
+            out[...] = resized
+
+    def _to_tensor(self, batch_bgr):
+        """(N,112,112,3) uint8 BGR -> (N,3,112,112) float32 RGB in [-1, 1]."""
+        rgb = batch_bgr[..., ::-1].transpose(0, 3, 1, 2)
+        tensor = np.empty(rgb.shape, dtype=np.float32)
+        np.subtract(rgb, np.float32(127.5), out=tensor, dtype=np.float32)
+        tensor *= np.float32(1.0 / 128.0)
+        return tensor
 
     def preprocess_image(self, image_path):
         """
         Preprocess the input image for ArcFace.
-        :param image_path: Path to the image file.
+        :param image_path: Path to the image file (or a BGR array).
         :return: Preprocessed image.
         """
-        image = cv2.imread(image_path)
-        image = cv2.resize(image, (112, 112))
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        image = np.transpose(image, (2, 0, 1))  # HWC to CHW
-        image = normalize(image, axis=1)
-        return np.expand_dims(image, axis=0)
+        return self.preprocess_batch([image_path])
+
+    def preprocess_batch(self, images, pool=None):
+        """
+        Decode (in a thread pool) and preprocess images into one tensor.
+        :param images: Image paths and/or BGR arrays.
+        :param pool: Executor to decode with; one is created if omitted.
+        :return: (N, 3, 112, 112) float32 tensor.
+        """
+        size = self.INPUT_SIZE
+        batch = np.empty((len(images), size, size, 3), dtype=np.uint8)
+        if pool is not None:
+            list(pool.map(self._load_resized, images, batch))
+        elif len(images) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as own:
+                list(own.map(self._load_resized, images, batch))
+        else:
+            for image, out in zip(images, batch):
+                self._load_resized(image, out)
+        return self._to_tensor(batch)
+
+    def get_embeddings(self, images, batch_size=None):
+        """
+        Embeddings for many faces, e.g. bulk enrollment of a photo roll.
+        Decoding of the next batch overlaps inference of the current one.
+        :param images: Image paths and/or BGR arrays.
+        :param batch_size: Images per inference call (default: self.batch_size).
+        :return: Contiguous (N, D) float32 embedding matrix.
+        """
+        images = list(images)
+        batch_size = batch_size or self.batch_size
+        chunks = [images[i : i + batch_size] for i in range(0, len(images), batch_size)]
+        out = None
+        with ThreadPoolExecutor(max_workers=self.workers) as pool, ThreadPoolExecutor(
+            max_workers=1
+        ) as prefetch:
+            pending = prefetch.submit(self.preprocess_batch, chunks[0], pool) if chunks else None
+            start = 0
+            for i in range(len(chunks)):
+                tensor = pending.result()
+                if i + 1 < len(chunks):
+                    pending = prefetch.submit(self.preprocess_batch, chunks[i + 1], pool)
+                emb = np.asarray(self.model.predict_on_batch(tensor), dtype=np.float32)
+                emb = emb.reshape(len(tensor), -1)
+                if out is None:
+                    out = np.empty((len(images), emb.shape[1]), dtype=np.float32)
+                out[start : start + len(emb)] = emb
+                start += len(emb)
+        return out if out is not None else np.empty((0, 0), dtype=np.float32)
 
     def get_embedding(self, image_path):
         """
@@ -37,9 +129,7 @@ class ArcFaceRecognition:
         :param image_path: Path to the image file.
         :return: Face embedding vector.
         """
-        preprocessed_image = self.preprocess_image(image_path)
-        embedding = self.model.predict(preprocessed_image)
-        return embedding
+        return self.get_embeddings([image_path])
 
     def compare_faces(self, embedding1, embedding2, threshold=0.6):
         """
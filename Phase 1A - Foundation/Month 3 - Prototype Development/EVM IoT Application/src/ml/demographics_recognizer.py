@@ -3,19 +3,20 @@ Demographics recognizer for age and gender using OpenCV DNN or ONNXRuntime.
 Looks for:
 - Caffe models: models/deploy_age.prototxt + models/age_net.caffemodel
                 models/deploy_gender.prototxt + models/gender_net.caffemodel
-- OR single ONNX: models/age_gender.onnx (expects outputs [age_logits, gender_logits])
-Falls back to Unknown when models are not present.
+- OR single ONNX: models/age_gender.onnx (expects outputs [age_logits, gender_logits]),
+  or its INT8 variant models/age_gender.int8.onnx
+Falls back to Unknown when models are not present. Models are never
+downloaded here (see `scripts/prefetch_models.py`) and are checked against
+the model store manifest before loading.
 """
 
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import numpy as np
 
-try:
-    import onnxruntime as ort  # type: ignore
-except Exception:
-    ort = None
+from ml.model_store import ModelStore
+from ml.onnx_session import create_session
 
 
 class DemographicsRecognizer:
@@ -29,6 +30,8 @@ class DemographicsRecognizer:
         "(48-53)",
         "(60-100)",
     ]
+    INPUT_SIZE = 227
+    MEAN = (78.4263377603, 87.7689143744, 114.895847746)
 
     def __init__(self):
         repo_root = Path(__file__).resolve().parents[4]
@@ -43,15 +46,17 @@ class DemographicsRecognizer:
         self.age_net = None
         self.gender_net = None
         self.ort_sess = None
+        self._batch_ok = True  # cleared if the ONNX model only takes batch 1
+        store = ModelStore(self.models_dir)
 
         try:
             import cv2
 
-            if self.age_proto.exists() and self.age_model.exists():
+            if store.verify(self.age_proto) and store.verify(self.age_model):
                 self.age_net = cv2.dnn.readNetFromCaffe(
                     str(self.age_proto), str(self.age_model)
                 )
-            if self.gender_proto.exists() and self.gender_model.exists():
+            if store.verify(self.gender_proto) and store.verify(self.gender_model):
                 self.gender_net = cv2.dnn.readNetFromCaffe(
                     str(self.gender_proto), str(self.gender_model)
                 )
@@ -59,29 +64,8 @@ class DemographicsRecognizer:
             self.age_net = None
             self.gender_net = None
 
-        if ort is not None and self.age_gender_onnx.exists():
-            try:
-                self.ort_sess = ort.InferenceSession(str(self.age_gender_onnx), providers=["CPUExecutionProvider"])  # type: ignore
-            except Exception:
-                self.ort_sess = None
-
-        # If no models available, try auto-download Caffe age/gender models
-        if not self.available():
-            self._ensure_models_downloaded()
-            try:
-                import cv2
-
-                if self.age_proto.exists() and self.age_model.exists():
-                    self.age_net = cv2.dnn.readNetFromCaffe(
-                        str(self.age_proto), str(self.age_model)
-                    )
-                if self.gender_proto.exists() and self.gender_model.exists():
-                    self.gender_net = cv2.dnn.readNetFromCaffe(
-                        str(self.gender_proto), str(self.gender_model)
-                    )
-            except Exception:
-                self.age_net = None
-                self.gender_net = None
+        # Tuned shared session; uses age_gender.int8.onnx when present
+        self.ort_sess = create_session(self.age_gender_onnx, verify=store.verify)
 
     def available(self) -> bool:
         return any(
@@ -92,94 +76,106 @@ class DemographicsRecognizer:
             ]
         )
 
+    def warm_up(self) -> None:
+        """Run one dummy inference so the first real frame is not slowed."""
+        if self.available():
+            self.predict(np.zeros((227, 227, 3), dtype=np.uint8))
+
     def predict(self, face_rgb: np.ndarray) -> Tuple[str, float, str, float]:
         """Returns (age_bucket, age_conf, gender_label, gender_conf)."""
+        return self.predict_batch([face_rgb])[0]
+
+    def predict_batch(
+        self, faces_rgb: List[np.ndarray]
+    ) -> List[Tuple[str, float, str, float]]:
+        """`predict` for several face ROIs with one forward pass per model."""
+        unknown = ("Unknown", 0.0, "Unknown", 0.0)
+        if not faces_rgb:
+            return []
         try:
-            import cv2
-
-            blob = cv2.dnn.blobFromImage(
-                face_rgb,
-                1.0,
-                (227, 227),
-                (78.4263377603, 87.7689143744, 114.895847746),
-                swapRB=False,
-            )
+            blob = self.preprocess(faces_rgb)
         except Exception:
-            return ("Unknown", 0.0, "Unknown", 0.0)
+            return [unknown] * len(faces_rgb)
+        return self.predict_blob(blob)
+
+    def predict_blob(self, blob: np.ndarray) -> List[Tuple[str, float, str, float]]:
+        """`predict_batch` for an already built (N,3,227,227) blob."""
+        unknown = ("Unknown", 0.0, "Unknown", 0.0)
+        n = len(blob)
+        if n == 0:
+            return []
 
         # ONNX path if available
         if self.ort_sess is not None:
             try:
-                age_out, gender_out = self.ort_sess.run(None, {self.ort_sess.get_inputs()[0].name: blob})  # type: ignore
-                age_probs = self._softmax(age_out.squeeze())
-                gender_probs = self._softmax(gender_out.squeeze())
-                age_idx = int(np.argmax(age_probs))
-                gender_idx = int(np.argmax(gender_probs))
-                return (
-                    self.AGE_BUCKETS[age_idx],
-                    float(age_probs[age_idx]),
-                    ["Male", "Female"][gender_idx],
-                    float(gender_probs[gender_idx]),
-                )
+                age_out, gender_out = self._run(blob)
+                age_probs = self._softmax_rows(age_out.reshape(n, -1))
+                gender_probs = self._softmax_rows(gender_out.reshape(n, -1))
+                return self._labels(age_probs, gender_probs)
             except Exception:
                 pass
 
-        # Caffe path
-        age_bucket = "Unknown"
-        age_conf = 0.0
-        gender_label = "Unknown"
-        gender_conf = 0.0
+        # Caffe path (nets already end in softmax)
+        age_preds = gender_preds = None
         try:
-            import cv2
-
             if self.age_net is not None:
                 self.age_net.setInput(blob)
-                age_preds = self.age_net.forward().squeeze()
-                age_idx = int(np.argmax(age_preds))
-                age_bucket = self.AGE_BUCKETS[age_idx]
-                age_conf = float(age_preds[age_idx])
+                age_preds = self.age_net.forward().reshape(n, -1)
             if self.gender_net is not None:
                 self.gender_net.setInput(blob)
-                gender_preds = self.gender_net.forward().squeeze()
-                gender_idx = int(np.argmax(gender_preds))
-                gender_label = ["Male", "Female"][gender_idx]
-                gender_conf = float(gender_preds[gender_idx])
+                gender_preds = self.gender_net.forward().reshape(n, -1)
         except Exception:
-            pass
+            return [unknown] * n
+        return self._labels(age_preds, gender_preds, n)
+
+    def _run(self, blob: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(age, gender) outputs for an (N,3,227,227) blob; per-face if N is fixed to 1."""
+        name = self.ort_sess.get_inputs()[0].name  # type: ignore
+        if self._batch_ok or len(blob) == 1:
+            try:
+                age_out, gender_out = self.ort_sess.run(None, {name: blob})[:2]  # type: ignore
+                return age_out, gender_out
+            except Exception:
+                if len(blob) == 1:
+                    raise
+                # Model exported with a fixed batch dimension of 1
+                self._batch_ok = False
+        outs = [self.ort_sess.run(None, {name: blob[i : i + 1]})[:2] for i in range(len(blob))]  # type: ignore
+        return (
+            np.concatenate([o[0] for o in outs]),
+            np.concatenate([o[1] for o in outs]),
+        )
+
+    @staticmethod
+    def preprocess(faces_rgb: List[np.ndarray]) -> np.ndarray:
+        """(N,3,227,227) mean-subtracted blob for the age/gender nets."""
+        import cv2
+
+        size = DemographicsRecognizer.INPUT_SIZE
+        return cv2.dnn.blobFromImages(
+            faces_rgb, 1.0, (size, size), DemographicsRecognizer.MEAN, swapRB=False
+        )
+
+    def _labels(self, age_probs, gender_probs, n: Optional[int] = None):
+        n = n if n is not None else len(age_probs)
+        ages = [("Unknown", 0.0)] * n
+        genders = [("Unknown", 0.0)] * n
+        if age_probs is not None:
+            idx = age_probs.argmax(axis=1)
+            conf = age_probs[np.arange(n), idx]
+            ages = [(self.AGE_BUCKETS[int(i)], float(c)) for i, c in zip(idx, conf)]
+        if gender_probs is not None:
+            idx = gender_probs.argmax(axis=1)
+            conf = gender_probs[np.arange(n), idx]
+            genders = [(["Male", "Female"][int(i)], float(c)) for i, c in zip(idx, conf)]
+        return [a + g for a, g in zip(ages, genders)]
 
-        return (age_bucket, age_conf, gender_label, gender_conf)
+    @staticmethod
+    def _softmax_rows(logits: np.ndarray) -> np.ndarray:
+        exps = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exps / exps.sum(axis=1, keepdims=True)
 
     @staticmethod
     def _softmax(logits: np.ndarray) -> np.ndarray:
         exps = np.exp(logits - np.max(logits))
         return exps / np.sum(exps)
-
-    def _ensure_models_downloaded(self) -> None:
-        urls = {
-            self.age_proto: "https://raw.githubusercontent.com/spmallick/learnopencv/master/AgeGender/models/deploy_age.prototxt",
-            self.age_model: "https://raw.githubusercontent.com/spmallick/learnopencv/master/AgeGender/models/age_net.caffemodel",
-            self.gender_proto: "https://raw.githubusercontent.com/spmallick/learnopencv/master/AgeGender/models/deploy_gender.prototxt",
-            self.gender_model: "https://raw.githubusercontent.com/spmallick/learnopencv/master/AgeGender/models/gender_net.caffemodel",
-        }
-        try:
-            import requests  # type: ignore
-
-            self.models_dir.mkdir(parents=True, exist_ok=True)
-            for path, url in urls.items():
-                if not path.exists():
-                    resp = requests.get(url, timeout=20)
-                    if resp.status_code == 200:
-                        path.write_bytes(resp.content)
-        except Exception:
-            # Fallback to urllib if requests isn't available
-            try:
-                import urllib.request
-
-                self.models_dir.mkdir(parents=True, exist_ok=True)
-                for path, url in urls.items():
-                    if not path.exists():
-                        with urllib.request.urlopen(url, timeout=20) as resp:  # type: ignore
-                            data = resp.read()
-                            path.write_bytes(data)
-            except Exception:
-                pass
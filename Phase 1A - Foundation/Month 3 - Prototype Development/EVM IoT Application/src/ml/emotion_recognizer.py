@@ -1,26 +1,20 @@
 """
 Emotion recognition using optional ONNXRuntime with FER+ model.
-If `models/ferplus.onnx` is present, runs inference; otherwise uses a simple
-heuristic fallback (neutral/happiness). Auto-downloads FER+ ONNX if missing.
+If `models/ferplus.onnx` (or `ferplus.int8.onnx`) is present, runs inference;
+otherwise uses a simple heuristic fallback (neutral/happiness). The model is
+never downloaded here: fetch it with `scripts/prefetch_models.py`; it is
+checked against the model store manifest before loading.
 """
 
-import os
 from collections import Counter, deque
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import numpy as np
 
-try:
-    import onnxruntime as ort  # type: ignore
-except Exception:  # pragma: no cover
-    ort = None  # Fallback when onnxruntime isn't available
-
-# Optional fallback via DeepFace if ONNX model isn't available
-try:
-    from deepface import DeepFace  # type: ignore
-except Exception:
-    DeepFace = None  # type: ignore
+from ml.lazy_imports import optional_import
+from ml.model_store import ModelStore
+from ml.onnx_session import create_session
 
 
 EMOTIONS = [
@@ -36,6 +30,8 @@ EMOTIONS = [
 
 
 class EmotionRecognizer:
+    INPUT_SIZE = 64
+
     def __init__(self, model_path: Optional[Path] = None):
         # Default model path: repo_root/Phase 1A - Foundation/models/ferplus.onnx
         if model_path is None:
@@ -44,85 +40,133 @@ class EmotionRecognizer:
 
         self.model_path = model_path
         self.session = None
+        self._smile_cascade = None
+        # Cleared if the model rejects batches larger than 1
+        self._batch_ok = True
         # History buffer for temporal smoothing
         self._history = deque(maxlen=5)  # (label, conf) for recent frames
-        # Ensure model is available (auto-download if missing)
-        if not model_path.exists():
-            self._ensure_model_downloaded(model_path)
-        if ort is not None and model_path.exists():
-            try:
-                self.session = ort.InferenceSession(str(model_path), providers=["CPUExecutionProvider"])  # type: ignore
-            except Exception:
-                self.session = None
+        # Tuned shared session; uses ferplus.int8.onnx when present. Files
+        # failing the manifest check are not loaded (heuristic fallback)
+        store = ModelStore(model_path.parent)
+        self.session = create_session(model_path, verify=store.verify)
 
     def available(self) -> bool:
         return self.session is not None
 
-    def _preprocess(self, face_rgb: np.ndarray) -> np.ndarray:
+    def warm_up(self) -> None:
+        """Run one dummy inference so the first real frame is not slowed."""
+        if self.session is None:
+            # The fallback's first frame would otherwise pay for TensorFlow
+            optional_import("deepface.DeepFace")
+            return
+        dummy = np.zeros((1, 1, 64, 64), dtype=np.float32)
+        self.session.run(None, {self.session.get_inputs()[0].name: dummy})  # type: ignore
+
+    @staticmethod
+    def preprocess(face_rgb: np.ndarray) -> np.ndarray:
         """
         Convert face ROI (RGB) to 64x64 grayscale normalized tensor of shape (1,1,64,64).
         """
         import cv2
 
         gray = cv2.cvtColor(face_rgb, cv2.COLOR_RGB2GRAY)
-        resized = cv2.resize(gray, (64, 64), interpolation=cv2.INTER_AREA)
+        size = EmotionRecognizer.INPUT_SIZE
+        resized = cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA)
         norm = resized.astype(np.float32) / 255.0
         tensor = norm[np.newaxis, np.newaxis, :, :]  # (1,1,64,64)
         return tensor
 
     def predict(self, face_rgb: np.ndarray) -> Tuple[str, float]:
         """
-        Returns (emotion_label, confidence).
+        Returns (emotion_label, confidence), temporally smoothed.
         If ONNX model is unavailable, uses a simple heuristic fallback.
         """
         if self.session is None:
-            # Fallback: smile vs neutral. We avoid over-classifying happiness.
+            return self._smooth(*self._predict_fallback(face_rgb))
+        return self._smooth(*self.predict_batch([face_rgb])[0])
+
+    def predict_batch(self, faces_rgb: List[np.ndarray]) -> List[Tuple[str, float]]:
+        """
+        Classify several face ROIs (RGB) with one session call.
+
+        Results are *not* smoothed: the history buffer is per face, so
+        callers tracking several faces should smooth per face themselves.
+        """
+        if not faces_rgb:
+            return []
+        if self.session is None:
+            return [self._predict_fallback(f) for f in faces_rgb]
+        try:
+            batch = np.concatenate([self.preprocess(f) for f in faces_rgb])
+        except Exception:
+            return [("Unknown", 0.0)] * len(faces_rgb)
+        return self.predict_tensor(batch)
+
+    def predict_tensor(self, batch: np.ndarray) -> List[Tuple[str, float]]:
+        """`predict_batch` for an already preprocessed (N,1,64,64) tensor."""
+        if self.session is None or len(batch) == 0:
+            return [("Unknown", 0.0)] * len(batch)
+        try:
+            logits = self._run(batch).reshape(len(batch), -1)
+        except Exception:
+            return [("Unknown", 0.0)] * len(batch)
+        # Row-wise softmax
+        exps = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs = exps / exps.sum(axis=1, keepdims=True)
+        idx = probs.argmax(axis=1)
+        conf = probs[np.arange(len(idx)), idx]
+        return [(EMOTIONS[int(i)], float(c)) for i, c in zip(idx, conf)]
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        """One session call for an (N,1,64,64) batch; per-face if N is fixed to 1."""
+        name = self.session.get_inputs()[0].name  # type: ignore
+        if self._batch_ok or len(batch) == 1:
             try:
-                # Try DeepFace first if available
-                if DeepFace is not None:
-                    try:
-                        # DeepFace expects BGR by default; convert RGB->BGR
-                        import cv2
-
-                        face_bgr = cv2.cvtColor(face_rgb, cv2.COLOR_RGB2BGR)
-                        res = DeepFace.analyze(face_bgr, actions=["emotion"], enforce_detection=False)  # type: ignore
-                        if isinstance(res, list) and res:
-                            res = res[0]
-                        label = str(res.get("dominant_emotion", "Neutral")).capitalize()
-                        return self._smooth(
-                            label, float(res.get("emotion", {}).get(label.lower(), 0.6))
-                        )
-                    except Exception:
-                        pass
-                # Otherwise, simple smile/neutral heuristic
-                import cv2
-
-                gray = cv2.cvtColor(face_rgb, cv2.COLOR_RGB2GRAY)
-                smile_cascade = cv2.CascadeClassifier(
-                    cv2.data.haarcascades + "haarcascade_smile.xml"
-                )
-                smiles = smile_cascade.detectMultiScale(
-                    gray, scaleFactor=1.3, minNeighbors=40
-                )
-                if len(smiles) > 0:
-                    return self._smooth("Happiness", 0.60)
-                return self._smooth("Neutral", 0.55)
+                return self.session.run(None, {name: batch})[0]  # type: ignore
             except Exception:
-                return self._smooth("Unknown", 0.0)
-
-        inp = self._preprocess(face_rgb)
+                if len(batch) == 1:
+                    raise
+                # Model exported with a fixed batch dimension of 1
+                self._batch_ok = False
+        return np.concatenate(
+            [self.session.run(None, {name: batch[i : i + 1]})[0] for i in range(len(batch))]  # type: ignore
+        )
+
+    def _predict_fallback(self, face_rgb: np.ndarray) -> Tuple[str, float]:
+        """DeepFace or smile-cascade heuristic when no ONNX model is loaded."""
+        # Fallback: smile vs neutral. We avoid over-classifying happiness.
         try:
-            outputs = self.session.run(None, {self.session.get_inputs()[0].name: inp})  # type: ignore
-            logits = outputs[0].squeeze()  # assume first output
-            # Softmax
-            exps = np.exp(logits - np.max(logits))
-            probs = exps / np.sum(exps)
-            idx = int(np.argmax(probs))
-            label = EMOTIONS[idx]
-            conf = float(probs[idx])
-            return self._smooth(label, conf)
+            # Try DeepFace first if available (pulls in TensorFlow on first use)
+            DeepFace = optional_import("deepface.DeepFace")
+            if DeepFace is not None:
+                try:
+                    # DeepFace expects BGR by default; convert RGB->BGR
+                    import cv2
+
+                    face_bgr = cv2.cvtColor(face_rgb, cv2.COLOR_RGB2BGR)
+                    res = DeepFace.analyze(face_bgr, actions=["emotion"], enforce_detection=False)  # type: ignore
+                    if isinstance(res, list) and res:
+                        res = res[0]
+                    label = str(res.get("dominant_emotion", "Neutral")).capitalize()
+                    return label, float(res.get("emotion", {}).get(label.lower(), 0.6))
+                except Exception:
+                    pass
+            # Otherwise, simple smile/neutral heuristic
+            import cv2
+
+            gray = cv2.cvtColor(face_rgb, cv2.COLOR_RGB2GRAY)
+            if self._smile_cascade is None:
+                self._smile_cascade = cv2.CascadeClassifier(
+                    cv2.data.haarcascades + "haarcascade_smile.xml"
+                )
+            smiles = self._smile_cascade.detectMultiScale(
+                gray, scaleFactor=1.3, minNeighbors=40
+            )
+            if len(smiles) > 0:
+                return "Happiness", 0.60
+            return "Neutral", 0.55
         except Exception:
-            return self._smooth("Unknown", 0.0)
+            return "Unknown", 0.0
 
     def _smooth(self, label: str, conf: float) -> Tuple[str, float]:
         """
@@ -141,34 +185,3 @@ class EmotionRecognizer:
             avg_conf = float(sum(confs) / max(len(confs), 1))
             return majority_label, avg_conf
         return label, conf
-
-    def _ensure_model_downloaded(self, model_path: Path) -> None:
-        """Download FER+ ONNX model if not present."""
-        urls = [
-            # ONNX official models repo
-            "https://github.com/onnx/models/raw/main/vision/body_analysis/emotion_ferplus/model/emotion-ferplus-8.onnx",
-            # Alternate mirror (if needed)
-            "https://raw.githubusercontent.com/onnx/models/main/vision/body_analysis/emotion_ferplus/model/emotion-ferplus-8.onnx",
-        ]
-        try:
-            models_dir = model_path.parent
-            models_dir.mkdir(parents=True, exist_ok=True)
-            for url in urls:
-                try:
-                    import requests  # type: ignore
-
-                    resp = requests.get(url, timeout=30)
-                    if resp.status_code == 200 and resp.content:
-                        model_path.write_bytes(resp.content)
-                        break
-                except Exception:
-                    import urllib.request
-
-                    with urllib.request.urlopen(url, timeout=30) as r:  # type: ignore
-                        data = r.read()
-                        if data:
-                            model_path.write_bytes(data)
-                            break
-        except Exception:
-            # Leave as-is; fallback path will handle gracefully
-            pass
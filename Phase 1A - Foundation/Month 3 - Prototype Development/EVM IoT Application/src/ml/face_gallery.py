@@ -0,0 +1,303 @@
+"""
+Face embedding gallery for 1:N search (duplicate-registrant checks).
+Language: Python
+Handles: Persistent storage and nearest-neighbour search of face embeddings
+
+Embeddings are L2-normalized and stored row-wise in a memory-mapped float32
+matrix (`embeddings.f32`) next to an append-only ID file (`ids.txt`, one
+JSON string per line), so a gallery of a million faces opens instantly and
+pages in on demand, and a flush writes only what changed: new ID lines, the
+dirty embedding pages and a small `gallery.json` whose `count` commits them. Queries are scored by
+cosine similarity with one matrix multiply. For large galleries
+`build_index` adds an IVF-style coarse quantizer: rows are partitioned into
+`nlist` k-means cells and a query only scans its `nprobe` closest cells.
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Rows per matrix multiply when assigning to cells (bounds temporary memory)
+_CHUNK = 8192
+
+
+def normalize_rows(x: np.ndarray) -> np.ndarray:
+    """float32 copy of `x` (N, D) with unit-length rows."""
+    x = np.asarray(x, dtype=np.float32)
+    if x.ndim == 1:
+        x = x[np.newaxis, :]
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+class FaceGallery:
+    def __init__(self, path, dim: int = 512):
+        """
+        Open (or create) the gallery stored in directory `path`.
+        :param path: Gallery directory.
+        :param dim: Embedding size, used when creating a new gallery.
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        meta = self._read_json("gallery.json", {})
+        self.dim = int(meta.get("dim", dim))
+        self.count = int(meta.get("count", 0))
+        self._ids, self._ids_bytes = self._read_ids()
+        self._ids_saved = len(self._ids)
+        self._rows: Dict[str, int] = {fid: i for i, fid in enumerate(self._ids)}
+        self._matrix: Optional[np.memmap] = None
+        self._capacity = 0
+        self._open(int(meta.get("capacity", 0)))
+        # IVF coarse quantizer (optional)
+        self.centroids: Optional[np.ndarray] = None
+        self._assign: Optional[np.ndarray] = None
+        self._lists: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._assign_dirty: set = set()
+        if (self.path / "ivf_centroids.npy").exists():
+            self.centroids = np.load(self.path / "ivf_centroids.npy")
+            self._assign = np.fromfile(
+                self.path / "ivf_assign.i32", dtype=np.int32, count=self.count
+            )
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, face_id: str) -> bool:
+        return face_id in self._rows
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """(count, dim) view of the enrolled embeddings."""
+        if self._matrix is None:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return self._matrix[: self.count]
+
+    # storage
+    def _file(self) -> Path:
+        return self.path / "embeddings.f32"
+
+    def _read_json(self, name: str, default):
+        try:
+            return json.loads((self.path / name).read_text("utf-8"))
+        except Exception:
+            return default
+
+    def _read_ids(self) -> Tuple[List[str], int]:
+        """First `count` IDs and the byte length of their lines."""
+        try:
+            raw = (self.path / "ids.txt").read_bytes()
+        except FileNotFoundError:
+            return [], 0
+        ids: List[str] = []
+        end = 0
+        for line in raw.splitlines(keepends=True)[: self.count]:
+            if not line.endswith(b"\n"):
+                break  # torn append after a crash; not committed by count
+            ids.append(json.loads(line))
+            end += len(line)
+        return ids, end
+
+    def _write_json(self, name: str, obj) -> None:
+        tmp = self.path / (name + ".tmp")
+        tmp.write_text(json.dumps(obj))
+        os.replace(tmp, self.path / name)
+
+    def _open(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._matrix = None
+        if capacity > 0:
+            self._matrix = np.memmap(
+                self._file(), dtype=np.float32, mode="r+", shape=(capacity, self.dim)
+            )
+
+    def _grow(self, needed: int) -> None:
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, 2 * self._capacity, 1024)
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        with open(self._file(), "ab") as fh:
+            fh.truncate(capacity * self.dim * 4)
+        self._open(capacity)
+
+    def _append_ids(self) -> None:
+        if self._ids_saved == len(self._ids):
+            return
+        lines = "".join(json.dumps(fid) + "\n" for fid in self._ids[self._ids_saved :])
+        data = lines.encode("utf-8")
+        with open(self.path / "ids.txt", "ab") as fh:
+            # Drop lines past the committed count (an interrupted flush)
+            fh.truncate(self._ids_bytes)
+            fh.write(data)
+        self._ids_bytes += len(data)
+        self._ids_saved = len(self._ids)
+
+    def _write_assign(self) -> None:
+        if not self._assign_dirty:
+            return
+        rows = np.fromiter(sorted(self._assign_dirty), dtype=np.int64)
+        target = self.path / "ivf_assign.i32"
+        with open(target, "r+b" if target.exists() else "wb") as fh:
+            # Contiguous runs of changed rows are written in one go
+            breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+            for run in np.split(rows, breaks):
+                fh.seek(int(run[0]) * 4)
+                fh.write(self._assign[run[0] : run[-1] + 1].tobytes())
+        self._assign_dirty.clear()
+
+    def flush(self) -> None:
+        """Persist new embeddings, IDs and index assignments."""
+        if self._matrix is not None:
+            self._matrix.flush()
+        self._append_ids()
+        if self.centroids is not None:
+            self._write_assign()
+        # Written last: `count` is what makes the appended rows visible
+        self._write_json(
+            "gallery.json",
+            {"dim": self.dim, "count": self.count, "capacity": self._capacity},
+        )
+
+    # enrollment
+    def enroll(
+        self, ids: Sequence[str], embeddings: np.ndarray, flush: bool = True
+    ) -> None:
+        """
+        Add (or replace) a batch of embeddings.
+        :param ids: One ID per row of `embeddings`.
+        :param embeddings: (N, dim) array; rows are L2-normalized on write.
+        :param flush: Persist now; pass False when enrolling many batches
+            and call `flush()` once at the end.
+        """
+        vectors = normalize_rows(embeddings)
+        if len(ids) != len(vectors) or vectors.shape[1] != self.dim:
+            raise ValueError("ids/embeddings shape mismatch")
+        rows = np.empty(len(ids), dtype=np.int64)
+        new: List[str] = []
+        for i, fid in enumerate(ids):
+            row = self._rows.get(fid)
+            if row is None:
+                row = self.count + len(new)
+                self._rows[fid] = row
+                new.append(fid)
+            rows[i] = row
+        self._grow(self.count + len(new))
+        self._matrix[rows] = vectors
+        self._ids.extend(new)
+        self.count += len(new)
+        if self.centroids is not None:
+            assign = np.empty(self.count, dtype=np.int32)
+            assign[: len(self._assign)] = self._assign
+            assign[rows] = self._nearest_cells(vectors)
+            self._assign = assign
+            self._assign_dirty.update(rows.tolist())
+            self._lists = None
+        if flush:
+            self.flush()
+
+    # IVF index
+    def _nearest_cells(self, vectors: np.ndarray) -> np.ndarray:
+        out = np.empty(len(vectors), dtype=np.int32)
+        for s in range(0, len(vectors), _CHUNK):
+            out[s : s + _CHUNK] = np.argmax(vectors[s : s + _CHUNK] @ self.centroids.T, axis=1)
+        return out
+
+    def build_index(
+        self,
+        nlist: Optional[int] = None,
+        iters: int = 8,
+        sample: int = 100_000,
+        seed: int = 0,
+    ) -> None:
+        """
+        Train `nlist` cells (spherical k-means on a sample) and assign rows.
+        :param nlist: Number of cells; defaults to ~4*sqrt(count).
+        """
+        if self.count == 0:
+            return
+        rng = np.random.default_rng(seed)
+        nlist = nlist or max(1, int(4 * math.sqrt(self.count)))
+        idx = np.sort(rng.choice(self.count, min(sample, self.count), replace=False))
+        train = np.ascontiguousarray(self.embeddings[idx])
+        nlist = min(nlist, len(train))
+        self.centroids = train[rng.choice(len(train), nlist, replace=False)].copy()
+        for _ in range(iters):
+            assign = self._nearest_cells(train)
+            counts = np.bincount(assign, minlength=nlist)
+            empty = counts == 0
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[~empty]
+            sums = np.zeros_like(self.centroids)
+            sums[~empty] = np.add.reduceat(
+                train[np.argsort(assign, kind="stable")], starts, axis=0
+            )
+            # Reseed empty cells from random training rows
+            sums[empty] = train[rng.choice(len(train), int(empty.sum()))]
+            self.centroids = normalize_rows(sums)
+        self._assign = self._nearest_cells(self.embeddings)
+        self._assign_dirty.update(range(self.count))
+        self._lists = None
+        np.save(self.path / "ivf_centroids.npy", self.centroids)
+        self.flush()
+
+    def _cell_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(rows sorted by cell, cell start offsets)."""
+        if self._lists is None:
+            order = np.argsort(self._assign, kind="stable")
+            bounds = np.searchsorted(
+                self._assign[order], np.arange(len(self.centroids) + 1)
+            )
+            self._lists = (order, bounds)
+        return self._lists
+
+    # search
+    def search(
+        self, queries: np.ndarray, k: int = 1, nprobe: Optional[int] = 16
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Nearest enrolled faces for each query embedding.
+        :param queries: (Q, dim) or (dim,) embeddings.
+        :param k: Neighbours per query.
+        :param nprobe: Cells scanned per query with an index; None = exact.
+        :return: Per query, [(id, cosine similarity)] best first.
+        """
+        q = normalize_rows(queries)
+        if self.count == 0:
+            return [[] for _ in range(len(q))]
+        if self.centroids is None or nprobe is None or nprobe >= len(self.centroids):
+            scores = q @ self.embeddings.T
+            return [self._top(row, None, k) for row in scores]
+        order, bounds = self._cell_lists()
+        cells = np.argpartition(-(q @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        results = []
+        for qi in range(len(q)):
+            rows = np.concatenate([order[bounds[c] : bounds[c + 1]] for c in cells[qi]])
+            if len(rows) == 0:
+                results.append([])
+                continue
+            rows.sort()
+            results.append(self._top(self._matrix[rows] @ q[qi], rows, k))
+        return results
+
+    def _top(self, scores: np.ndarray, rows: Optional[np.ndarray], k: int):
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        ids = best if rows is None else rows[best]
+        return [(self._ids[int(r)], float(scores[b])) for r, b in zip(ids, best)]
+
+    def find_duplicate(
+        self, embedding: np.ndarray, threshold: float = 0.5, nprobe: Optional[int] = 16
+    ) -> Optional[Tuple[str, float]]:
+        """Best enrolled match with cosine similarity >= `threshold`, else None."""
+        hits = self.search(embedding, k=1, nprobe=nprobe)[0]
+        if hits and hits[0][1] >= threshold:
+            return hits[0]
+        return None
+
+    def ids(self) -> Iterable[str]:
+        return iter(self._ids)
@@ -7,36 +7,46 @@ Handles: Fingerprint matching and verification
 import cv2
 import numpy as np
 
+from ml.fingerprint_templates import FingerprintMatcher, extract_descriptors
+
 
 class FingerprintRecognition:
-    def __init__(self):
-        # Placeholder for ML model or algorithm initialization
-        pass
+    def __init__(self, store=None):
+        """
+        :param store: Optional FingerprintTemplateStore; stored prints that are
+            enrolled there are matched from their cached descriptors.
+        """
+        self.store = store
+        self._matcher = None
+
+    def _descriptors(self, fingerprint, label):
+        # Arrays are unhashable; only string IDs can name enrolled templates
+        if self.store is not None and isinstance(fingerprint, str) and fingerprint in self.store:
+            return self.store.get(fingerprint)
+        try:
+            return extract_descriptors(fingerprint)
+        except ValueError:
+            print(f"[ERROR] {label} fingerprint image not found or cannot be loaded.")
+            return None
 
     def match_fingerprint(self, captured_fingerprint, stored_fingerprint):
         """
         Simulate fingerprint matching.
         :param captured_fingerprint: Path to the captured fingerprint image.
-        :param stored_fingerprint: Path to the stored fingerprint image.
+        :param stored_fingerprint: Path to the stored fingerprint image, or the
+            ID of a template enrolled in the store.
         :return: Boolean indicating match success.
         """
-        # Load images
-        img1 = cv2.imread(captured_fingerprint, 0)
-        img2 = cv2.imread(stored_fingerprint, 0)
-
-        # Check if images are loaded successfully
-        if img1 is None:
-            print("[ERROR] Captured fingerprint image not found or cannot be loaded.")
+        # ORB (Oriented FAST and Rotated BRIEF) descriptors; cached for
+        # enrolled templates
+        des1 = self._descriptors(captured_fingerprint, "Captured")
+        des2 = self._descriptors(stored_fingerprint, "Stored")
+        if des1 is None or des2 is None:
             return False
-        if img2 is None:
-            print("[ERROR] Stored fingerprint image not found or cannot be loaded.")
+        if len(des1) == 0 or len(des2) == 0:
+            print("[ML] Fingerprint match failed.")
             return False
 
-        # Simulate matching using ORB (Oriented FAST and Rotated BRIEF)
-        orb = cv2.ORB_create()
-        kp1, des1 = orb.detectAndCompute(img1, None)
-        kp2, des2 = orb.detectAndCompute(img2, None)
-
         # Match descriptors
         bf = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
         matches = bf.match(des1, des2)
@@ -51,6 +61,18 @@ class FingerprintRecognition:
             print("[ML] Fingerprint match failed.")
             return False
 
+    def identify_fingerprint(self, captured_fingerprint):
+        """
+        1:N identification against every print enrolled in the store.
+        :param captured_fingerprint: Path to (or array of) the captured print.
+        :return: (template id, match score) of the best match, or None.
+        """
+        if self.store is None:
+            raise ValueError("identify_fingerprint needs a template store")
+        if self._matcher is None:
+            self._matcher = FingerprintMatcher(self.store)
+        return self._matcher.identify(captured_fingerprint)
+
 
 if __name__ == "__main__":
     fr = FingerprintRecognition()
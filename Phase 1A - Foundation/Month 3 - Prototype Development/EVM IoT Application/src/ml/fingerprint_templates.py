@@ -0,0 +1,357 @@
+"""
+Fingerprint Template Store and 1:N Matcher
+Language: Python
+Handles: Cached ORB templates and indexed identification against a voter roll
+
+Enrolled prints are reduced once to ORB descriptors and persisted in an
+append-only pair of files (`descriptors.u8` rows + one `templates.jsonl`
+line per enrolled batch), so matching never re-reads or re-extracts a stored
+print and enrolling never rewrites the roll. Identification is two-stage:
+LSH indexes (FLANN) over all enrolled binary descriptors vote for candidate
+templates, then the top candidates are scored in parallel with
+cross-checked Hamming matching. New batches are indexed on their own and
+merged log-structured style, so an enrollment does not rebuild the index.
+"""
+
+import json
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+DESCRIPTOR_BYTES = 32  # ORB descriptors are 256-bit
+FLANN_INDEX_LSH = 6
+
+
+def extract_descriptors(fingerprint, nfeatures: int = 500) -> np.ndarray:
+    """
+    ORB descriptors of a print.
+    :param fingerprint: Image path or grayscale array.
+    :return: (K, 32) uint8 array; K is 0 when nothing was found.
+    """
+    img = fingerprint
+    if isinstance(fingerprint, (str, Path)):
+        img = cv2.imread(str(fingerprint), 0)
+        if img is None:
+            raise ValueError(f"Fingerprint image cannot be loaded: {fingerprint}")
+    elif img.ndim == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    _kp, des = cv2.ORB_create(nfeatures).detectAndCompute(img, None)
+    if des is None:
+        return np.empty((0, DESCRIPTOR_BYTES), dtype=np.uint8)
+    return des
+
+
+class FingerprintTemplateStore:
+    def __init__(self, path, nfeatures: int = 500, workers: int = 4):
+        """
+        Open (or create) the template store in directory `path`.
+        :param nfeatures: ORB keypoints kept per enrolled print.
+        :param workers: Threads extracting descriptors in `enroll_many`.
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.nfeatures = nfeatures
+        self.workers = workers
+        self._templates: Dict[str, np.ndarray] = {}
+        self.version = 0
+        # Bumped when slots are renumbered (compaction); indexes rebuild
+        self.generation = 0
+        # Every enrolled print gets a new slot; a replaced print's old slot
+        # (and its descriptor rows) stays behind as stale until compaction
+        self._slots: List[str] = []
+        self._live: Dict[str, int] = {}
+        self._segments: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._rows = 0
+        self._stale_rows = 0
+        self._flat: Optional[Tuple[np.ndarray, np.ndarray, List[str]]] = None
+        # Batches enrolled with save=False, and bytes of descriptors.u8 that
+        # templates.jsonl commits
+        self._unsaved: List[Tuple[List[str], List[np.ndarray]]] = []
+        self._saved_bytes = 0
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def __contains__(self, template_id) -> bool:
+        return template_id in self._templates
+
+    def get(self, template_id: str) -> np.ndarray:
+        return self._templates[template_id]
+
+    def ids(self) -> Iterable[str]:
+        return iter(self._templates)
+
+    def segments(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """(descriptors, owner slot per row) per enrolled batch, oldest first."""
+        return self._segments
+
+    def slot_id(self, slot: int) -> Optional[str]:
+        """Template id of `slot`, or None if that print was replaced since."""
+        template_id = self._slots[slot]
+        return template_id if self._live.get(template_id) == slot else None
+
+    # storage
+    def _load(self) -> None:
+        log_path = self.path / "templates.jsonl"
+        if not log_path.exists():
+            return
+        batches = []
+        for line in log_path.read_bytes().splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # torn append after a crash; not committed
+            batches.append(json.loads(line))
+        rows = sum(sum(b["sizes"]) for b in batches)
+        desc = np.fromfile(
+            self.path / "descriptors.u8", dtype=np.uint8, count=rows * DESCRIPTOR_BYTES
+        ).reshape(-1, DESCRIPTOR_BYTES)
+        self._saved_bytes = desc.nbytes
+        ids = [t for b in batches for t in b["ids"]]
+        sizes = [n for b in batches for n in b["sizes"]]
+        if batches:
+            self.nfeatures = batches[-1].get("nfeatures", self.nfeatures)
+        offsets = np.concatenate(([0], np.cumsum(sizes, dtype=np.int64)))
+        self._append(
+            ids, [desc[offsets[i] : offsets[i + 1]] for i in range(len(ids))], desc
+        )
+
+    def _append(
+        self, ids: List[str], descs: List[np.ndarray], joined: Optional[np.ndarray] = None
+    ) -> None:
+        """Give each print a new slot and add one segment for the batch."""
+        first = len(self._slots)
+        for template_id, des in zip(ids, descs):
+            old = self._live.get(template_id)
+            if old is not None:
+                self._stale_rows += len(self._templates[template_id])
+            self._live[template_id] = len(self._slots)
+            self._slots.append(template_id)
+            self._templates[template_id] = des
+        if joined is None:
+            joined = (
+                np.concatenate(descs)
+                if descs
+                else np.empty((0, DESCRIPTOR_BYTES), dtype=np.uint8)
+            )
+        if len(joined):
+            owners = np.repeat(
+                np.arange(first, len(self._slots), dtype=np.int32),
+                [len(d) for d in descs],
+            )
+            self._segments.append((joined, owners))
+            self._rows += len(joined)
+        self.version += 1
+        self._flat = None
+
+    def _compact(self) -> None:
+        """Drop stale rows: renumber slots into a single segment."""
+        ids = list(self._templates)
+        descs = [self._templates[t] for t in ids]
+        self._slots, self._live, self._segments = [], {}, []
+        self._templates = {}
+        self._rows = self._stale_rows = 0
+        self._append(ids, descs)
+        self.generation += 1
+
+    def _rewrite(self) -> None:
+        ids = list(self._templates)
+        desc = (
+            np.concatenate([self._templates[t] for t in ids])
+            if ids
+            else np.empty((0, DESCRIPTOR_BYTES), dtype=np.uint8)
+        )
+        tmp = self.path / "descriptors.u8.tmp"
+        desc.tofile(tmp)
+        os.replace(tmp, self.path / "descriptors.u8")
+        log_tmp = self.path / "templates.jsonl.tmp"
+        log_tmp.write_text(
+            self._log_line(ids, [self._templates[t] for t in ids]) if ids else ""
+        )
+        os.replace(log_tmp, self.path / "templates.jsonl")
+        self._saved_bytes = desc.nbytes
+        self._unsaved = []
+
+    def _log_line(self, ids: List[str], descs: List[np.ndarray]) -> str:
+        sizes = [len(d) for d in descs]
+        return json.dumps({"ids": ids, "sizes": sizes, "nfeatures": self.nfeatures}) + "\n"
+
+    def save(self) -> None:
+        """
+        Persist prints enrolled with save=False. Appends their descriptors
+        and one log line; the files are only rewritten to drop replaced
+        prints once they outweigh the live ones.
+        """
+        if self._stale_rows > max(self._rows - self._stale_rows, 4096):
+            self._compact()
+            self._rewrite()
+            return
+        if not self._unsaved:
+            return
+        with open(self.path / "descriptors.u8", "ab") as fh:
+            # Drop rows past the committed log (an interrupted save)
+            fh.truncate(self._saved_bytes)
+            for _ids, descs in self._unsaved:
+                for des in descs:
+                    fh.write(np.ascontiguousarray(des).tobytes())
+                    self._saved_bytes += des.nbytes
+        lines = "".join(self._log_line(ids, descs) for ids, descs in self._unsaved)
+        with open(self.path / "templates.jsonl", "a", encoding="utf-8") as fh:
+            fh.write(lines)
+        self._unsaved = []
+
+    # enrollment
+    def enroll(self, template_id: str, fingerprint, save: bool = True) -> int:
+        """Enroll (or replace) one print; returns its descriptor count."""
+        return self.enroll_many([(template_id, fingerprint)], save=save)[template_id]
+
+    def enroll_many(
+        self, items: Iterable[Tuple[str, object]], save: bool = True
+    ) -> Dict[str, int]:
+        """
+        Extract descriptors for many prints in parallel and add them as one
+        batch: matchers index only the new rows.
+        :param items: (template id, image path or grayscale array) pairs.
+        :param save: Persist now; pass False to batch many calls and call
+            `save()` once.
+        """
+        items = list(items)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            extracted = list(
+                pool.map(lambda it: extract_descriptors(it[1], self.nfeatures), items)
+            )
+        ids = [template_id for template_id, _ in items]
+        self._append(ids, extracted)
+        self._unsaved.append((ids, extracted))
+        if save:
+            self.save()
+        return {template_id: len(des) for template_id, des in zip(ids, extracted)}
+
+    def flat(self) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """(all live descriptors, owning template index per row, template ids)."""
+        if self._flat is None:
+            ids = [t for t in self._templates if len(self._templates[t])]
+            if ids:
+                desc = np.concatenate([self._templates[t] for t in ids])
+                owners = np.repeat(
+                    np.arange(len(ids), dtype=np.int32),
+                    [len(self._templates[t]) for t in ids],
+                )
+            else:
+                desc = np.empty((0, DESCRIPTOR_BYTES), dtype=np.uint8)
+                owners = np.empty(0, dtype=np.int32)
+            self._flat = (desc, owners, ids)
+        return self._flat
+
+
+class FingerprintMatcher:
+    def __init__(
+        self,
+        store: FingerprintTemplateStore,
+        candidates: int = 10,
+        max_distance: int = 64,
+        min_matches: int = 10,
+        workers: int = 4,
+    ):
+        """
+        1:N identification over a template store.
+        :param candidates: Templates re-scored after the LSH voting stage.
+        :param max_distance: Hamming distance (of 256 bits) for a good match.
+        :param min_matches: Good matches needed to accept an identification.
+        """
+        self.store = store
+        self.candidates = candidates
+        self.max_distance = max_distance
+        self.min_matches = min_matches
+        self.workers = workers
+        # LSH indexes over consecutive store segments, largest first
+        self._indexes: List[Tuple[object, np.ndarray, np.ndarray]] = []
+        self._indexed_segments = 0
+        self._generation = -1
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def _build(desc: np.ndarray):
+        index = cv2.FlannBasedMatcher(
+            dict(algorithm=FLANN_INDEX_LSH, table_number=6, key_size=12, multi_probe_level=1),
+            dict(checks=50),
+        )
+        index.add([desc])
+        index.train()
+        return index
+
+    def _lsh(self) -> List[Tuple[object, np.ndarray, np.ndarray]]:
+        """
+        Index new store segments without rebuilding the existing indexes.
+        Each new batch gets its own index; an index is merged into the one
+        before it once it reaches half its size, so there are O(log N)
+        indexes and each descriptor is re-indexed O(log N) times.
+        """
+        if self._generation != self.store.generation:
+            self._indexes, self._indexed_segments = [], 0
+            self._generation = self.store.generation
+        segments = self.store.segments()
+        for desc, owners in segments[self._indexed_segments :]:
+            self._indexes.append((self._build(desc), desc, owners))
+            while (
+                len(self._indexes) > 1
+                and 2 * len(self._indexes[-1][1]) >= len(self._indexes[-2][1])
+            ):
+                (_, d2, o2), (_, d1, o1) = self._indexes.pop(), self._indexes.pop()
+                desc = np.concatenate([d1, d2])
+                self._indexes.append((self._build(desc), desc, np.concatenate([o1, o2])))
+        self._indexed_segments = len(segments)
+        return self._indexes
+
+    def _candidates(self, query: np.ndarray) -> List[str]:
+        if len(query) == 0:
+            return []
+        votes: Counter = Counter()
+        for index, _desc, owners in self._lsh():
+            for pair in index.knnMatch(query, k=2):
+                for m in pair:
+                    if m.distance <= self.max_distance:
+                        votes[owners[m.trainIdx]] += 1
+        ranked: List[str] = []
+        for slot, _ in votes.most_common():
+            # Votes for a replaced print's old rows are ignored
+            template_id = self.store.slot_id(int(slot))
+            if template_id is not None:
+                ranked.append(template_id)
+                if len(ranked) == self.candidates:
+                    break
+        return ranked
+
+    def _score(self, query: np.ndarray, template_id: str) -> Tuple[str, int]:
+        stored = self.store.get(template_id)
+        if len(stored) == 0:
+            return template_id, 0
+        matches = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True).match(query, stored)
+        return template_id, sum(1 for m in matches if m.distance <= self.max_distance)
+
+    def rank(self, fingerprint) -> List[Tuple[str, int]]:
+        """Candidate templates with their match scores, best first."""
+        query = extract_descriptors(fingerprint, self.store.nfeatures)
+        candidates = self._candidates(query)
+        if not candidates:
+            return []
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        scored = list(self._pool.map(lambda t: self._score(query, t), candidates))
+        return sorted(scored, key=lambda s: -s[1])
+
+    def identify(self, fingerprint) -> Optional[Tuple[str, int]]:
+        """Best enrolled template with more than `min_matches` good matches."""
+        ranked = self.rank(fingerprint)
+        if ranked and ranked[0][1] > self.min_matches:
+            return ranked[0]
+        return None
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
@@ -0,0 +1,60 @@
+"""
+Lazy loader for optional heavy ML dependencies.
+Language: Python
+Handles: Deferred imports (deepface/TensorFlow, onnxruntime, recognizers)
+
+Modules are imported on first use instead of at module load, so the booth
+UI starts without paying for the ML stack (or at all when ML is disabled).
+Each import is attempted once per process; its wall time (inclusive of the
+modules it pulls in) and any failure are recorded for the startup profile.
+"""
+
+import importlib
+import importlib.util
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Optional
+
+_lock = threading.RLock()
+_modules: Dict[str, Optional[ModuleType]] = {}
+_times: Dict[str, float] = {}
+_errors: Dict[str, str] = {}
+
+
+def optional_import(name: str) -> Optional[ModuleType]:
+    """Module `name`, imported on first call; None if it cannot be imported."""
+    if name in _modules:
+        return _modules[name]
+    with _lock:
+        if name in _modules:
+            return _modules[name]
+        started = time.perf_counter()
+        try:
+            module: Optional[ModuleType] = importlib.import_module(name)
+        except Exception as exc:
+            module = None
+            _errors[name] = f"{type(exc).__name__}: {exc}"
+        _times[name] = time.perf_counter() - started
+        _modules[name] = module
+        return module
+
+
+def is_available(name: str) -> bool:
+    """Whether `name` could be imported, without importing it."""
+    if name in _modules:
+        return _modules[name] is not None
+    try:
+        return importlib.util.find_spec(name) is not None
+    except Exception:
+        return False
+
+
+def import_times() -> Dict[str, float]:
+    """Seconds spent in each lazy import so far."""
+    return dict(_times)
+
+
+def import_errors() -> Dict[str, str]:
+    """Lazy imports that failed, with the error."""
+    return dict(_errors)
@@ -0,0 +1,181 @@
+"""
+Offline model store for the face recognizers.
+Language: Python
+Handles: Model manifest (path, SHA-256, size), verification at load, prefetch
+
+Recognizers never touch the network: they ask the store whether a model
+file is verified and fall back gracefully when it is not. Files are fetched
+ahead of time with `scripts/prefetch_models.py` (or copied onto an
+air-gapped booth and recorded with `--record`), which writes
+`manifest.json` next to the models:
+
+    {"version": 1, "models": {"ferplus.onnx": {"sha256": ..., "size": ...}}}
+
+A file whose size or hash differs from its manifest entry is rejected.
+Files without an entry are accepted unless `ML_MODEL_STRICT=1`.
+Verification results are cached per (path, size, mtime) for the process,
+so a model is hashed at most once however many recognizers load it.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MANIFEST = "manifest.json"
+
+# Files the prefetch CLI can download (first reachable URL wins)
+REMOTE_MODELS: Dict[str, List[str]] = {
+    "ferplus.onnx": [
+        "https://github.com/onnx/models/raw/main/vision/body_analysis/emotion_ferplus/model/emotion-ferplus-8.onnx",
+        "https://raw.githubusercontent.com/onnx/models/main/vision/body_analysis/emotion_ferplus/model/emotion-ferplus-8.onnx",
+    ],
+    "deploy_age.prototxt": [
+        "https://raw.githubusercontent.com/spmallick/learnopencv/master/AgeGender/models/deploy_age.prototxt"
+    ],
+    "age_net.caffemodel": [
+        "https://raw.githubusercontent.com/spmallick/learnopencv/master/AgeGender/models/age_net.caffemodel"
+    ],
+    "deploy_gender.prototxt": [
+        "https://raw.githubusercontent.com/spmallick/learnopencv/master/AgeGender/models/deploy_gender.prototxt"
+    ],
+    "gender_net.caffemodel": [
+        "https://raw.githubusercontent.com/spmallick/learnopencv/master/AgeGender/models/gender_net.caffemodel"
+    ],
+}
+
+_verified: Dict[Tuple[str, int, int, str], bool] = {}
+_verified_lock = threading.Lock()
+
+
+def strict() -> bool:
+    """Reject model files that have no manifest entry."""
+    return os.getenv("ML_MODEL_STRICT", "0") == "1"
+
+
+def sha256_file(path: Path, chunk: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(chunk), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelStore:
+    def __init__(self, models_dir):
+        """
+        :param models_dir: Directory holding the model files and manifest.
+        """
+        self.models_dir = Path(models_dir).resolve()
+        self.manifest_path = self.models_dir / MANIFEST
+        self.models: Dict[str, Dict] = {}
+        try:
+            data = json.loads(self.manifest_path.read_text("utf-8"))
+            self.models = dict(data.get("models", {}))
+        except Exception:
+            pass
+
+    def path(self, name: str) -> Path:
+        return self.models_dir / name
+
+    def _check(self, path: Path, entry: Optional[Dict]) -> bool:
+        if entry is None:
+            return not strict()
+        if path.stat().st_size != entry.get("size"):
+            return False
+        return sha256_file(path) == entry.get("sha256")
+
+    def verify(self, path) -> bool:
+        """True when `path` exists and matches its manifest entry."""
+        path = Path(path).resolve()
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        entry = self.models.get(path.name) if path.parent == self.models_dir else None
+        if entry is None:
+            return self._check(path, None)
+        key = (str(path), st.st_size, st.st_mtime_ns, entry.get("sha256", ""))
+        with _verified_lock:
+            cached = _verified.get(key)
+        if cached is None:
+            cached = self._check(path, entry)
+            with _verified_lock:
+                _verified[key] = cached
+        return cached
+
+    def available(self, name: str) -> Optional[Path]:
+        """Path of verified model `name`, or None."""
+        path = self.path(name)
+        return path if self.verify(path) else None
+
+    def save(self) -> None:
+        self.models_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": 1, "models": self.models}, indent=2))
+        os.replace(tmp, self.manifest_path)
+
+    def record(self, name: str, source: str = "local") -> Dict:
+        """Add (or refresh) the manifest entry for an existing file."""
+        path = self.path(name)
+        entry = {
+            "sha256": sha256_file(path),
+            "size": path.stat().st_size,
+            "source": source,
+            "recorded_at": time.time(),
+        }
+        self.models[name] = entry
+        self.save()
+        return entry
+
+    def prefetch(
+        self,
+        names: Optional[Iterable[str]] = None,
+        timeout: float = 30.0,
+        force: bool = False,
+    ) -> Dict[str, str]:
+        """
+        Download missing or invalid models and record them.
+        A manifest entry that already exists pins the expected SHA-256, so a
+        changed upstream file is rejected rather than recorded.
+        :return: {name: "ok" | "downloaded" | "failed" | "hash-mismatch"}
+        """
+        import urllib.request
+
+        status: Dict[str, str] = {}
+        self.models_dir.mkdir(parents=True, exist_ok=True)
+        for name in names or REMOTE_MODELS:
+            path = self.path(name)
+            if not force and name in self.models and self.verify(path):
+                status[name] = "ok"
+                continue
+            status[name] = "failed"
+            tmp = path.with_name(path.name + ".part")
+            for url in REMOTE_MODELS.get(name, []):
+                try:
+                    with urllib.request.urlopen(url, timeout=timeout) as resp, open(tmp, "wb") as out:
+                        while True:
+                            block = resp.read(1 << 20)
+                            if not block:
+                                break
+                            out.write(block)
+                except Exception:
+                    continue
+                pinned = self.models.get(name, {}).get("sha256")
+                if pinned and sha256_file(tmp) != pinned:
+                    status[name] = "hash-mismatch"
+                    continue
+                os.replace(tmp, path)
+                self.record(name, source=url)
+                status[name] = "downloaded"
+                break
+            if tmp.exists():
+                tmp.unlink()
+        return status
+
+    def verify_all(self) -> Dict[str, bool]:
+        """Verify every manifest entry (hashing each file)."""
+        return {name: self.verify(self.path(name)) for name in self.models}
@@ -2,17 +2,86 @@
 Machine Learning Model Training for Fraud Detection
 Language: Python
 Handles: Data preprocessing, model training, and evaluation
+
+Training uses all cores (`n_jobs`), numeric columns are downcast while the
+CSV is read, and a trained model is saved with its feature list and a
+schema hash so later runs (and the live scoring path) load it instead of
+retraining. `score_batch` scores events already in feature order as one
+float32 matrix. The estimator's own `n_jobs` is left unset; each call picks
+its worker count through a (thread-local) joblib config, so one model can
+be shared by scoring threads.
 """
 
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import joblib
+import numpy as np
 import pandas as pd
+import sklearn
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report
 from sklearn.model_selection import train_test_split
 
+LABEL = "label"
+# Rows probed to choose column dtypes before the full read
+_DTYPE_SAMPLE_ROWS = 10_000
+# Below this many events, scoring runs single-threaded (no pool overhead)
+_PARALLEL_MIN_ROWS = 2_000
+
+
+def feature_schema_hash(features: Iterable[str]) -> str:
+    """Short hash of the ordered feature names a model was trained on."""
+    payload = json.dumps([LABEL, list(features)], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def load_frame(data_path) -> pd.DataFrame:
+    """
+    Read a CSV with float columns parsed as float32 and integer columns
+    downcast to the smallest type that holds them.
+    """
+    sample = pd.read_csv(data_path, nrows=_DTYPE_SAMPLE_ROWS)
+    dtypes = {
+        col: np.float32
+        for col, dtype in sample.dtypes.items()
+        if pd.api.types.is_float_dtype(dtype)
+    }
+    data = pd.read_csv(data_path, dtype=dtypes)
+    for col in data.columns:
+        if pd.api.types.is_integer_dtype(data[col].dtype):
+            kind = "unsigned" if data[col].min() >= 0 else "integer"
+            data[col] = pd.to_numeric(data[col], downcast=kind)
+        elif pd.api.types.is_float_dtype(data[col].dtype):
+            data[col] = data[col].astype(np.float32)
+    return data
+
 
 class FraudDetectionModel:
-    def __init__(self):
-        self.model = RandomForestClassifier()
+    def __init__(self, n_estimators=100, n_jobs=-1, random_state=42, model=None):
+        """
+        :param n_estimators: Trees in the forest.
+        :param n_jobs: Cores used for training and large scoring batches.
+        :param model: Already trained estimator (see `load`).
+        """
+        self.n_jobs = n_jobs
+        if model is None:
+            model = RandomForestClassifier(
+                n_estimators=n_estimators, random_state=random_state
+            )
+        if hasattr(model, "n_jobs"):
+            # None defers to the joblib config set around each call
+            model.n_jobs = None
+        self.model = model
+        self.features: List[str] = []
+
+    @property
+    def schema_hash(self) -> str:
+        return feature_schema_hash(self.features)
 
     def preprocess_data(self, data_path):
         """
@@ -20,9 +89,10 @@ class FraudDetectionModel:
         :param data_path: Path to the dataset.
         :return: Preprocessed features and labels.
         """
-        data = pd.read_csv(data_path)
-        X = data.drop("label", axis=1)
-        y = data["label"]
+        data = load_frame(data_path)
+        X = data.drop(LABEL, axis=1)
+        y = data[LABEL]
+        self.features = list(X.columns)
         return train_test_split(X, y, test_size=0.2, random_state=42)
 
     def train_model(self, X_train, y_train):
@@ -31,8 +101,15 @@ class FraudDetectionModel:
         :param X_train: Training features.
         :param y_train: Training labels.
         """
-        self.model.fit(X_train, y_train)
-        print("[ML] Model training completed.")
+        if hasattr(X_train, "columns"):
+            self.features = list(X_train.columns)
+        started = time.perf_counter()
+        # Fit on the same float32 matrix layout that score_batch feeds
+        with joblib.parallel_config(n_jobs=self.n_jobs):
+            self.model.fit(self._matrix(X_train), y_train)
+        print(
+            f"[ML] Model training completed in {time.perf_counter() - started:.2f}s."
+        )
 
     def evaluate_model(self, X_test, y_test):
         """
@@ -40,13 +117,109 @@ class FraudDetectionModel:
         :param X_test: Test features.
         :param y_test: Test labels.
         """
-        predictions = self.model.predict(X_test)
+        predictions = self.model.predict(self._matrix(X_test))
         report = classification_report(y_test, predictions)
         print("[ML] Model Evaluation Report:\n", report)
 
+    def _matrix(self, events) -> np.ndarray:
+        if isinstance(events, pd.DataFrame):
+            missing = [f for f in self.features if f not in events.columns]
+            if missing:
+                raise ValueError(f"Events are missing feature columns: {missing}")
+            events = events[self.features]
+        elif isinstance(events, (list, tuple)) and events and isinstance(events[0], dict):
+            missing = sorted({f for e in events for f in self.features if f not in e})
+            if missing:
+                raise ValueError(f"Events are missing features: {missing}")
+            events = [[e[f] for f in self.features] for e in events]
+        return np.ascontiguousarray(events, dtype=np.float32).reshape(-1, len(self.features))
+
+    def score_batch(self, events) -> np.ndarray:
+        """
+        Fraud probability for each event.
+        :param events: DataFrame, list of dicts keyed by feature name, or an
+            (N, n_features) array in `self.features` order.
+        :return: (N,) float array of positive-class probabilities.
+        :raises ValueError: When named events lack some of the features.
+        """
+        X = self._matrix(events)
+        if len(X) == 0:
+            return np.empty(0, dtype=np.float64)
+        # Trees are evaluated on float32; pool start-up costs more than
+        # small batches take to score. The config is per thread, so
+        # concurrent callers do not change each other's worker count.
+        n_jobs = self.n_jobs if len(X) >= _PARALLEL_MIN_ROWS else 1
+        with joblib.parallel_config(n_jobs=n_jobs):
+            proba = self.model.predict_proba(X)
+        classes = list(self.model.classes_)
+        if 1 in classes:
+            return proba[:, classes.index(1)]
+        return proba[:, -1] if len(classes) > 1 else np.zeros(len(X))
+
+    def save(self, path) -> None:
+        """Persist the trained model with its feature schema."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        joblib.dump(
+            {
+                "model": self.model,
+                "features": self.features,
+                "schema_hash": self.schema_hash,
+                "sklearn_version": sklearn.__version__,
+                "saved_at": time.time(),
+            },
+            tmp,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, features: Optional[Iterable[str]] = None, n_jobs=-1):
+        """
+        Load a saved model.
+        :param features: Expected feature names; a different schema raises
+            ValueError instead of silently scoring misaligned columns.
+        :raises ValueError: Also when the artifact was saved by another
+            scikit-learn version (pickled estimators are not portable).
+        """
+        artifact = joblib.load(path)
+        if artifact.get("schema_hash") != feature_schema_hash(artifact["features"]):
+            raise ValueError(f"Corrupt model artifact: {path}")
+        if artifact.get("sklearn_version") != sklearn.__version__:
+            raise ValueError(
+                f"Model {path} was saved with scikit-learn "
+                f"{artifact.get('sklearn_version')}, running {sklearn.__version__}"
+            )
+        if features is not None and feature_schema_hash(features) != artifact["schema_hash"]:
+            raise ValueError(
+                f"Feature schema mismatch for {path}: "
+                f"model expects {artifact['features']}"
+            )
+        model = cls(n_jobs=n_jobs, model=artifact["model"])
+        model.features = list(artifact["features"])
+        return model
+
+    @classmethod
+    def train_or_load(cls, data_path, model_path, **kwargs):
+        """
+        Reuse the model saved at `model_path` when it matches the dataset's
+        feature columns; otherwise train on `data_path` and save it.
+        """
+        columns = list(pd.read_csv(data_path, nrows=0).columns)
+        features = [c for c in columns if c != LABEL]
+        if Path(model_path).exists():
+            try:
+                return cls.load(model_path, features, n_jobs=kwargs.get("n_jobs", -1))
+            except ValueError:
+                pass
+        model = cls(**kwargs)
+        X_train, X_test, y_train, y_test = model.preprocess_data(data_path)
+        model.train_model(X_train, y_train)
+        model.evaluate_model(X_test, y_test)
+        model.save(model_path)
+        return model
+
 
 if __name__ == "__main__":
-    model = FraudDetectionModel()
-    X_train, X_test, y_train, y_test = model.preprocess_data("fraud_data.csv")
-    model.train_model(X_train, y_train)
-    model.evaluate_model(X_test, y_test)
+    model = FraudDetectionModel.train_or_load("fraud_data.csv", "fraud_model.joblib")
+    print("[ML] Schema:", model.schema_hash)
@@ -0,0 +1,123 @@
+"""
+Shared ONNX Runtime session factory for the face recognizers.
+
+Session options come from the environment so booth hardware can be tuned
+without code changes:
+- ORT_INTRA_OP_THREADS / ORT_INTER_OP_THREADS: thread pools (0 = ORT default)
+- ORT_GRAPH_OPT: disable | basic | extended | all (default all)
+- ORT_EXECUTION_MODE: sequential | parallel (default sequential)
+- ORT_MEM_ARENA / ORT_MEM_PATTERN: CPU memory arena and pattern planning (1/0)
+- ONNX_PREFER_INT8: load `<model>.int8.onnx` next to a model when present (default 1)
+
+onnxruntime itself is imported on the first session, not with this module.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from ml.lazy_imports import optional_import
+
+_GRAPH_OPT = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+_EXEC_MODE = {"sequential": "ORT_SEQUENTIAL", "parallel": "ORT_PARALLEL"}
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def session_config() -> Dict[str, Any]:
+    """Session settings from the environment (see module docstring)."""
+    return {
+        "intra_op_threads": _int_env("ORT_INTRA_OP_THREADS", 0),
+        "inter_op_threads": _int_env("ORT_INTER_OP_THREADS", 0),
+        "graph_optimization": os.getenv("ORT_GRAPH_OPT", "all").lower(),
+        "execution_mode": os.getenv("ORT_EXECUTION_MODE", "sequential").lower(),
+        "mem_arena": os.getenv("ORT_MEM_ARENA", "1") == "1",
+        "mem_pattern": os.getenv("ORT_MEM_PATTERN", "1") == "1",
+        "prefer_int8": os.getenv("ONNX_PREFER_INT8", "1") == "1",
+    }
+
+
+def quantized_path(model_path: Path) -> Path:
+    """`ferplus.onnx` -> `ferplus.int8.onnx`."""
+    return model_path.with_name(model_path.stem + ".int8" + model_path.suffix)
+
+
+def resolve_model(model_path: Path, prefer_int8: Optional[bool] = None) -> Path:
+    """The INT8 variant when present and preferred, else `model_path`."""
+    if prefer_int8 is None:
+        prefer_int8 = session_config()["prefer_int8"]
+    q = quantized_path(model_path)
+    if prefer_int8 and q.exists():
+        return q
+    return model_path
+
+
+def session_options(**overrides: Any):
+    """`ort.SessionOptions` built from `session_config()` plus overrides."""
+    ort = optional_import("onnxruntime")
+    cfg = session_config()
+    cfg.update(overrides)
+    opts = ort.SessionOptions()  # type: ignore
+    if cfg["intra_op_threads"] > 0:
+        opts.intra_op_num_threads = cfg["intra_op_threads"]
+    if cfg["inter_op_threads"] > 0:
+        opts.inter_op_num_threads = cfg["inter_op_threads"]
+    level = _GRAPH_OPT.get(cfg["graph_optimization"], "ORT_ENABLE_ALL")
+    opts.graph_optimization_level = getattr(ort.GraphOptimizationLevel, level)  # type: ignore
+    mode = _EXEC_MODE.get(cfg["execution_mode"], "ORT_SEQUENTIAL")
+    opts.execution_mode = getattr(ort.ExecutionMode, mode)  # type: ignore
+    opts.enable_cpu_mem_arena = bool(cfg["mem_arena"])
+    opts.enable_mem_pattern = bool(cfg["mem_pattern"])
+    return opts
+
+
+def create_session(
+    model_path: Path,
+    prefer_int8: Optional[bool] = None,
+    verify: Optional[Callable[[Path], bool]] = None,
+    **overrides: Any,
+):
+    """
+    CPU `InferenceSession` for `model_path` (or its INT8 variant), or None
+    when onnxruntime or the model is unavailable. The loaded file is kept on
+    the session as `loaded_from`.
+    :param verify: Integrity check for the chosen file (e.g.
+        `ModelStore.verify`); a rejected INT8 file falls back to FP32.
+    """
+    path = resolve_model(Path(model_path), prefer_int8)
+    if not path.exists():
+        return None
+    if verify is not None and not verify(path):
+        if path == Path(model_path):
+            return None
+        return create_session(model_path, prefer_int8=False, verify=verify, **overrides)
+    # Only import onnxruntime once there is a model to run
+    ort = optional_import("onnxruntime")
+    if ort is None:
+        return None
+    try:
+        sess = ort.InferenceSession(
+            str(path),
+            sess_options=session_options(**overrides),
+            providers=["CPUExecutionProvider"],
+        )
+    except Exception:
+        if path == Path(model_path):
+            return None
+        # A broken INT8 file should not disable the model
+        return create_session(model_path, prefer_int8=False, verify=verify, **overrides)
+    try:
+        sess.loaded_from = path
+    except Exception:
+        pass
+    return sess
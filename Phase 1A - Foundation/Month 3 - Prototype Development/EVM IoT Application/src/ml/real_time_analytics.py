@@ -2,24 +2,250 @@
 Real-time Analytics for Voting Data
 Language: Python
 Handles: Monitoring and analyzing voting data in real-time
+
+Follows the audit ledger and the ballot ledger as they grow. Both are
+rewritten atomically with `json.dumps(indent=2)`, and appending a record
+leaves every earlier byte in place, so each ledger is tailed from the byte
+offset after its last parsed record: a poll reads only the new records.
+The bytes just before that offset (ending in the last record's
+`record_hash`) are re-checked on every poll to notice a replaced ledger.
+Metrics are kept over a sliding time window in bounded structures and are
+pulled with `snapshot()`.
 """
 
-import random
+import json
+import os
 import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ml.anomaly_detection import P2Quantile
+
+# The "records" array starts within the header, which is small
+_HEAD_BYTES = 65536
+# Bytes kept from the end of the last parsed record to validate the offset
+_ANCHOR_BYTES = 96
+_RECORDS_KEY = '"records": ['
+
+
+class LedgerTail:
+    def __init__(self, path):
+        """
+        Incremental reader of a hash-chained ledger (`{"header", "records"}`).
+        :param path: Ledger file; it may not exist yet.
+        """
+        self.path = Path(path)
+        self.offset: Optional[int] = None  # byte after the last parsed record
+        self.last_seq = 0
+        self.bytes_read = 0
+        self.resets = 0
+        self._anchor = ""
+        self._stat = None
+        self._decoder = json.JSONDecoder()
+
+    def _reset(self) -> None:
+        self.offset = None
+        self.last_seq = 0
+        self._anchor = ""
+        self._stat = None
+
+    def _records_start(self, fh) -> Optional[int]:
+        head = fh.read(_HEAD_BYTES).decode("ascii", "replace")
+        self.bytes_read += len(head)
+        pos = head.find(_RECORDS_KEY)
+        return None if pos < 0 else pos + len(_RECORDS_KEY)
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Records appended since the previous poll (all records on the first)."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        stat = (st.st_size, st.st_mtime_ns)
+        if stat == self._stat:
+            return []
+        if self.offset is not None and st.st_size < self.offset:
+            self.resets += 1
+            self._reset()
+        with open(self.path, "rb") as fh:
+            if self.offset is None:
+                start = self._records_start(fh)
+                if start is None:
+                    return []
+                self.offset = start
+            fh.seek(self.offset - len(self._anchor))
+            # json.dumps escapes non-ASCII, so characters map 1:1 to bytes
+            text = fh.read().decode("ascii", "replace")
+        self.bytes_read += len(text)
+        if not text.startswith(self._anchor):
+            # The last record we parsed is gone: the ledger was replaced
+            # (new election, restore), so start over from its first record
+            self.resets += 1
+            self._reset()
+            return self.poll()
+        text = text[len(self._anchor) :]
+        records, consumed = self._parse(text)
+        if records:
+            self.offset += consumed
+            self.last_seq = records[-1].get("seq", self.last_seq + len(records))
+            self._anchor = (self._anchor + text[:consumed])[-_ANCHOR_BYTES:]
+        self._stat = stat
+        return records
+
+    def _parse(self, text: str):
+        records = []
+        pos = consumed = 0
+        n = len(text)
+        while True:
+            while pos < n and text[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= n or text[pos] == "]":
+                break
+            try:
+                record, pos = self._decoder.raw_decode(text, pos)
+            except ValueError:
+                break  # incomplete tail; picked up on the next poll
+            records.append(record)
+            consumed = pos
+        return records, consumed
 
 
 class RealTimeAnalytics:
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        data_dir=None,
+        window_seconds: float = 300.0,
+        max_open_sessions: int = 1024,
+        max_events: int = 100_000,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Streaming booth metrics from the audit and ballot ledgers.
+        :param data_dir: Directory with audit_ledger.json/ballot_ledger.json
+            (default: VOTEGUARD_DATA or ./data).
+        :param window_seconds: Sliding window for rates and durations.
+        :param max_open_sessions: Started sessions remembered while waiting
+            for their vote (oldest are dropped first).
+        :param max_events: Cap on timestamps kept per windowed metric.
+        """
+        data_dir = Path(data_dir or os.getenv("VOTEGUARD_DATA", "./data"))
+        self.audit = LedgerTail(data_dir / "audit_ledger.json")
+        self.ballots = LedgerTail(data_dir / "ballot_ledger.json")
+        self.window = window_seconds
+        self.max_open_sessions = max_open_sessions
+        self.max_events = max_events
+        self.clock = clock
+        self._audit_resets = 0
+        self._reset_metrics()
+
+    def _reset_metrics(self) -> None:
+        self._votes: deque = deque(maxlen=self.max_events)
+        self._blocked: deque = deque(maxlen=self.max_events)
+        self._durations: deque = deque(maxlen=self.max_events)  # (at, seconds)
+        self._open: "OrderedDict[str, float]" = OrderedDict()
+        self._duration_p95 = P2Quantile(0.95)
+        self.totals = {
+            "votes": 0,
+            "ballots": 0,
+            "double_votes_blocked": 0,
+            "sessions_started": 0,
+            "sessions_completed": 0,
+            "sessions_abandoned": 0,
+        }
+
+    def poll(self) -> int:
+        """Consume new ledger records; returns how many were processed."""
+        ballots = self.ballots.poll()
+        self.totals["ballots"] = self.ballots.last_seq
+        events = self.audit.poll()
+        if self.audit.resets != self._audit_resets:
+            # Replaced audit ledger (new election, restore): its records are
+            # re-read from the start, so earlier metrics would count twice
+            self._audit_resets = self.audit.resets
+            self._reset_metrics()
+            self.totals["ballots"] = self.ballots.last_seq
+        for record in events:
+            try:
+                event = json.loads(record["payload"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._on_event(event.get("kind"), event.get("details") or {}, event.get("at", 0.0))
+        self._prune(self.clock())
+        return len(ballots) + len(events)
+
+    def _on_event(self, kind: str, details: Dict[str, Any], at: float) -> None:
+        if kind == "vote_stored":
+            self.totals["votes"] += 1
+            self._votes.append(at)
+        elif kind == "double_vote_blocked":
+            self.totals["double_votes_blocked"] += 1
+            self._blocked.append(at)
+        elif kind == "SESSION_STARTED":
+            self.totals["sessions_started"] += 1
+            sid = details.get("session_id")
+            if sid:
+                self._open[sid] = at
+                self._open.move_to_end(sid)
+                while len(self._open) > self.max_open_sessions:
+                    self._open.popitem(last=False)
+        elif kind == "VOTE_STORED":
+            started = self._open.pop(details.get("session_id"), None)
+            if started is not None:
+                self.totals["sessions_completed"] += 1
+                self._durations.append((at, at - started))
+                self._duration_p95.update(at - started)
+        elif kind == "SESSION_RESET":
+            if self._open.pop(details.get("session_id"), None) is not None:
+                self.totals["sessions_abandoned"] += 1
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window
+        for q in (self._votes, self._blocked):
+            while q and q[0] < cutoff:
+                q.popleft()
+        while self._durations and self._durations[0][0] < cutoff:
+            self._durations.popleft()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current metrics for dashboards (call `poll()` first to refresh)."""
+        self._prune(self.clock())
+        durations = sorted(d for _, d in self._durations)
+        minutes = self.window / 60.0
+        return {
+            "window_seconds": self.window,
+            "votes_per_minute": len(self._votes) / minutes,
+            "double_votes_blocked_window": len(self._blocked),
+            "sessions_open": len(self._open),
+            "session_duration": {
+                "count": len(durations),
+                "mean": sum(durations) / len(durations) if durations else None,
+                "p50": durations[len(durations) // 2] if durations else None,
+                "max": durations[-1] if durations else None,
+                "p95_all_time": self._duration_p95.value,
+            },
+            "totals": dict(self.totals),
+        }
 
-    def monitor_data(self):
+    def monitor_data(self, interval: float = 1.0, iterations: Optional[int] = None):
         """
-        Simulate real-time monitoring of voting data.
+        Poll the ledgers every `interval` seconds and print a summary line.
+        :param iterations: Stop after this many polls (None = run forever).
         """
         print("[Analytics] Starting real-time monitoring...")
-        for _ in range(10):
-            time.sleep(1)
-            print(f"[Analytics] Votes processed: {random.randint(100, 500)}")
+        done = 0
+        while iterations is None or done < iterations:
+            self.poll()
+            snap = self.snapshot()
+            print(
+                f"[Analytics] Votes: {snap['totals']['votes']} "
+                f"({snap['votes_per_minute']:.1f}/min), "
+                f"blocked double votes: {snap['totals']['double_votes_blocked']}, "
+                f"open sessions: {snap['sessions_open']}"
+            )
+            done += 1
+            if iterations is None or done < iterations:
+                time.sleep(interval)
 
 
 if __name__ == "__main__":
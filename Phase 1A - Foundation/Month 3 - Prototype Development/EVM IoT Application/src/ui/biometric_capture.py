@@ -49,7 +49,18 @@ except Exception:
     serial = None
 from voteguard.adapters.audit_helper import SafeAuditLogger
 from voteguard.adapters.ml_analytics_optional import analyze, models_loaded
-from voteguard.config.env import enable_camera, overlays_enabled
+from voteguard.adapters.face_tracker import FaceTracker, detect_faces
+from voteguard.adapters.model_registry import haar_cascade
+from voteguard.adapters.ml_worker import MLWorkerClient
+from voteguard.config.env import (
+    enable_camera,
+    face_detect_scale,
+    face_redetect_every,
+    ml_out_of_process,
+    overlays_enabled,
+)
+
+from hardware.camera_stream import CameraStream
 
 # Hardware device manager (fingerprint + iris/retina + camera).
 # Imported lazily in ``capture_all_biometrics`` to keep tests and
@@ -87,9 +98,18 @@ class BiometricCaptureScreen(QWidget):
         # Camera selection
         self.selected_index = 0
         self.selected_backend = None  # None means auto
-        # Keep a copy of the latest camera frame so we can
-        # show an iris/eye preview after capture.
+        # Latest camera frame for the iris/eye preview; taken from the
+        # capture stream at capture time instead of copied every tick.
         self.last_frame = None
+        # Background capture thread + frame ring (started with the camera)
+        self.stream = None
+        self._last_seq = 0
+        # Out-of-process ML inference (created on first ML frame)
+        self.ml_worker = None
+        # Box-only preview (ML off): detect-then-track with the shared cascade
+        self.face_tracker = FaceTracker(
+            self._detect_preview_faces, redetect_every=face_redetect_every()
+        )
         self.init_ui()
 
     def init_ui(self):
@@ -233,6 +253,7 @@ class BiometricCaptureScreen(QWidget):
                     pass
             else:
                 # Start continuous frame updates
+                self._start_stream()
                 self.timer.start(30)
                 # Audit ML overlay status
                 try:
@@ -280,6 +301,9 @@ class BiometricCaptureScreen(QWidget):
             f"Models — Emotion: {'Available' if emotion_ok else 'Unavailable'}; "
             f"Age/Gender: {'Available' if demo_ok else 'Unavailable'}"
         )
+        if self.stream is not None:
+            st = self.stream.stats()
+            status_text += f" | Camera: {st['fps']} fps, dropped {st['dropped']}"
         self.model_banner.setText(status_text)
 
     def start_camera(self):
@@ -308,6 +332,7 @@ class BiometricCaptureScreen(QWidget):
                 )
                 return
         QMessageBox.information(self, "Camera", "Camera started successfully.")
+        self._start_stream()
         self.timer.start(30)
         # Audit ML enabled/disabled (no predictions logged)
         try:
@@ -329,6 +354,22 @@ class BiometricCaptureScreen(QWidget):
         # No PII; readiness is implicit
         self.continuous_camera_monitoring()
 
+    def _start_stream(self):
+        """Move frame grabbing to a background thread feeding a frame ring."""
+        if self.stream is not None and self.stream.capture is self.camera:
+            self.stream.start()
+            return
+        if self.stream is not None:
+            self.stream.stop()
+        self.stream = CameraStream(self.camera)
+        self.stream.start()
+
+    def _latest_frame(self):
+        """(seq, frame view) from the capture stream; frame is not a copy."""
+        if self.stream is None:
+            return 0, None
+        return self.stream.latest()
+
     def _open_camera(self) -> bool:
         """Try opening camera with selected backend/index; fallback to auto scan."""
         if cv2 is None:
@@ -391,72 +432,86 @@ class BiometricCaptureScreen(QWidget):
             self.override_age = None
 
     def update_frame(self):
-        if cv2 is None or self.camera is None or (not self.camera.isOpened()):
+        if cv2 is None or self.stream is None or not self.stream.running():
             self.timer.stop()
             return
-        ret, frame = self.camera.read()
-        if ret:
-            # Keep a copy for later iris/eye preview.
-            self.last_frame = frame.copy()
-            # Convert frame to RGB for PyQt5
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_frame.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(
-                rgb_frame.data, w, h, bytes_per_line, QImage.Format_RGB888
-            )
-            annotated = rgb_frame.copy()
-            if self.ml_enabled:
-                try:
-                    insights = analyze(frame)
-                except Exception:
-                    insights = []
-                # Draw boxes and overlay text (no storage/logging)
-                for res in insights:
-                    x, y, w0, h0 = res["bbox"]
-                    # Apply overrides
-                    gender = res["gender"]
-                    age = res["age"]
-                    if self.override_enabled and self.override_gender:
-                        gender = self.override_gender
-                    if self.override_enabled and (self.override_age is not None):
-                        age = self._age_bucket_for_value(self.override_age)
-                    cv2.rectangle(annotated, (x, y), (x + w0, y + h0), (0, 255, 0), 2)
-                    text = f"{gender} | Age {age} | {res['emotion']}"
-                    cv2.putText(
-                        annotated,
-                        text,
-                        (x, y - 8),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.55,
-                        (255, 0, 0),
-                        2,
-                    )
-            else:
-                # Minimal: draw face boxes without ML text when ML disabled
-                try:
-                    gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                    face_cascade = cv2.CascadeClassifier(
-                        cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
-                    )
-                    faces = face_cascade.detectMultiScale(
-                        gray_frame, scaleFactor=1.1, minNeighbors=5, minSize=(60, 60)
+        seq, frame = self._latest_frame()
+        if frame is None or seq == self._last_seq:
+            # No new frame since the last tick
+            return
+        self._last_seq = seq
+        # Convert frame to RGB for PyQt5; cvtColor allocates a new array, so
+        # overlays can be drawn on it without touching the ring slot.
+        annotated = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if self.ml_enabled:
+            try:
+                insights = self._analyze(frame)
+            except Exception:
+                insights = []
+            # Draw boxes and overlay text (no storage/logging)
+            for res in insights:
+                x, y, w0, h0 = res["bbox"]
+                # Apply overrides
+                gender = res["gender"]
+                age = res["age"]
+                if self.override_enabled and self.override_gender:
+                    gender = self.override_gender
+                if self.override_enabled and (self.override_age is not None):
+                    age = self._age_bucket_for_value(self.override_age)
+                cv2.rectangle(annotated, (x, y), (x + w0, y + h0), (0, 255, 0), 2)
+                text = f"{gender} | Age {age} | {res['emotion']}"
+                cv2.putText(
+                    annotated,
+                    text,
+                    (x, y - 8),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.55,
+                    (255, 0, 0),
+                    2,
+                )
+        else:
+            # Minimal: draw face boxes without ML text when ML disabled
+            try:
+                gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                # Detect every few frames, track the boxes in between
+                for track in self.face_tracker.update(gray_frame):
+                    x, y, w0, h0 = track.bbox
+                    cv2.rectangle(
+                        annotated, (x, y), (x + w0, y + h0), (0, 255, 0), 2
                     )
-                    for x, y, w0, h0 in faces:
-                        cv2.rectangle(
-                            annotated, (x, y), (x + w0, y + h0), (0, 255, 0), 2
-                        )
-                except Exception:
-                    pass
+            except Exception:
+                pass
 
-            # Convert annotated to QImage
-            h2, w2, ch2 = annotated.shape
-            bytes2 = ch2 * w2
-            qt_ann = QImage(annotated.data, w2, h2, bytes2, QImage.Format_RGB888)
-            self.camera_label.setPixmap(QPixmap.fromImage(qt_ann))
-        else:
-            # Stop timer if read fails repeatedly
-            self.timer.stop()
+        # Convert annotated to QImage
+        h2, w2, ch2 = annotated.shape
+        bytes2 = ch2 * w2
+        qt_ann = QImage(annotated.data, w2, h2, bytes2, QImage.Format_RGB888)
+        self.camera_label.setPixmap(QPixmap.fromImage(qt_ann))
+
+    @staticmethod
+    def _detect_preview_faces(gray):
+        # Shared cascade (loaded once per process), on a downscaled frame
+        return detect_faces(haar_cascade(), gray, scale=face_detect_scale())
+
+    def _analyze(self, frame):
+        """Face analytics for overlays; off the UI process when possible.
+
+        With the worker, results arrive asynchronously, so the boxes drawn
+        are those of the most recent frame the worker finished.
+        """
+        if self.ml_worker is None and ml_out_of_process():
+            try:
+                self.ml_worker = MLWorkerClient()
+                self.ml_worker.start()
+            except Exception:
+                self.ml_worker = False
+        if self.ml_worker:
+            # submit() copies the frame into shared memory
+            self.ml_worker.submit(frame)
+            return self.ml_worker.poll()
+        # `frame` is a ring slot the capture thread reuses after a few
+        # frames, and in-process inference can take longer than that
+        return analyze(frame.copy())
 
     def _age_bucket_for_value(self, age: int) -> str:
         buckets = [
@@ -479,15 +534,15 @@ class BiometricCaptureScreen(QWidget):
         if cv2 is None or self.camera is None:
             QTimer.singleShot(1000, self.continuous_camera_monitoring)
             return
-        ret, frame = self.camera.read()
-        if ret:
+        _seq, frame = self._latest_frame()
+        if frame is not None:
             try:
                 gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                face_cascade = cv2.CascadeClassifier(
-                    cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
-                )
-                faces = face_cascade.detectMultiScale(
-                    gray_frame, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
+                faces = detect_faces(
+                    haar_cascade(),
+                    gray_frame,
+                    scale=face_detect_scale(),
+                    min_size=(30, 30),
                 )
                 if len(faces) > 1:
                     QMessageBox.warning(
@@ -510,6 +565,10 @@ class BiometricCaptureScreen(QWidget):
         works both for real-camera and simulation modes.
         """
 
+        _seq, frame = self._latest_frame()
+        if frame is not None:
+            # Hold our own copy: the ring slot is reused by the capture thread
+            self.last_frame = frame.copy()
         if cv2 is None or self.last_frame is None:
             self.iris_label.setText("Iris captured (no camera frame available).")
             return
@@ -731,6 +790,10 @@ class BiometricCaptureScreen(QWidget):
 
     def closeEvent(self, event):
         self.timer.stop()
+        if self.stream is not None:
+            self.stream.stop()
+        if self.ml_worker:
+            self.ml_worker.stop()
         if self.camera is not None:
             self.camera.release()
         if self.serial_connection and self.serial_connection.is_open:
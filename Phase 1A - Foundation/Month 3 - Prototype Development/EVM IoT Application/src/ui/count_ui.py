@@ -3,27 +3,34 @@ import json
 from pathlib import Path
 
 import pyqtgraph as pg
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import QObject, Qt, QThread, QTimer, pyqtSignal, pyqtSlot
 from PyQt5.QtWidgets import (
     QCheckBox,
     QComboBox,
+    QDoubleSpinBox,
     QFileDialog,
     QHBoxLayout,
     QLabel,
     QMessageBox,
     QPushButton,
-    QSpinBox,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
-from scripts.verify_ledger import verify as verify_ledger
 from voteguard.config.env import data_dir, key_path
-from voteguard.core.counting import tally
+from voteguard.core.counting import (
+    LedgerIntegrityError,
+    load_aggregates,
+    save_aggregates,
+    tally_with_turnout,
+    verify_chain,
+)
+from voteguard.core.tally_cache import TallyCache
 from voteguard.adapters.audit_helper import SafeAuditLogger
 
+from ui.tally_table_model import TallyFilterProxy, TallyTableModel
+
 try:
     # Optional IPFS integration for exported results
     # This import will fail gracefully if the EVM IoT app sources
@@ -33,7 +40,114 @@ except Exception:  # pragma: no cover - optional dependency
     ipfs_client = None
 
 
+class TallyWorker(QObject):
+    """
+    Runs tally, integrity check and persistence off the GUI thread.
+
+    Emits `done` with the full counts plus a `delta` of only the changed
+    (election -> choice -> count) entries; `delta` is None when entries
+    disappeared (e.g. ledger reset) and the view must be rebuilt.
+    """
+
+    done = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, aggregates_path: Path, aggregates: dict | None):
+        super().__init__()
+        self._aggregates_path = aggregates_path
+        self._aggregates = aggregates
+        self._cache = TallyCache(data_dir() / "tally_cache.json")
+        self._counts: dict = {}
+        # (size, mtime_ns) of the ledger when this worker last verified it
+        self._verified_state = None
+
+    @pyqtSlot()
+    def refresh(self):
+        try:
+            self.done.emit(self._refresh())
+        except Exception as e:
+            self.failed.emit(str(e))
+
+    def _refresh(self) -> dict:
+        ledger = data_dir() / "ballot_ledger.json"
+        key = key_path()
+        try:
+            cache_key = TallyCache.cache_key(ledger, key)
+            state = (cache_key["size"], cache_key["mtime_ns"])
+        except Exception:
+            cache_key = state = None
+        counts = None
+        if cache_key is not None:
+            counts = self._cache.get(ledger, cache_key, verify=True)
+            mark = (self._aggregates or {}).get("watermark", {})
+            if mark.get("record_hash") != cache_key["record_hash"]:
+                counts = None
+        if counts is not None:
+            # Byte-identical to a verified ledger; still only report OK once
+            # this worker has checked the chain for this file state
+            integrity = "OK"
+            if state != self._verified_state:
+                try:
+                    verify_chain(ledger)
+                    self._verified_state = state
+                except LedgerIntegrityError:
+                    integrity = "FAIL"
+        else:
+            # Only records past the saved watermark are decrypted; the tally
+            # verifies the hash chain itself, so the ledger is checked once
+            try:
+                aggregates = tally_with_turnout(
+                    ledger, key, verify=True, previous=self._aggregates
+                )
+            except LedgerIntegrityError:
+                # Keep showing the last verified counts, flagged as FAIL
+                aggregates = None
+            if aggregates is None:
+                integrity = "FAIL"
+                counts = (self._aggregates or {}).get("counts", {})
+            else:
+                integrity = "OK"
+                # Stat taken before the tally: a concurrent append re-verifies
+                self._verified_state = state
+                if aggregates != self._aggregates:
+                    try:
+                        save_aggregates(self._aggregates_path, aggregates)
+                    except Exception:
+                        pass
+                self._aggregates = aggregates
+                counts = aggregates["counts"]
+                if cache_key is not None:
+                    try:
+                        self._cache.put(ledger, cache_key, counts, verified=True)
+                    except Exception:
+                        pass
+
+        delta = self._delta(self._counts, counts)
+        self._counts = counts
+        return {
+            "counts": counts,
+            "delta": delta,
+            "integrity": integrity,
+            "aggregates": self._aggregates,
+        }
+
+    @staticmethod
+    def _delta(old: dict, new: dict) -> dict | None:
+        delta: dict = {}
+        for election, choices in old.items():
+            if any(c not in new.get(election, {}) for c in choices):
+                return None
+        for election, choices in new.items():
+            prev = old.get(election, {})
+            changed = {c: n for c, n in choices.items() if prev.get(c) != n}
+            if changed:
+                delta[election] = changed
+        return delta
+
+
 class CountUI(QWidget):
+    _refresh_requested = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Vote Tally")
@@ -45,10 +159,17 @@ class CountUI(QWidget):
         # Filter by election
         self.filter = QComboBox()
         self.filter.addItem("All Elections")
-        self.filter.currentIndexChanged.connect(self.apply_filter)
+        self.filter.currentIndexChanged.connect(lambda _: self.apply_filter())
         layout.addWidget(self.filter)
-        self.table = QTableWidget(0, 4)
-        self.table.setHorizontalHeaderLabels(["Election", "Choice", "Count", "%"])
+        # Model/view table: refreshes emit dataChanged for changed rows only
+        self.table_model = TallyTableModel(self)
+        self.table_proxy = TallyFilterProxy(self)
+        self.table_proxy.setSourceModel(self.table_model)
+        self.table = QTableView()
+        self.table.setModel(self.table_proxy)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.AscendingOrder)
+        self.table.verticalHeader().setVisible(False)
         layout.addWidget(self.table)
         self.refresh_btn = QPushButton("Refresh")
         self.refresh_btn.clicked.connect(self.refresh_counts)
@@ -59,8 +180,10 @@ class CountUI(QWidget):
         self.auto_refresh_chk.stateChanged.connect(self.toggle_auto_refresh)
         auto_row.addWidget(self.auto_refresh_chk)
         auto_row.addWidget(QLabel("Interval (s):"))
-        self.interval_spin = QSpinBox()
-        self.interval_spin.setRange(2, 300)
+        self.interval_spin = QDoubleSpinBox()
+        self.interval_spin.setDecimals(1)
+        self.interval_spin.setSingleStep(0.5)
+        self.interval_spin.setRange(0.5, 300)
         self.interval_spin.setValue(10)
         self.interval_spin.valueChanged.connect(self.update_timer_interval)
         auto_row.addWidget(self.interval_spin)
@@ -95,8 +218,30 @@ class CountUI(QWidget):
         # Disable mouse panning/zoom to avoid accidental reflows
         self.plot.setMouseEnabled(x=False, y=False)
         layout.addWidget(self.plot)
+        # Turnout over time, fed from precomputed aggregates
+        self.turnout_plot = pg.PlotWidget()
+        self.turnout_plot.setBackground("w")
+        self.turnout_plot.setMouseEnabled(x=False, y=False)
+        self.turnout_plot.getPlotItem().setTitle("Turnout (votes per minute)")
+        self.turnout_plot.setAxisItems({"bottom": pg.DateAxisItem()})
+        self._turnout_curve = self.turnout_plot.plot(
+            [], [], pen=pg.mkPen("#ef6c00", width=2), symbol="o", symbolSize=5
+        )
+        layout.addWidget(self.turnout_plot)
         self.setLayout(layout)
         self._counts = {}
+        self._aggregates_path = data_dir() / "tally_aggregates.json"
+        self._aggregates = load_aggregates(self._aggregates_path)
+        # Background refresh: one worker thread, overlapping ticks coalesce
+        self._refresh_busy = False
+        self._refresh_pending = False
+        self._worker_thread = QThread(self)
+        self._worker = TallyWorker(self._aggregates_path, self._aggregates)
+        self._worker.moveToThread(self._worker_thread)
+        self._refresh_requested.connect(self._worker.refresh)
+        self._worker.done.connect(self._on_refresh_done)
+        self._worker.failed.connect(self._on_refresh_failed)
+        self._worker_thread.start()
         self._timer = QTimer(self)
         self._timer.timeout.connect(self.refresh_counts)
         # Cached bar graph item to update without clearing (reduces flicker)
@@ -107,24 +252,53 @@ class CountUI(QWidget):
         self.refresh_counts()
 
     def refresh_counts(self):
-        ledger = data_dir() / "ballot_ledger.json"
-        key = key_path()
-        try:
-            counts = tally(ledger, key, verify=True)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+        """Queue a background refresh; ticks arriving while one runs coalesce."""
+        if self._refresh_busy:
+            self._refresh_pending = True
             return
-        # Update integrity status
-        code = verify_ledger(ledger)
-        integrity = "OK" if code == 0 else "FAIL"
+        self._refresh_busy = True
+        self._refresh_requested.emit()
+
+    def _on_refresh_done(self, result: dict):
         from datetime import datetime
 
+        self._refresh_busy = False
+        self._aggregates = result["aggregates"]
+        counts = result["counts"]
         self.status_label.setText(
-            f"Last refresh: {datetime.now().strftime('%H:%M:%S')} | Integrity: {integrity} | Records: {sum(len(v) for v in counts.values())}"
+            f"Last refresh: {datetime.now().strftime('%H:%M:%S')} | Integrity: {result['integrity']} | Records: {sum(len(v) for v in counts.values())}"
         )
-        self._counts = counts
-        self.update_filter_options()
-        self.apply_filter()
+        delta = result["delta"]
+        if delta is None:
+            self._counts = counts
+            self.table_model.set_counts(counts)
+            self.update_filter_options()
+            self.apply_filter()
+        elif delta:
+            new_elections = set(delta) - set(self._counts)
+            for election, choices in delta.items():
+                self._counts.setdefault(election, {}).update(choices)
+            self.table_model.set_counts(self._counts, changed=set(delta))
+            if new_elections:
+                self.update_filter_options()
+            self.apply_filter(delta=delta)
+        self._drain_pending()
+
+    def _on_refresh_failed(self, message: str):
+        self._refresh_busy = False
+        QMessageBox.critical(self, "Error", message)
+        self._drain_pending()
+
+    def _drain_pending(self):
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self.refresh_counts()
+
+    def closeEvent(self, event):
+        self._timer.stop()
+        self._worker_thread.quit()
+        self._worker_thread.wait(5000)
+        super().closeEvent(event)
 
     def update_filter_options(self):
         current = self.filter.currentText()
@@ -139,36 +313,34 @@ class CountUI(QWidget):
             self.filter.setCurrentIndex(idx)
         self.filter.blockSignals(False)
 
-    def apply_filter(self):
+    def apply_filter(self, delta: dict | None = None):
+        """
+        Show the selected election in the table and charts.
+
+        The table rows live in `table_model` (updated on refresh); filtering is
+        done by the proxy. With a `delta` from the tally worker, charts for
+        views it does not touch are left alone.
+        """
         selected = self.filter.currentText()
-        rows = []
-        totals: dict[str, int] = {}
-        for election, choices in self._counts.items():
-            if selected != "All Elections" and election != selected:
-                continue
-            for choice, c in sorted(choices.items(), key=lambda kv: (-kv[1], kv[0])):
-                rows.append((election, choice, c))
-                totals[election] = totals.get(election, 0) + c
-        # Add totals row(s)
-        for election, total in totals.items():
-            rows.append((election, "TOTAL", total))
-        self.table.setRowCount(len(rows))
-        for r, (election, choice, c) in enumerate(rows):
-            self.table.setItem(r, 0, QTableWidgetItem(election))
-            self.table.setItem(r, 1, QTableWidgetItem(choice))
-            self.table.setItem(r, 2, QTableWidgetItem(str(c)))
-            # Percentage based on per-election total
-            total_for_election = totals.get(election, 0)
-            pct = (
-                100.0
-                if choice == "TOTAL" and total_for_election
-                else (100.0 * (c / total_for_election) if total_for_election else 0.0)
-            )
-            self.table.setItem(r, 3, QTableWidgetItem(f"{pct:.1f}%"))
+        self.table_proxy.set_election(selected)
+        if delta is not None and selected != "All Elections" and selected not in delta:
+            return
+        totals: dict[str, int] = {
+            election: sum(choices.values())
+            for election, choices in self._counts.items()
+            if selected == "All Elections" or election == selected
+        }
         # Draw chart for selected
-        self.draw_chart(selected, totals)
+        self.draw_chart(selected, totals, delta=delta)
+        self.draw_turnout(selected)
 
-    def draw_chart(self, selected: str, totals: dict):
+    def draw_chart(self, selected: str, totals: dict, delta: dict | None = None):
+        source = totals if selected == "All Elections" else self._counts.get(selected, {})
+        if delta is not None and self._bar_item is not None:
+            if getattr(self._bar_item, "_labels", None) == (selected, list(source)):
+                # Same bars as last draw: only heights changed
+                self._bar_item.setOpts(height=list(source.values()))
+                return
         if selected == "All Elections":
             labels = list(totals.keys())
             values = [totals[e] for e in labels]
@@ -204,6 +376,21 @@ class CountUI(QWidget):
             self.plot.getPlotItem().setTitle(f"{selected} — Votes per Choice")
             self.plot.getPlotItem().getAxis("bottom").setTicks([list(zip(x, labels))])
         self.plot.getPlotItem().getAxis("left").setLabel(text="Count")
+        self._bar_item._labels = (selected, labels)
+
+    def draw_turnout(self, selected: str):
+        """Plot votes per minute from the precomputed turnout aggregates."""
+        agg = self._aggregates or {}
+        bucket_seconds = agg.get("bucket_seconds", 60)
+        merged: dict[int, int] = {}
+        for election, series in agg.get("turnout", {}).items():
+            if selected != "All Elections" and election != selected:
+                continue
+            for bucket, c in series.items():
+                merged[int(bucket)] = merged.get(int(bucket), 0) + c
+        xs = sorted(merged)
+        ys = [merged[x] * 60.0 / bucket_seconds for x in xs]
+        self._turnout_curve.setData(xs, ys)
 
     def export_json(self):
         suggested = str((data_dir() / "results.json").resolve())
@@ -344,13 +531,13 @@ class CountUI(QWidget):
 
     def toggle_auto_refresh(self):
         if self.auto_refresh_chk.isChecked():
-            self._timer.start(self.interval_spin.value() * 1000)
+            self._timer.start(int(self.interval_spin.value() * 1000))
         else:
             self._timer.stop()
 
     def update_timer_interval(self):
         if self._timer.isActive():
-            self._timer.start(self.interval_spin.value() * 1000)
+            self._timer.start(int(self.interval_spin.value() * 1000))
 
     def view_last_ipfs(self):
         """Open the last exported IPFS CID in the default browser.
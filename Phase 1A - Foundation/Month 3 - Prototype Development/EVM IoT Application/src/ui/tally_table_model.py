@@ -0,0 +1,145 @@
+"""
+Model/view backing for the CountUI results table.
+
+`TallyTableModel` holds one row per (election, choice) plus a TOTAL row per
+election and diffs each new tally against what it already shows: changed
+counts emit `dataChanged` for the affected election's rows only, new
+choices are appended with `beginInsertRows`, and only vanished rows (e.g. a
+reset ledger) force a model reset. `TallyFilterProxy` does election
+filtering and the count ordering without touching the source rows.
+"""
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+
+HEADERS = ["Election", "Choice", "Count", "%"]
+TOTAL = "TOTAL"
+ALL_ELECTIONS = "All Elections"
+
+
+class TallyTableModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: list[tuple[str, str]] = []
+        self._counts: dict[str, dict[str, int]] = {}
+        self._totals: dict[str, int] = {}
+
+    # Qt model API
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        election, choice = self._rows[index.row()]
+        col = index.column()
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return election
+            if col == 1:
+                return choice
+            count = self.count(index.row())
+            if col == 2:
+                return str(count)
+            return f"{self._percent(election, count):.1f}%"
+        if role == Qt.TextAlignmentRole and col >= 2:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    # Tally access
+    def election(self, row: int) -> str:
+        return self._rows[row][0]
+
+    def count(self, row: int) -> int:
+        election, choice = self._rows[row]
+        if choice == TOTAL:
+            return self._totals.get(election, 0)
+        return self._counts.get(election, {}).get(choice, 0)
+
+    def sort_key(self, row: int) -> tuple:
+        """Per election: choices by count desc then name, TOTAL last."""
+        election, choice = self._rows[row]
+        is_total = choice == TOTAL
+        return (election, is_total, 0 if is_total else -self.count(row), choice)
+
+    def _percent(self, election: str, count: int) -> float:
+        total = self._totals.get(election, 0)
+        return 100.0 * count / total if total else 0.0
+
+    def set_counts(self, counts: dict, changed: set | None = None) -> None:
+        """
+        Apply a new tally. `changed` optionally limits the diff to the given
+        elections (the tally worker's delta keys).
+        """
+        new_keys = set()
+        for election, choices in counts.items():
+            new_keys.update((election, c) for c in choices)
+            new_keys.add((election, TOTAL))
+        if not set(self._rows) <= new_keys:
+            self.beginResetModel()
+            self._store(counts)
+            self._rows = sorted(new_keys)
+            self.endResetModel()
+            return
+
+        if changed is None:
+            changed = {e for e in counts if counts[e] != self._counts.get(e)}
+        added = sorted(new_keys.difference(self._rows))
+        self._store(counts, changed)
+        if added:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            self._rows.extend(added)
+            self.endInsertRows()
+        if not changed:
+            return
+        # Column 0 is included: its sort key depends on the count, and the
+        # proxy only re-sorts on changes that cover the sort column.
+        last_col = len(HEADERS) - 1
+        for row, (election, _choice) in enumerate(self._rows):
+            if election in changed:
+                self.dataChanged.emit(
+                    self.index(row, 0), self.index(row, last_col), [Qt.DisplayRole]
+                )
+
+    def _store(self, counts: dict, elections=None) -> None:
+        for election in counts if elections is None else elections:
+            choices = counts.get(election, {})
+            self._counts[election] = dict(choices)
+            self._totals[election] = sum(choices.values())
+        if elections is None:
+            for stale in set(self._counts) - set(counts):
+                del self._counts[stale]
+                self._totals.pop(stale, None)
+
+
+class TallyFilterProxy(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._election = ALL_ELECTIONS
+        self.setDynamicSortFilter(True)
+
+    def set_election(self, election: str) -> None:
+        if election != self._election:
+            self._election = election
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._election == ALL_ELECTIONS:
+            return True
+        return self.sourceModel().election(source_row) == self._election
+
+    def lessThan(self, left, right):
+        model = self.sourceModel()
+        if left.column() == 2 or left.column() == 3:
+            return model.count(left.row()) < model.count(right.row())
+        if left.column() == 0:
+            return model.sort_key(left.row()) < model.sort_key(right.row())
+        return super().lessThan(left, right)
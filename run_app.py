@@ -1,6 +1,11 @@
+import argparse
 import os
 import sys
+import time
 
+_T0 = time.perf_counter()
+
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 
 # Add src to sys.path for absolute imports
@@ -14,13 +19,44 @@ src_path = os.path.join(
 if src_path not in sys.path:
     sys.path.insert(0, src_path)
 
-from ui.main_ui import MainUI
+from voteguard.adapters.startup_profile import StartupProfile
+from voteguard.config.env import profile_startup
+
+profile = StartupProfile(started=_T0)
+with profile.stage("import ui"):
+    from ui.main_ui import MainUI
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description="VoteGuard booth UI")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print a per-stage startup profile (also VOTEGUARD_PROFILE_STARTUP=1)",
+    )
+    parser.add_argument(
+        "--exit-after-startup",
+        action="store_true",
+        help="quit once the first screen is ready (for measuring startup)",
+    )
+    args, _ = parser.parse_known_args(argv)
+
+    with profile.stage("QApplication"):
+        app = QApplication([])
+    with profile.stage("MainUI"):
+        main_ui = MainUI()
+    with profile.stage("show"):
+        main_ui.show()
 
+    def _ready():
+        # First event-loop turn: the Aadhaar screen has been painted
+        profile.mark("first screen ready")
+        if args.profile_startup or profile_startup():
+            print(profile.format(), flush=True)
+        if args.exit_after_startup:
+            app.quit()
 
-def run():
-    app = QApplication([])
-    main_ui = MainUI()
-    main_ui.show()
+    QTimer.singleShot(0, _ready)
     app.exec_()
 
 
@@ -7,14 +7,15 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from voteguard.config.env import data_dir, key_path
-from voteguard.core.counting import tally
+from voteguard.core.tally_cache import TallyCache, cached_tally
 
 
 def main() -> int:
     ledger = data_dir() / "ballot_ledger.json"
     key = key_path()
     try:
-        counts = tally(ledger, key, verify=True)
+        cache = TallyCache(data_dir() / "tally_cache.json")
+        counts = cached_tally(ledger, key, verify=True, cache=cache)
     except Exception as e:
         print(f"ERROR: {e}")
         return 1
@@ -0,0 +1,122 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+import cv2
+
+from voteguard.adapters.face_tracker import detect_faces, effective_detect_scale, iou
+
+
+def _recall(found, reference, threshold: float):
+    """Greedy IoU matching; returns (reference faces matched, extra boxes)."""
+    unmatched = list(found)
+    hits = 0
+    for ref in reference:
+        best = max(unmatched, key=lambda b: iou(ref, b), default=None)
+        if best is not None and iou(ref, best) >= threshold:
+            unmatched.remove(best)
+            hits += 1
+    return hits, len(unmatched)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Face detection latency vs recall at several detection scales"
+    )
+    parser.add_argument("video", type=str, help="Recorded booth video file")
+    parser.add_argument(
+        "--scales",
+        type=str,
+        default="1.0,0.75,0.5,0.35,0.25",
+        help="Comma-separated detection scales (1.0 is the reference)",
+    )
+    parser.add_argument(
+        "--frames", type=int, default=300, help="Frames to evaluate (-1 for all)"
+    )
+    parser.add_argument(
+        "--stride", type=int, default=1, help="Evaluate every Nth frame"
+    )
+    parser.add_argument(
+        "--min-size", type=int, default=60, help="Minimum face size in full-res pixels"
+    )
+    parser.add_argument(
+        "--iou", type=float, default=0.5, help="IoU for a box to count as found"
+    )
+    parser.add_argument("--out", type=str, default="", help="Write results JSON here")
+    args = parser.parse_args()
+
+    cascade = cv2.CascadeClassifier(
+        cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+    )
+    scales = sorted({float(s) for s in args.scales.split(",") if s.strip()} | {1.0}, reverse=True)
+    cap = cv2.VideoCapture(args.video)
+    if not cap.isOpened():
+        raise SystemExit(f"Could not open video: {args.video}")
+
+    timings = {s: [] for s in scales}
+    hits = {s: 0 for s in scales}
+    extra = {s: 0 for s in scales}
+    ref_faces = 0
+    evaluated = 0
+    index = -1
+    while args.frames < 0 or evaluated < args.frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        index += 1
+        if index % max(1, args.stride):
+            continue
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        found = {}
+        for scale in scales:
+            started = time.perf_counter()
+            found[scale] = detect_faces(
+                cascade, gray, scale=scale, min_size=(args.min_size, args.min_size)
+            )
+            timings[scale].append(time.perf_counter() - started)
+        reference = found[1.0]
+        ref_faces += len(reference)
+        for scale in scales:
+            h, e = _recall(found[scale], reference, args.iou)
+            hits[scale] += h
+            extra[scale] += e
+        evaluated += 1
+    cap.release()
+    if not evaluated:
+        raise SystemExit("No frames read from video")
+
+    rows = []
+    for scale in scales:
+        ms = sorted(t * 1000.0 for t in timings[scale])
+        rows.append(
+            {
+                "scale": scale,
+                "effective_scale": effective_detect_scale(scale, (args.min_size, args.min_size)),
+                "mean_ms": round(sum(ms) / len(ms), 2),
+                "p95_ms": round(ms[min(len(ms) - 1, int(0.95 * len(ms)))], 2),
+                "recall": round(hits[scale] / ref_faces, 4) if ref_faces else None,
+                "extra_boxes": extra[scale],
+            }
+        )
+
+    print(f"{evaluated} frames, {ref_faces} reference faces (scale 1.0)")
+    print(f"{'scale':>6} {'eff.':>5} {'mean ms':>9} {'p95 ms':>8} {'recall':>7} {'extra':>6}")
+    for r in rows:
+        recall = "n/a" if r["recall"] is None else f"{r['recall']:.3f}"
+        print(
+            f"{r['scale']:>6.2f} {r['effective_scale']:>5.2f} {r['mean_ms']:>9.2f} {r['p95_ms']:>8.2f} {recall:>7} {r['extra_boxes']:>6}"
+        )
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(
+            json.dumps(
+                {"video": args.video, "frames": evaluated, "reference_faces": ref_faces, "results": rows},
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
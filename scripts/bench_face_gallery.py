@@ -0,0 +1,83 @@
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Resolve repo root and add EVM src to path
+repo_root = Path(__file__).resolve().parents[1]
+src_dir = (
+    repo_root
+    / "Phase 1A - Foundation"
+    / "Month 3 - Prototype Development"
+    / "EVM IoT Application"
+    / "src"
+)
+sys.path.append(str(src_dir))
+
+from ml.face_gallery import FaceGallery, normalize_rows
+
+
+def _synthetic(rng, centers, n, noise):
+    """Embeddings clustered around identity-like centers."""
+    picks = rng.integers(0, len(centers), n)
+    return normalize_rows(centers[picks] + noise * rng.standard_normal((n, centers.shape[1]), dtype=np.float32))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="1:N face gallery enrollment and duplicate-check latency"
+    )
+    parser.add_argument("--size", type=int, default=1_000_000, help="Enrolled faces")
+    parser.add_argument("--dim", type=int, default=512, help="Embedding size")
+    parser.add_argument("--queries", type=int, default=200, help="Timed queries")
+    parser.add_argument("--nlist", type=int, default=0, help="IVF cells (0 = auto)")
+    parser.add_argument("--nprobe", type=int, default=16, help="Cells scanned per query")
+    parser.add_argument("--dir", type=str, default="", help="Gallery directory (default: temp)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((max(1, args.size // 50), args.dim), dtype=np.float32)
+    workdir = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix="gallery_"))
+    gallery = FaceGallery(workdir, dim=args.dim)
+
+    started = time.perf_counter()
+    batch = 50_000
+    for s in range(len(gallery), args.size, batch):
+        n = min(batch, args.size - s)
+        gallery.enroll([f"face-{i}" for i in range(s, s + n)], _synthetic(rng, centers, n, 0.5), flush=False)
+    gallery.flush()
+    print(f"[Enroll] {len(gallery)} faces in {time.perf_counter() - started:.1f}s -> {workdir}")
+
+    started = time.perf_counter()
+    gallery.build_index(nlist=args.nlist or None)
+    print(f"[Index] {len(gallery.centroids)} cells in {time.perf_counter() - started:.1f}s")
+
+    # Queries: perturbed copies of enrolled faces (true duplicates)
+    picks = rng.integers(0, len(gallery), args.queries)
+    queries = normalize_rows(
+        gallery.embeddings[np.sort(picks)] + 0.05 * rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    )
+    for label, nprobe in (("ivf", args.nprobe), ("exact", None)):
+        n = args.queries if nprobe else min(args.queries, 20)
+        timings, hits = [], []
+        for q in queries[:n]:
+            t0 = time.perf_counter()
+            hits.append(gallery.search(q, k=1, nprobe=nprobe)[0])
+            timings.append((time.perf_counter() - t0) * 1000.0)
+        timings.sort()
+        print(
+            f"[{label}] {n} queries: p50 {timings[len(timings) // 2]:.2f} ms, "
+            f"p95 {timings[int(0.95 * (len(timings) - 1))]:.2f} ms"
+        )
+        if nprobe:
+            ivf_hits = hits
+    exact = [gallery.search(q, k=1, nprobe=None)[0][0][0] for q in queries[:20]]
+    recall = np.mean([ivf_hits[i][0][0] == exact[i] for i in range(len(exact)) if ivf_hits[i]])
+    print(f"[ivf] recall@1 vs exact on {len(exact)} queries: {recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
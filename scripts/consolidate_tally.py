@@ -0,0 +1,80 @@
+import argparse
+import json
+from pathlib import Path
+
+from voteguard.core.consolidation import consolidate, discover_booths
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Verify, tally and merge many booth ballot ledgers"
+    )
+    parser.add_argument(
+        "source",
+        type=str,
+        help="Directory of booth folders (each with ballot_ledger.json) or a JSON manifest",
+    )
+    parser.add_argument(
+        "--key",
+        type=str,
+        default="",
+        help="Fallback Fernet key for booths without their own key.key",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=0, help="Worker processes (0 = CPU count)"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default="",
+        help="Checkpoint file for resuming (default: <out>.ckpt.jsonl when --out is set)",
+    )
+    parser.add_argument(
+        "--out", type=str, default="", help="Optional path to write consolidated JSON"
+    )
+    args = parser.parse_args()
+
+    booths = discover_booths(Path(args.source), Path(args.key) if args.key else None)
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = Path(args.checkpoint)
+    elif args.out:
+        checkpoint = Path(args.out).with_suffix(".ckpt.jsonl")
+
+    def _progress(r):
+        print(f"  [{r['status']}] {r['booth']} ({r.get('records', 0)} records)")
+
+    print(f"Consolidating {len(booths)} booth ledger(s)...")
+    result = consolidate(
+        booths,
+        workers=args.workers or None,
+        checkpoint=checkpoint,
+        on_result=_progress,
+    )
+
+    print("\nElection Totals:")
+    for election, choices in result["elections"].items():
+        print(f"- {election}")
+        for choice, c in sorted(choices.items(), key=lambda kv: (-kv[1], kv[0])):
+            print(f"  * {choice}: {c}")
+    failed = [b for b, r in result["booths"].items() if r["status"] != "OK"]
+    if failed:
+        print("\nExcluded booths (verification failed):")
+        for b in failed:
+            print(f"  - {b}: {result['booths'][b].get('error', '')}")
+    stats = result["stats"]
+    print(
+        f"\nBooths: {stats['booths']} (resumed {stats['resumed']}) | "
+        f"Records: {stats['processed_records']} in {stats['elapsed_s']}s "
+        f"({stats['records_per_s']} records/s)"
+    )
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(result, indent=2))
+        print(f"\nSaved consolidated tally to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
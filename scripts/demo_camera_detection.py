@@ -1,7 +1,7 @@
 import argparse
+import json
 import sys
 import time
-from datetime import datetime
 from pathlib import Path
 
 import cv2
@@ -16,12 +16,18 @@ src_dir = (
     / "src"
 )
 sys.path.append(str(src_dir))
+sys.path.append(str(repo_root))
 
 import os
 
+from hardware.frame_writer import FrameWriter
 from ml.demographics_recognizer import DemographicsRecognizer
 from ml.emotion_recognizer import EmotionRecognizer
 
+from voteguard.adapters.face_preprocess import FacePreprocessor
+from voteguard.adapters.face_quality import QualityGate
+from voteguard.adapters.face_tracker import FaceTracker, detect_faces
+
 
 def _try_open_camera() -> cv2.VideoCapture:
     """Try multiple backends and indices to open a camera reliably on Windows."""
@@ -56,6 +62,95 @@ def _age_bucket_for_value(age: int) -> str:
     return "(25-32)" if 22 <= age <= 35 else "(60-100)" if age >= 60 else "(15-20)"
 
 
+STAGES = ["read", "detect_track", "emotion", "demographics", "annotate", "write"]
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+class _ImageDirCapture:
+    """`cv2.VideoCapture`-like reader over the images of a directory."""
+
+    def __init__(self, directory: Path):
+        self._paths = iter(
+            sorted(p for p in directory.iterdir() if p.suffix.lower() in IMAGE_EXTS)
+        )
+
+    def isOpened(self) -> bool:
+        return True
+
+    def read(self):
+        for path in self._paths:
+            frame = cv2.imread(str(path))
+            if frame is not None:
+                return True, frame
+        return False, None
+
+    def release(self) -> None:
+        self._paths = iter(())
+
+
+def _open_replay(source: str):
+    path = Path(source)
+    if path.is_dir():
+        return _ImageDirCapture(path)
+    return cv2.VideoCapture(str(path))
+
+
+def _peak_memory_mb():
+    """Peak resident set size of this process, if the platform reports it."""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    except Exception:
+        pass
+    try:
+        import psutil  # type: ignore
+
+        return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+    except Exception:
+        return None
+
+
+def _percentiles(samples):
+    ms = sorted(t * 1000.0 for t in samples)
+    if not ms:
+        return {}
+    pick = lambda q: round(ms[min(len(ms) - 1, int(q * len(ms)))], 3)
+    return {
+        "mean": round(sum(ms) / len(ms), 3),
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p99": pick(0.99),
+        "max": round(ms[-1], 3),
+    }
+
+
+def _replay_report(stages, frames: int, wall: float, tracker) -> dict:
+    return {
+        "frames": frames,
+        "wall_s": round(wall, 3),
+        "fps": round(frames / wall, 2) if wall > 0 else None,
+        "peak_rss_mb": _peak_memory_mb(),
+        "tracker": dict(tracker.stats),
+        "stages_ms": {name: _percentiles(samples) for name, samples in stages.items()},
+    }
+
+
+def _print_report(report: dict) -> None:
+    print(
+        f"[Replay] {report['frames']} frames in {report['wall_s']}s "
+        f"-> {report['fps']} FPS, peak RSS {report['peak_rss_mb']} MB"
+    )
+    print(f"{'stage':>13} {'mean':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    for name, p in report["stages_ms"].items():
+        if p:
+            print(
+                f"{name:>13} {p['mean']:>8.2f} {p['p50']:>8.2f} {p['p90']:>8.2f} {p['p99']:>8.2f} {p['max']:>8.2f}"
+            )
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Camera detection demo with emotion and demographics overlays (model-driven)"
@@ -77,12 +172,65 @@ def main():
         default=-1,
         help="Number of frames to process in headless mode (-1 for infinite)",
     )
+    parser.add_argument(
+        "--redetect-every",
+        type=int,
+        default=5,
+        help="Run the face detector every N frames and track faces in between",
+    )
+    parser.add_argument(
+        "--detect-scale",
+        type=float,
+        default=0.5,
+        help="Run face detection on the frame downscaled by this factor",
+    )
+    parser.add_argument(
+        "--no-quality-gate",
+        action="store_true",
+        help="Run the recognizers on every face, including unusable crops",
+    )
+    parser.add_argument(
+        "--replay",
+        type=str,
+        default="",
+        help="Replay a video file or image directory instead of the camera "
+        "(headless, as fast as possible, prints a latency report)",
+    )
+    parser.add_argument(
+        "--no-write",
+        action="store_true",
+        help="Do not save annotated frames in headless/replay mode",
+    )
+    parser.add_argument(
+        "--report", type=str, default="", help="Write the replay report JSON here"
+    )
+    parser.add_argument(
+        "--write-video",
+        type=str,
+        default="",
+        help="Write annotated frames into this MJPEG .avi instead of JPEG files",
+    )
+    parser.add_argument(
+        "--write-every", type=int, default=1, help="Save only every Nth frame"
+    )
+    parser.add_argument(
+        "--writer-workers", type=int, default=2, help="Background JPEG writer threads"
+    )
+    parser.add_argument(
+        "--write-queue", type=int, default=32, help="Frames buffered for the writer"
+    )
+    parser.add_argument(
+        "--drop",
+        choices=["oldest", "newest"],
+        default="oldest",
+        help="Which frames to drop when the writer falls behind",
+    )
     args = parser.parse_args()
 
     print("[Demo] Starting camera detection demo… Press 'q' to quit.")
     overlays_on = os.getenv("VOTEGUARD_OVERLAYS", "1") == "1"
 
-    # Initialize recognizers (will auto-download age/gender models if missing)
+    # Initialize recognizers (offline; fetch models first with scripts/prefetch_models.py)
     emo = EmotionRecognizer()
     demo = DemographicsRecognizer()
 
@@ -90,44 +238,100 @@ def main():
     face_cascade = cv2.CascadeClassifier(
         cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
     )
+    tracker = FaceTracker(
+        lambda gray: detect_faces(
+            face_cascade,
+            gray,
+            scale=args.detect_scale,
+            scale_factor=1.2,
+            min_neighbors=6,
+            min_size=(80, 80),
+        ),
+        redetect_every=args.redetect_every,
+    )
+    gate = None if args.no_quality_gate else QualityGate()
+    prep = FacePreprocessor()
 
-    cap = _try_open_camera()
+    if args.replay:
+        cap = _open_replay(args.replay)
+        args.headless = True
+        print(f"[Replay] {args.replay}")
+    else:
+        cap = _try_open_camera()
     if not cap.isOpened():
-        print("[Error] Could not open camera.")
+        print("[Error] Could not open camera." if not args.replay else "[Error] Could not open replay source.")
         return
 
-    if args.headless:
-        save_dir = Path(args.save_dir)
-        save_dir.mkdir(parents=True, exist_ok=True)
-        print(f"[Headless] Saving frames to: {save_dir}")
+    writer = None
+    if args.headless and not args.no_write:
+        # Encoding and disk I/O happen on background threads
+        writer = FrameWriter(
+            args.save_dir,
+            workers=args.writer_workers,
+            queue_size=args.write_queue,
+            drop=args.drop,
+            sample_every=args.write_every,
+            video_path=args.write_video or None,
+        ).start()
+        print(f"[Headless] Saving frames to: {args.write_video or args.save_dir}")
 
+    stages = {name: [] for name in STAGES}
     last_log = 0.0
     processed = 0
+    started = time.perf_counter()
     try:
         while True:
+            t0 = time.perf_counter()
             ret, frame_bgr = cap.read()
             if not ret:
+                if args.replay:
+                    break
                 print("[Warn] Frame grab failed; retrying…")
                 time.sleep(0.05)
                 continue
 
-            frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+            t1 = time.perf_counter()
             gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
 
-            faces = face_cascade.detectMultiScale(
-                gray, scaleFactor=1.2, minNeighbors=6, minSize=(80, 80)
+            tracks = tracker.update(gray)
+            # Blurred, tiny or badly exposed faces keep their last labels
+            todo = tracks
+            if gate is not None and tracks:
+                usable = gate.evaluate(gray, [t.bbox for t in tracks])
+                todo = [t for t, ok in zip(tracks, usable) if ok]
+
+            boxes = [t.bbox for t in todo]
+            # Predict emotion and demographics for all faces in one batch
+            # (model-driven only); input tensors are built once per face
+            t2 = time.perf_counter()
+            if emo.available():
+                emotions = emo.predict_tensor(prep.gray_tensor(gray, boxes, emo.INPUT_SIZE))
+            else:
+                emotions = emo.predict_batch(prep.rgb_rois(frame_bgr, boxes))
+            t3 = time.perf_counter()
+            demographics = demo.predict_blob(
+                prep.rgb_blob(frame_bgr, boxes, demo.INPUT_SIZE, demo.MEAN)
             )
+            t4 = time.perf_counter()
+            for track, (label, conf), demo_out in zip(todo, emotions, demographics):
+                # Smoothed over this face's own history
+                track.emotion = (track.smooth_emotion(label), conf)
+                track.demographics = demo_out
 
-            for x, y, w, h in faces:
-                roi_rgb = frame_rgb[y : y + h, x : x + w]
-                # Predict emotion and demographics (model-driven only)
-                label, conf = emo.predict(roi_rgb)
-                age_bucket, age_conf, gender_label, gender_conf = demo.predict(roi_rgb)
+            info = None
+            for track in tracks:
+                if track.emotion is None:
+                    continue
+                x, y, w, h = track.bbox
+                label, conf = track.emotion
+                age_bucket, age_conf, gender_label, gender_conf = track.demographics
+                if info is None:
+                    info = (track.track_id, gender_label, gender_conf, age_bucket, age_conf, label, conf)
 
                 # Draw overlays if enabled
                 if overlays_on:
                     cv2.rectangle(frame_bgr, (x, y), (x + w, y + h), (0, 255, 0), 2)
-                    text = f"{gender_label} ({gender_conf:.2f}) | {age_bucket} ({age_conf:.2f}) | {label} ({conf:.2f})"
+                    text = f"#{track.track_id} {gender_label} ({gender_conf:.2f}) | {age_bucket} ({age_conf:.2f}) | {label} ({conf:.2f})"
                     y_text = y - 10 if y - 10 > 20 else y + 25
                     cv2.putText(
                         frame_bgr,
@@ -140,28 +344,26 @@ def main():
                         cv2.LINE_AA,
                     )
 
-            # Periodic console log
+            # Periodic console log (reuses this frame's predictions)
             now = time.time()
-            if overlays_on and now - last_log > 2.0 and len(faces) > 0:
-                x, y, w, h = faces[0]
-                roi_rgb = frame_rgb[y : y + h, x : x + w]
-                label, conf = emo.predict(roi_rgb)
-                age_bucket, age_conf, gender_label, gender_conf = demo.predict(roi_rgb)
+            if overlays_on and now - last_log > 2.0 and info is not None:
+                tid, gender_label, gender_conf, age_bucket, age_conf, label, conf = info
                 print(
-                    f"[Info] Face -> Gender: {gender_label} ({gender_conf:.2f}), Age: {age_bucket} ({age_conf:.2f}), Emotion: {label} ({conf:.2f})"
+                    f"[Info] Face #{tid} -> Gender: {gender_label} ({gender_conf:.2f}), Age: {age_bucket} ({age_conf:.2f}), Emotion: {label} ({conf:.2f})"
                 )
                 last_log = now
+            t5 = time.perf_counter()
 
             if args.headless:
-                ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-                out_path = Path(args.save_dir) / f"frame_{ts}.jpg"
-                cv2.imwrite(str(out_path), frame_bgr)
+                if writer is not None:
+                    writer.submit(frame_bgr)
+                t6 = time.perf_counter()
+                for name, dt in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t5 - t4, t6 - t5)):
+                    stages[name].append(dt)
                 processed += 1
                 if args.frames > 0 and processed >= args.frames:
                     print(f"[Headless] Processed {processed} frames; exiting.")
                     break
-                # Small sleep to avoid spamming disk too fast
-                time.sleep(0.02)
             else:
                 cv2.imshow("Camera Detection Demo", frame_bgr)
                 key = cv2.waitKey(1) & 0xFF
@@ -174,8 +376,20 @@ def main():
         cap.release()
         if not args.headless:
             cv2.destroyAllWindows()
+        wall = time.perf_counter() - started
+        write_stats = writer.close() if writer is not None else None
+        if write_stats:
+            print(f"[Headless] Writer: {write_stats}")
+        if args.replay and processed:
+            report = _replay_report(stages, processed, wall, tracker)
+            report["quality_gate"] = dict(gate.stats) if gate is not None else None
+            report["writer"] = write_stats
+            _print_report(report)
+            if args.report:
+                Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+                Path(args.report).write_text(json.dumps(report, indent=2))
+                print(f"[Replay] Report written to {args.report}")
         print("[Demo] Camera demo closed.")
 
-
 if __name__ == "__main__":
     main()
@@ -0,0 +1,81 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Resolve repo root and add EVM src to path
+repo_root = Path(__file__).resolve().parents[1]
+src_dir = (
+    repo_root
+    / "Phase 1A - Foundation"
+    / "Month 3 - Prototype Development"
+    / "EVM IoT Application"
+    / "src"
+)
+sys.path.append(str(src_dir))
+
+from ml.model_store import REMOTE_MODELS, ModelStore
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fetch, record or verify the face models in the offline model store"
+    )
+    parser.add_argument(
+        "--models-dir",
+        type=str,
+        default=str(repo_root / "Phase 1A - Foundation" / "models"),
+        help="Model directory (manifest.json is kept here)",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="*",
+        default=None,
+        help=f"Model files to handle (default: {', '.join(REMOTE_MODELS)})",
+    )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--record",
+        action="store_true",
+        help="No network: hash files already in --models-dir into the manifest",
+    )
+    group.add_argument(
+        "--verify",
+        action="store_true",
+        help="No network: check files against the manifest (exit 1 on failure)",
+    )
+    parser.add_argument("--force", action="store_true", help="Re-download verified files")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (s)")
+    args = parser.parse_args()
+
+    store = ModelStore(args.models_dir)
+    if args.record:
+        names = args.only or sorted(
+            p.name
+            for p in store.models_dir.iterdir()
+            if p.is_file() and p.suffix in {".onnx", ".caffemodel", ".prototxt"}
+        )
+        result = {}
+        for name in names:
+            if store.path(name).exists():
+                entry = store.record(name)
+                result[name] = {"sha256": entry["sha256"], "size": entry["size"]}
+            else:
+                result[name] = "missing"
+        print(json.dumps(result, indent=2))
+        return 0
+    if args.verify:
+        result = store.verify_all()
+        if args.only:
+            result = {n: store.verify(store.path(n)) and n in store.models for n in args.only}
+        print(json.dumps(result, indent=2))
+        return 0 if result and all(result.values()) else 1
+
+    result = store.prefetch(args.only, timeout=args.timeout, force=args.force)
+    print(json.dumps(result, indent=2))
+    print(f"[Manifest] {store.manifest_path}")
+    return 0 if all(v in ("ok", "downloaded") for v in result.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Resolve repo root and add EVM src to path
+repo_root = Path(__file__).resolve().parents[1]
+src_dir = (
+    repo_root
+    / "Phase 1A - Foundation"
+    / "Month 3 - Prototype Development"
+    / "EVM IoT Application"
+    / "src"
+)
+sys.path.append(str(src_dir))
+
+from ml.demographics_recognizer import DemographicsRecognizer
+from ml.emotion_recognizer import EMOTIONS, EmotionRecognizer
+from ml.model_store import ModelStore
+from ml.onnx_session import create_session, quantized_path
+
+# model file -> (input builder for a list of RGB faces, label set per output)
+MODELS = {
+    "ferplus.onnx": (
+        lambda faces: np.concatenate([EmotionRecognizer.preprocess(f) for f in faces]),
+        [EMOTIONS],
+    ),
+    "age_gender.onnx": (
+        DemographicsRecognizer.preprocess,
+        [DemographicsRecognizer.AGE_BUCKETS, ["Male", "Female"]],
+    ),
+}
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+def _load_faces(directory: str, limit: int):
+    """RGB face crops and their labels (parent folder name) from a directory."""
+    import cv2
+
+    faces, labels = [], []
+    if directory:
+        for path in sorted(Path(directory).rglob("*")):
+            if path.suffix.lower() not in IMAGE_EXTS:
+                continue
+            img = cv2.imread(str(path))
+            if img is None:
+                continue
+            faces.append(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+            labels.append(path.parent.name)
+            if len(faces) >= limit:
+                break
+    if not faces:
+        # No data: random crops still give latency and FP32/INT8 agreement
+        rng = np.random.default_rng(0)
+        faces = [rng.integers(0, 255, (96, 96, 3), dtype=np.uint8) for _ in range(limit)]
+        labels = [None] * limit
+    return faces, labels
+
+
+class _Calibration:
+    """`CalibrationDataReader` over preprocessed face tensors."""
+
+    def __init__(self, input_name, tensors):
+        self._items = iter([{input_name: t} for t in tensors])
+
+    def get_next(self):
+        return next(self._items, None)
+
+
+def quantize(model: Path, out: Path, mode: str, calib_tensors) -> None:
+    from onnxruntime import quantization as q  # type: ignore
+
+    if mode == "static":
+        import onnxruntime as ort  # type: ignore
+
+        name = ort.InferenceSession(str(model), providers=["CPUExecutionProvider"]).get_inputs()[0].name
+        q.quantize_static(
+            str(model),
+            str(out),
+            _Calibration(name, calib_tensors),
+            quant_format=q.QuantFormat.QDQ,
+            activation_type=q.QuantType.QUInt8,
+            weight_type=q.QuantType.QInt8,
+            per_channel=True,
+        )
+    else:
+        q.quantize_dynamic(str(model), str(out), weight_type=q.QuantType.QInt8)
+
+
+def _run_all(sess, tensors, runs: int):
+    name = sess.get_inputs()[0].name
+    outputs, timings = None, []
+    for r in range(runs):
+        batch_out = []
+        for t in tensors:
+            started = time.perf_counter()
+            out = sess.run(None, {name: t})
+            timings.append(time.perf_counter() - started)
+            batch_out.append(out)
+        if r == 0:
+            outputs = batch_out
+    ms = sorted(t * 1000.0 for t in timings)
+    return outputs, {
+        "mean_ms": round(sum(ms) / len(ms), 3),
+        "p95_ms": round(ms[min(len(ms) - 1, int(0.95 * len(ms)))], 3),
+    }
+
+
+def compare(model: Path, tensors, labels, label_sets, runs: int):
+    fp32 = create_session(model, prefer_int8=False)
+    int8 = create_session(model, prefer_int8=True)
+    if fp32 is None or int8 is None:
+        return {"error": "onnxruntime unavailable or model failed to load"}
+    out32, lat32 = _run_all(fp32, tensors, runs)
+    out8, lat8 = _run_all(int8, tensors, runs)
+    report = {
+        "fp32": dict(lat32, size_mb=round(model.stat().st_size / 1e6, 2)),
+        "int8": dict(lat8, size_mb=round(quantized_path(model).stat().st_size / 1e6, 2)),
+        "speedup": round(lat32["mean_ms"] / lat8["mean_ms"], 2) if lat8["mean_ms"] else None,
+        "outputs": [],
+    }
+    for k, names in enumerate(label_sets):
+        top32 = [int(np.argmax(o[k])) for o in out32]
+        top8 = [int(np.argmax(o[k])) for o in out8]
+        entry = {
+            "top1_agreement": round(float(np.mean([a == b for a, b in zip(top32, top8)])), 4),
+            "max_abs_diff": round(max(float(np.abs(a[k] - b[k]).max()) for a, b in zip(out32, out8)), 4),
+        }
+        known = [(i, names.index(l)) for i, l in enumerate(labels) if l in names]
+        if known:
+            entry["labelled"] = len(known)
+            entry["fp32_accuracy"] = round(float(np.mean([top32[i] == y for i, y in known])), 4)
+            entry["int8_accuracy"] = round(float(np.mean([top8[i] == y for i, y in known])), 4)
+        report["outputs"].append(entry)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Quantize the face models to INT8 and compare them with FP32"
+    )
+    parser.add_argument(
+        "--models-dir",
+        type=str,
+        default=str(repo_root / "Phase 1A - Foundation" / "models"),
+        help="Directory holding ferplus.onnx / age_gender.onnx",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["auto", "static", "dynamic"],
+        default="auto",
+        help="Quantization mode (auto: static when --data-dir is given)",
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=str,
+        default="",
+        help="Face crops for calibration/evaluation; folder names are used as labels",
+    )
+    parser.add_argument("--samples", type=int, default=200, help="Max face crops to use")
+    parser.add_argument("--runs", type=int, default=3, help="Timing passes per model")
+    parser.add_argument(
+        "--compare-only", action="store_true", help="Skip quantization, only compare"
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        default="",
+        help="Report JSON path (default: <models-dir>/quantization_report.json)",
+    )
+    args = parser.parse_args()
+
+    models_dir = Path(args.models_dir)
+    faces, labels = _load_faces(args.data_dir, args.samples)
+    mode = args.mode
+    if mode == "auto":
+        mode = "static" if args.data_dir else "dynamic"
+
+    report = {"mode": mode, "samples": len(faces), "models": {}}
+    for filename, (build, label_sets) in MODELS.items():
+        model = models_dir / filename
+        if not model.exists():
+            print(f"[Skip] {model} not found")
+            continue
+        tensors = [build([f]) for f in faces]
+        out = quantized_path(model)
+        if not args.compare_only:
+            print(f"[Quantize] {model.name} -> {out.name} ({mode})")
+            quantize(model, out, mode, tensors)
+            # Recognizers verify files against the manifest before loading
+            ModelStore(models_dir).record(out.name, source="quantize_models")
+        if not out.exists():
+            print(f"[Skip] {out.name} not found")
+            continue
+        result = compare(model, tensors, labels, label_sets, args.runs)
+        report["models"][filename] = result
+        print(json.dumps({filename: result}, indent=2))
+
+    report_path = Path(args.report) if args.report else models_dir / "quantization_report.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2))
+    print(f"[Report] {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ import json
 from pathlib import Path
 
 from voteguard.config.env import data_dir, key_path
-from voteguard.core.counting import tally
+from voteguard.core.tally_cache import TallyCache, cached_tally
 
 
 def main():
@@ -23,11 +23,17 @@ def main():
     parser.add_argument(
         "--no-verify", action="store_true", help="Skip ledger integrity verification"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always recompute instead of reusing the cached tally",
+    )
     args = parser.parse_args()
 
     ledger_path = Path(args.ledger)
     key = Path(args.key)
-    counts = tally(ledger_path, key, verify=not args.no_verify)
+    cache = None if args.no_cache else TallyCache(data_dir() / "tally_cache.json")
+    counts = cached_tally(ledger_path, key, verify=not args.no_verify, cache=cache)
 
     print("Vote Tally:")
     for election, choices in counts.items():
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import numpy as np
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ml.anomaly_detection import AnomalyDetection, P2Quantile, StreamingAnomalyDetector
+
+
+def test_p2_tracks_percentile():
+    rng = np.random.default_rng(0)
+    for data in (rng.random(50_000), rng.standard_normal(50_000), rng.exponential(size=50_000)):
+        sketch = P2Quantile(0.95)
+        for chunk in np.array_split(data, 7):
+            sketch.extend(chunk)
+        exact = np.percentile(data, 95)
+        assert sketch.count == len(data)
+        assert abs(sketch.value - exact) < 0.02 * (data.max() - data.min())
+
+
+def test_p2_small_samples_are_exact():
+    sketch = P2Quantile(0.5)
+    assert sketch.value is None
+    sketch.extend([3.0, 1.0, 2.0])
+    assert sketch.value == 2.0
+
+
+def test_windowed_detector_follows_drift():
+    rng = np.random.default_rng(1)
+    det = StreamingAnomalyDetector(quantile=0.95, window=5000)
+    det.update(rng.random(20_000))
+    assert abs(det.threshold - 0.95) < 0.02
+    det.update(rng.random(20_000) + 10.0)
+    assert abs(det.threshold - 10.95) < 0.02
+
+    mask = det.process(np.array([0.0, 10.5, 11.0]))
+    assert mask.tolist() == [False, False, True]
+    assert det.flagged == 1 and det.seen == 40_003
+
+
+def test_calibrate_from_generator():
+    ad = AnomalyDetection()
+    ad.calibrate_threshold(i / 1000 for i in range(1000))
+    assert abs(ad.threshold - 0.95) < 0.01
+    assert ad.detect_anomalies([0.1, 0.99, 0.97]).tolist() == [0.99, 0.97]
+
+
+def test_calibrate_array_uses_exact_percentile():
+    data = np.random.default_rng(3).exponential(size=5_000)
+    ad = AnomalyDetection()
+    ad.calibrate_threshold(data)
+    assert ad.threshold == np.percentile(data, 95)
+    ad.calibrate_threshold(list(data[:100]))
+    assert ad.threshold == np.percentile(data[:100], 95)
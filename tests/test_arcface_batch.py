@@ -0,0 +1,65 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ml.arcface_recognition import ArcFaceRecognition
+
+
+class FakeModel:
+    """Embeds an image as its per-channel means; records batch sizes."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_on_batch(self, tensor):
+        self.batches.append(tensor.shape)
+        return tensor.mean(axis=(2, 3))
+
+
+def test_get_embeddings_batches_paths_and_arrays(tmp_path):
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 255, (90 + i, 80, 3), dtype=np.uint8) for i in range(7)]
+    paths = []
+    for i, img in enumerate(images[:4]):
+        p = tmp_path / f"face{i}.png"
+        cv2.imwrite(str(p), img)
+        paths.append(p)
+    model = FakeModel()
+    arc = ArcFaceRecognition(None, batch_size=3, workers=2, model=model)
+
+    emb = arc.get_embeddings(paths + images[4:])
+    assert emb.shape == (7, 3) and emb.dtype == np.float32 and emb.flags.c_contiguous
+    assert model.batches == [(3, 3, 112, 112), (3, 3, 112, 112), (1, 3, 112, 112)]
+
+    # Same result as one-at-a-time extraction, RGB order, scaled to [-1, 1]
+    single = arc.get_embedding(str(paths[1]))
+    assert np.allclose(emb[1], single[0], atol=1e-6)
+    resized = cv2.resize(images[1], (112, 112)).astype(np.float32)
+    expected = (resized[..., ::-1].mean(axis=(0, 1)) - 127.5) / 128.0
+    assert np.allclose(emb[1], expected, atol=1e-4)
+
+
+def test_gray_and_bgra_inputs_are_converted_before_resizing():
+    rng = np.random.default_rng(1)
+    gray = rng.integers(0, 255, (90, 80), dtype=np.uint8)
+    bgr = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+    bgra = cv2.cvtColor(bgr, cv2.COLOR_BGR2BGRA)
+    arc = ArcFaceRecognition(None, model=FakeModel())
+    expected = arc.preprocess_batch([bgr])
+    for image in (gray, bgra, gray[..., None], bgr.astype(np.float32)):
+        assert np.array_equal(arc.preprocess_batch([image]), expected)
@@ -83,3 +83,17 @@ def test_load_parties_from_config(tmp_path, monkeypatch):
                 os.remove(str(candidates_file))
             except Exception:
                 pass
+
+
+def test_in_process_analyze_gets_a_copy_of_the_ring_slot(monkeypatch):
+    import numpy as np
+
+    seen = []
+    monkeypatch.setattr(bc, "analyze", lambda frame: seen.append(frame) or [])
+    monkeypatch.setattr(bc, "ml_out_of_process", lambda: False)
+    screen = types.SimpleNamespace(ml_worker=None)
+    slot = np.zeros((4, 4, 3), dtype=np.uint8)
+    bc.BiometricCaptureScreen._analyze(screen, slot)
+    # The capture thread may overwrite the slot while inference runs
+    assert not np.shares_memory(seen[0], slot)
+    assert np.array_equal(seen[0], slot)
@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from hardware.camera_stream import CameraStream, FrameRing
+
+
+class FakeCapture:
+    """Mimics cv2.VideoCapture.read(image) filling the given buffer."""
+
+    def __init__(self, frames: int):
+        self.remaining = frames
+        self.value = 0
+
+    def read(self, image=None):
+        if self.remaining <= 0:
+            return False, None
+        self.remaining -= 1
+        self.value += 1
+        if image is None:
+            image = np.empty((4, 6, 3), dtype=np.uint8)
+        image.fill(self.value)
+        time.sleep(0.001)
+        return True, image
+
+
+def test_ring_latest_is_a_view_and_counts_unread_drops():
+    ring = FrameRing(3, (2, 2), np.uint8)
+    assert ring.latest() == (0, None)
+    for value in range(1, 6):
+        idx, slot = ring.next_slot()
+        slot.fill(value)
+        ring.publish(idx)
+    seq, frame = ring.latest()
+    assert seq == 5 and frame[0, 0] == 5
+    assert np.shares_memory(frame, ring.frames)
+    # Frames 1 and 2 were overwritten without being read
+    assert ring.overwritten_unread == 2
+
+
+def test_stream_fills_ring_in_background():
+    stream = CameraStream(FakeCapture(frames=30), slots=4)
+    stream.start()
+    deadline = time.time() + 2
+    while stream.running() and time.time() < deadline:
+        time.sleep(0.01)
+    stream.stop()
+    seq, frame = stream.latest()
+    assert seq == 30
+    assert frame[0, 0, 0] == 30
+    stats = stream.stats()
+    assert stats["fps"] > 0
+    assert stats["read_failures"] > 0
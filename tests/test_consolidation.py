@@ -0,0 +1,76 @@
+from pathlib import Path
+
+from voteguard.app import bootstrap
+from voteguard.core.consolidation import consolidate, discover_booths
+
+
+def _cast(monkeypatch, booth_dir: Path, votes):
+    monkeypatch.setenv("VOTEGUARD_DATA", str(booth_dir))
+    cv = bootstrap()
+    for i, (election, choice) in enumerate(votes):
+        cv.execute(election, choice, aadhaar=f"1234567890{i:02d}", voter_id=f"X{i:04d}")
+
+
+def test_consolidate_booths_and_resume(tmp_path: Path, monkeypatch):
+    root = tmp_path / "booths"
+    _cast(monkeypatch, root / "C1" / "B1", [("GENERAL", "A"), ("GENERAL", "B")])
+    _cast(monkeypatch, root / "C1" / "B2", [("GENERAL", "A")])
+    _cast(monkeypatch, root / "C2" / "B3", [("GENERAL", "B"), ("STATE", "A")])
+
+    booths = discover_booths(root, default_key=Path("./key.key"))
+    assert len(booths) == 3
+    ckpt = tmp_path / "ckpt.jsonl"
+    result = consolidate(booths, workers=2, checkpoint=ckpt)
+
+    assert result["elections"] == {"GENERAL": {"A": 2, "B": 2}, "STATE": {"A": 1}}
+    assert result["constituencies"]["C1"] == {"GENERAL": {"A": 2, "B": 1}}
+    assert result["booths"]["C2/B3"]["counts"]["STATE"] == {"A": 1}
+    assert result["stats"]["processed_records"] == 5
+
+    # Rerun reuses checkpointed booths whose ledger tail is unchanged
+    again = consolidate(booths, workers=2, checkpoint=ckpt)
+    assert again["stats"]["resumed"] == 3
+    assert again["elections"] == result["elections"]
+
+
+def test_manifest_default_key_and_failed_booths_retallied(tmp_path: Path, monkeypatch):
+    from cryptography.fernet import Fernet
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("FERNET_KEY_PATH", str(tmp_path / "key.key"))
+    _cast(monkeypatch, tmp_path / "booths" / "B1", [("GENERAL", "A")])
+    manifest = tmp_path / "booths" / "manifest.json"
+    manifest.write_text('{"booths": [{"booth": "B1", "ledger": "B1/ballot_ledger.json"}]}')
+
+    # The fallback key is resolved against the cwd, not the manifest folder
+    booths = discover_booths(manifest, default_key=Path("key.key"))
+    assert booths[0]["key"] == str((tmp_path / "key.key").resolve())
+
+    wrong = tmp_path / "wrong.key"
+    wrong.write_bytes(Fernet.generate_key())
+    ckpt = tmp_path / "ckpt.jsonl"
+    failed = consolidate(discover_booths(manifest, wrong), workers=1, checkpoint=ckpt)
+    assert failed["booths"]["B1"]["status"] == "FAIL"
+
+    fixed = consolidate(booths, workers=1, checkpoint=ckpt)
+    assert fixed["stats"]["resumed"] == 0
+    assert fixed["elections"] == {"GENERAL": {"A": 1}}
+
+
+def test_booth_ledger_parsed_once(tmp_path: Path, monkeypatch):
+    from voteguard.core import consolidation
+
+    _cast(monkeypatch, tmp_path / "B1", [("GENERAL", "A"), ("GENERAL", "B")])
+    booth = discover_booths(tmp_path, default_key=Path("./key.key"))[0]
+    reads = []
+    read = consolidation._read_ledger
+
+    def counting_read(path):
+        reads.append(path)
+        return read(path)
+
+    monkeypatch.setattr(consolidation, "_read_ledger", counting_read)
+    result = consolidation.tally_booth(booth)
+    assert result["status"] == "OK" and result["records"] == 2
+    assert result["counts"] == {"GENERAL": {"A": 1, "B": 1}}
+    assert len(reads) == 1
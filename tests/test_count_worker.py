@@ -0,0 +1,76 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ui.count_ui import TallyWorker
+from voteguard.app import bootstrap
+
+
+def test_worker_reports_integrity_from_single_verification(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("VOTEGUARD_DATA", str(tmp_path))
+    monkeypatch.setenv("FERNET_KEY_PATH", str(Path("./key.key").resolve()))
+    cv = bootstrap()
+    cv.execute("GENERAL", "Party-A", aadhaar="123456789012", voter_id="X0001")
+    worker = TallyWorker(tmp_path / "aggregates.json", None)
+
+    ok = worker._refresh()
+    assert ok["integrity"] == "OK"
+    assert ok["counts"] == {"GENERAL": {"Party-A": 1}}
+
+    # Break the hash chain: the last verified counts are kept, flagged FAIL
+    cv.execute("GENERAL", "Party-B", aadhaar="123456789013", voter_id="X0002")
+    ledger = tmp_path / "ballot_ledger.json"
+    data = json.loads(ledger.read_text("utf-8"))
+    data["records"][-1]["record_hash"] = "0" * 64
+    ledger.write_text(json.dumps(data, indent=2))
+
+    bad = worker._refresh()
+    assert bad["integrity"] == "FAIL"
+    assert bad["counts"] == {"GENERAL": {"Party-A": 1}}
+
+
+def test_cache_hit_is_verified_before_reporting_ok(tmp_path: Path, monkeypatch):
+    import ui.count_ui as count_ui
+    from voteguard.core.tally_cache import TallyCache
+
+    monkeypatch.setenv("VOTEGUARD_DATA", str(tmp_path))
+    monkeypatch.setenv("FERNET_KEY_PATH", str(Path("./key.key").resolve()))
+    cv = bootstrap()
+    cv.execute("GENERAL", "Party-A", aadhaar="123456789012", voter_id="X0001")
+    cv.execute("GENERAL", "Party-B", aadhaar="123456789013", voter_id="X0002")
+    ledger = tmp_path / "ballot_ledger.json"
+    first = TallyWorker(tmp_path / "aggregates.json", None)
+    first._refresh()
+
+    # A fresh worker (e.g. after a restart) hits the cache
+    calls = []
+    real = count_ui.verify_chain
+    monkeypatch.setattr(count_ui, "verify_chain", lambda p: calls.append(p) or real(p))
+    worker = TallyWorker(tmp_path / "aggregates.json", first._aggregates)
+    assert worker._refresh()["integrity"] == "OK"
+    assert worker._refresh()["integrity"] == "OK"
+    assert len(calls) == 1  # verified once for this file state
+
+    # A cache entry forged for a ledger tampered before its tail is not trusted
+    data = json.loads(ledger.read_text("utf-8"))
+    data["records"][0]["record_hash"] = "0" * 64
+    ledger.write_text(json.dumps(data, indent=2))
+    key = Path("./key.key").resolve()
+    TallyCache(tmp_path / "tally_cache.json").put(
+        ledger, TallyCache.cache_key(ledger, key), {"GENERAL": {"Party-A": 1, "Party-B": 1}}
+    )
+    assert worker._refresh()["integrity"] == "FAIL"
@@ -2,7 +2,7 @@ from pathlib import Path
 
 from voteguard.app import bootstrap
 from voteguard.config.env import data_dir
-from voteguard.core.counting import tally
+from voteguard.core.counting import tally, tally_with_turnout
 
 
 def test_tally_counts(tmp_path: Path, monkeypatch):
@@ -18,3 +18,23 @@ def test_tally_counts(tmp_path: Path, monkeypatch):
     assert "GENERAL" in counts
     assert counts["GENERAL"].get("Party-A") == 2
     assert counts["GENERAL"].get("Party-B") == 1
+
+
+def test_tally_with_turnout_incremental(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("VOTEGUARD_DATA", str(tmp_path))
+    cv = bootstrap()
+    ledger = tmp_path / "ballot_ledger.json"
+    cv.execute("GENERAL", "Party-A", aadhaar="123456789012", voter_id="X0001")
+    first = tally_with_turnout(ledger, Path("./key.key"), bucket_seconds=3600)
+    assert first["watermark"]["seq"] == 1
+    assert sum(first["turnout"]["GENERAL"].values()) == 1
+
+    cv.execute("STATE", "Party-B", aadhaar="123456789013", voter_id="X0002")
+    second = tally_with_turnout(
+        ledger, Path("./key.key"), bucket_seconds=3600, previous=first
+    )
+    assert second["watermark"]["seq"] == 2
+    assert second["counts"] == {"GENERAL": {"Party-A": 1}, "STATE": {"Party-B": 1}}
+    assert sum(second["turnout"]["STATE"].values()) == 1
+    # Previous aggregates are not mutated
+    assert "STATE" not in first["counts"]
@@ -0,0 +1,87 @@
+import os
+import sys
+
+import numpy as np
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ml.face_gallery import FaceGallery, normalize_rows
+
+
+def _faces(n, dim=32, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def test_enroll_search_and_reopen(tmp_path):
+    emb = _faces(3000)
+    gallery = FaceGallery(tmp_path, dim=32)
+    gallery.enroll([f"v{i}" for i in range(2000)], emb[:2000])
+    gallery.enroll([f"v{i}" for i in range(2000, 3000)], emb[2000:])
+    assert len(gallery) == 3000
+    assert np.allclose(np.linalg.norm(gallery.embeddings, axis=1), 1.0, atol=1e-5)
+
+    (hit,) = gallery.search(emb[1234] * 3.0, k=2, nprobe=None)
+    assert hit[0][0] == "v1234" and abs(hit[0][1] - 1.0) < 1e-5
+    assert hit[1][1] < hit[0][1]
+
+    # Re-enrolling an ID replaces its row
+    gallery.enroll(["v7"], emb[8:9])
+    assert len(gallery) == 3000
+    assert gallery.search(emb[8], k=2, nprobe=None)[0][0][0] in {"v7", "v8"}
+
+    reopened = FaceGallery(tmp_path)
+    assert len(reopened) == 3000 and reopened.dim == 32 and "v2999" in reopened
+    assert np.array_equal(reopened.embeddings, gallery.embeddings)
+
+
+def test_ivf_index_matches_exact_for_duplicates(tmp_path):
+    rng = np.random.default_rng(1)
+    centers = _faces(40, seed=2)
+    emb = normalize_rows(centers[rng.integers(0, 40, 4000)] + 0.3 * _faces(4000, seed=3))
+    gallery = FaceGallery(tmp_path, dim=32)
+    gallery.enroll([f"v{i}" for i in range(4000)], emb)
+    gallery.build_index(nlist=32)
+    assert gallery.centroids.shape == (32, 32)
+
+    probes = emb[:50] + 0.01 * _faces(50, seed=4)
+    found = gallery.search(probes, k=1, nprobe=4)
+    assert sum(f[0][0] == f"v{i}" for i, f in enumerate(found)) >= 48
+
+    # New enrollments are assigned to cells without rebuilding
+    gallery.enroll(["late"], _faces(1, seed=5))
+    assert gallery.find_duplicate(_faces(1, seed=5)[0], nprobe=4)[0] == "late"
+    assert gallery.find_duplicate(-_faces(1, seed=5)[0], threshold=0.9) is None
+    assert FaceGallery(tmp_path).search(emb[0], nprobe=4)[0][0][0] == "v0"
+
+
+def test_ids_file_is_append_only_and_ignores_uncommitted_lines(tmp_path):
+    emb = _faces(30)
+    gallery = FaceGallery(tmp_path, dim=32)
+    gallery.enroll([f"v{i}" for i in range(10)], emb[:10])
+    gallery.build_index(nlist=2)
+    size = (tmp_path / "ids.txt").stat().st_size
+    gallery.enroll(["v10"], emb[10:11])
+    assert (tmp_path / "ids.txt").read_bytes()[size:] == b'"v10"\n'
+
+    # A flush interrupted before gallery.json left a torn, uncommitted tail
+    with open(tmp_path / "ids.txt", "ab") as fh:
+        fh.write(b'"ghost"\n"gho')
+    reopened = FaceGallery(tmp_path)
+    assert len(reopened) == 11 and "ghost" not in reopened
+    reopened.enroll(["v11", "v3"], emb[11:13])
+    again = FaceGallery(tmp_path)
+    assert list(again.ids()) == [f"v{i}" for i in range(12)]
+    assert np.array_equal(again._assign, reopened._assign)
+    assert again.search(emb[12], nprobe=None)[0][0][0] == "v3"
+
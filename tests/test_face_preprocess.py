@@ -0,0 +1,60 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ml.demographics_recognizer import DemographicsRecognizer
+from ml.emotion_recognizer import EmotionRecognizer
+
+from voteguard.adapters.face_preprocess import FacePreprocessor
+
+
+def _frame():
+    rng = np.random.default_rng(3)
+    return rng.integers(0, 255, (240, 320, 3), dtype=np.uint8)
+
+
+def test_shared_tensors_match_recognizer_preprocessing():
+    frame = _frame()
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    boxes = [(10, 20, 90, 80), (150, 60, 50, 70)]
+    rgb = [cv2.cvtColor(frame[y : y + h, x : x + w], cv2.COLOR_BGR2RGB) for x, y, w, h in boxes]
+    prep = FacePreprocessor()
+
+    emo = prep.gray_tensor(gray, boxes, EmotionRecognizer.INPUT_SIZE)
+    expected = np.concatenate([EmotionRecognizer.preprocess(f) for f in rgb])
+    assert emo.shape == expected.shape and emo.dtype == np.float32
+    assert np.allclose(emo, expected, atol=1e-6)
+
+    blob = prep.rgb_blob(
+        frame, boxes, DemographicsRecognizer.INPUT_SIZE, DemographicsRecognizer.MEAN
+    )
+    expected = DemographicsRecognizer.preprocess(rgb)
+    assert blob.shape == expected.shape
+    assert np.allclose(blob, expected, atol=1e-3)
+
+
+def test_buffers_are_reused_across_frames():
+    frame = _frame()
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    prep = FacePreprocessor()
+    first = prep.rgb_blob(frame, [(0, 0, 60, 60)], 227)
+    second = prep.rgb_blob(frame, [(10, 10, 60, 60), (50, 50, 40, 40)], 227)
+    assert np.shares_memory(first, second)
+    a = prep.gray_tensor(gray, [(0, 0, 60, 60)] * 3)
+    b = prep.gray_tensor(gray, [(5, 5, 60, 60)])
+    assert np.shares_memory(a, b) and b.shape == (1, 1, 64, 64)
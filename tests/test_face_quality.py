@@ -0,0 +1,37 @@
+import cv2
+import numpy as np
+
+from voteguard.adapters.face_quality import QualityGate, roi_scores
+
+
+def _scene():
+    rng = np.random.default_rng(0)
+    gray = np.full((240, 320), 120, dtype=np.uint8)
+    sharp = rng.integers(40, 220, (80, 80), dtype=np.uint8)
+    gray[10:90, 10:90] = sharp
+    gray[10:90, 110:190] = cv2.GaussianBlur(sharp, (0, 0), 6)
+    gray[120:200, 10:90] = (sharp // 12).astype(np.uint8)  # underexposed
+    gray[120:150, 110:140] = sharp[:30, :30]  # tiny
+    boxes = [(10, 10, 80, 80), (110, 10, 80, 80), (10, 120, 80, 80), (110, 120, 30, 30)]
+    return gray, boxes
+
+
+def test_scores_are_vectorized_per_box():
+    gray, boxes = _scene()
+    scores = roi_scores(gray, boxes)
+    assert all(len(v) == len(boxes) for v in scores.values())
+    assert scores["sharpness"][0] > 10 * scores["sharpness"][1]
+    assert scores["brightness"][2] < 40
+    assert list(scores["size"]) == [80, 80, 80, 30]
+    assert all(len(v) == 0 for v in roi_scores(gray, []).values())
+
+
+def test_gate_rejects_blurred_dark_and_tiny_faces():
+    gray, boxes = _scene()
+    gate = QualityGate()
+    assert list(gate.evaluate(gray, boxes)) == [True, False, False, False]
+    assert gate.stats["evaluated"] == 4 and gate.stats["passed"] == 1
+    assert gate.stats["blur"] >= 1
+    assert gate.stats["exposure"] == 1
+    assert gate.stats["small"] == 1
+    assert gate.pass_rate() == 0.25
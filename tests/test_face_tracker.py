@@ -0,0 +1,74 @@
+import numpy as np
+
+from voteguard.adapters.face_tracker import FaceTracker, detect_faces, iou
+
+
+def _frame(boxes, size=(240, 320)):
+    rng = np.random.default_rng(0)
+    gray = np.full(size, 40, dtype=np.uint8)
+    for x, y, w, h in boxes:
+        patch = rng.integers(0, 255, (h, w), dtype=np.uint8)
+        gray[y : y + h, x : x + w] = patch
+    return gray
+
+
+def test_tracks_between_detections_and_keeps_ids():
+    calls = []
+    state = {"boxes": [(40, 50, 60, 60), (200, 60, 60, 60)]}
+
+    def detect(gray):
+        calls.append(1)
+        return state["boxes"]
+
+    tracker = FaceTracker(detect, redetect_every=5)
+    first = {t.track_id: t.bbox for t in tracker.update(_frame(state["boxes"]))}
+    assert len(first) == 2
+
+    # Faces drift a few pixels per frame; only every 5th frame re-detects
+    for step in range(1, 10):
+        state["boxes"] = [(40 + 2 * step, 50 + step, 60, 60), (200 - 2 * step, 60, 60, 60)]
+        tracks = tracker.update(_frame(state["boxes"]))
+        assert sorted(t.track_id for t in tracks) == sorted(first)
+        for t, box in zip(sorted(tracks, key=lambda t: t.bbox[0]), sorted(state["boxes"])):
+            assert iou(t.bbox, box) > 0.8
+    assert len(calls) == 2
+    assert tracker.stats["lost"] == 0
+
+
+def test_lost_face_forces_redetect_and_emotion_history_is_per_track():
+    boxes = [(40, 50, 60, 60)]
+    tracker = FaceTracker(lambda gray: boxes, redetect_every=10, max_missed=0)
+    (track,) = tracker.update(_frame(boxes))
+    assert track.smooth_emotion("Happiness") == "Happiness"
+
+    # Face leaves the frame: tracking fails, next frame re-detects and drops it
+    boxes = []
+    tracker.update(_frame([]))
+    assert tracker.stats["lost"] == 1
+    assert tracker.update(_frame([])) == []
+
+    # A new face is picked up by the next scheduled detection, with a new
+    # id and an empty emotion history
+    boxes = [(150, 80, 60, 60)]
+    for _ in range(10):
+        tracks = tracker.update(_frame(boxes))
+    (new,) = tracks
+    assert new.track_id != track.track_id
+    assert new.smooth_emotion("Neutral") == "Neutral"
+
+
+def test_detect_faces_downscales_and_maps_boxes_back():
+    seen = {}
+
+    class Cascade:
+        def detectMultiScale(self, gray, scaleFactor, minNeighbors, minSize):
+            seen["shape"], seen["min_size"] = gray.shape, minSize
+            return [(20, 10, 30, 30)]
+
+    gray = np.zeros((240, 320), dtype=np.uint8)
+    assert detect_faces(Cascade(), gray, scale=0.5) == [(40, 20, 60, 60)]
+    assert seen == {"shape": (120, 160), "min_size": (30, 30)}
+
+    # Scale is raised so small faces stay above the 24 px cascade window
+    detect_faces(Cascade(), gray, scale=0.25, min_size=(30, 30))
+    assert seen["min_size"] == (24, 24)
@@ -0,0 +1,97 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ml.fingerprint_recognition import FingerprintRecognition
+from ml.fingerprint_templates import FingerprintMatcher, FingerprintTemplateStore
+
+
+def _print(seed):
+    """Textured stand-in for a fingerprint image."""
+    rng = np.random.default_rng(seed)
+    img = rng.integers(0, 255, (200, 200), dtype=np.uint8)
+    return cv2.GaussianBlur(img, (0, 0), 1.5)
+
+
+def _recapture(img, seed):
+    rng = np.random.default_rng(seed)
+    m = cv2.getRotationMatrix2D((100, 100), 4, 1.0)
+    moved = cv2.warpAffine(img, m, (200, 200), borderMode=cv2.BORDER_REFLECT)
+    noisy = moved.astype(np.int16) + rng.integers(-6, 7, moved.shape)
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+
+def test_store_persists_templates_and_identifies(tmp_path):
+    store = FingerprintTemplateStore(tmp_path / "roll")
+    counts = store.enroll_many((f"voter-{i}", _print(i)) for i in range(40))
+    assert len(store) == 40 and all(c > 0 for c in counts.values())
+
+    reopened = FingerprintTemplateStore(tmp_path / "roll")
+    assert len(reopened) == 40
+    assert np.array_equal(reopened.get("voter-7"), store.get("voter-7"))
+
+    matcher = FingerprintMatcher(reopened)
+    best = matcher.identify(_recapture(_print(23), seed=1))
+    assert best is not None and best[0] == "voter-23"
+    assert matcher.identify(_print(999)) is None
+
+    # Index follows new enrollments
+    reopened.enroll("voter-late", _print(500))
+    assert matcher.identify(_recapture(_print(500), seed=2))[0] == "voter-late"
+    matcher.close()
+
+
+def test_recognition_uses_cached_templates(tmp_path):
+    store = FingerprintTemplateStore(tmp_path)
+    store.enroll("voter-1", _print(1))
+    captured = tmp_path / "captured.png"
+    cv2.imwrite(str(captured), _recapture(_print(1), seed=3))
+
+    fr = FingerprintRecognition(store)
+    assert fr.match_fingerprint(str(captured), "voter-1") is True
+    assert fr.match_fingerprint(_recapture(_print(1), seed=3), "voter-1") is True
+    assert fr.match_fingerprint(str(tmp_path / "missing.png"), "voter-1") is False
+    assert fr.identify_fingerprint(str(captured))[0] == "voter-1"
+
+
+def test_enrollment_appends_and_indexes_incrementally(tmp_path):
+    store = FingerprintTemplateStore(tmp_path)
+    store.enroll_many((f"voter-{i}", _print(i)) for i in range(20))
+    matcher = FingerprintMatcher(store)
+    assert matcher.identify(_recapture(_print(3), seed=1))[0] == "voter-3"
+    first_index = matcher._indexes[0][0]
+    size = (tmp_path / "descriptors.u8").stat().st_size
+
+    # Small batches are indexed on their own; the big index is kept
+    for i in range(20, 23):
+        store.enroll(f"voter-{i}", _print(i), save=False)
+    assert (tmp_path / "descriptors.u8").stat().st_size == size
+    assert matcher.identify(_recapture(_print(21), seed=2))[0] == "voter-21"
+    assert matcher._indexes[0][0] is first_index
+    store.save()
+    assert (tmp_path / "descriptors.u8").stat().st_size > size
+
+    # Re-enrolling replaces the print: votes for its old rows are ignored
+    store.enroll("voter-3", _print(300))
+    assert matcher.identify(_recapture(_print(300), seed=3))[0] == "voter-3"
+    assert matcher.identify(_recapture(_print(3), seed=4)) is None
+
+    reopened = FingerprintTemplateStore(tmp_path)
+    assert len(reopened) == 23
+    assert np.array_equal(reopened.get("voter-3"), store.get("voter-3"))
+    assert FingerprintMatcher(reopened).identify(_recapture(_print(21), seed=5))[0] == "voter-21"
@@ -0,0 +1,72 @@
+import os
+import sys
+import threading
+
+import numpy as np
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from hardware.frame_writer import FrameWriter
+
+
+class BlockedWriter(FrameWriter):
+    """Writer whose storage is stalled until `release` is set."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.values = []
+
+    def _write_jpeg(self, stamp, frame):
+        self.started.set()
+        self.release.wait(5)
+        self.values.append(int(frame[0, 0, 0]))
+
+
+def _frame(value):
+    return np.full((8, 8, 3), value, dtype=np.uint8)
+
+
+def test_writes_sampled_jpegs(tmp_path):
+    writer = FrameWriter(tmp_path, sample_every=2).start()
+    for i in range(6):
+        writer.submit(_frame(i))
+    stats = writer.close()
+    assert stats["written"] == 3 and stats["skipped"] == 3
+    assert len(list(tmp_path.glob("frame_*.jpg"))) == 3
+
+
+def test_stalled_storage_drops_oldest_without_blocking(tmp_path):
+    writer = BlockedWriter(tmp_path, workers=1, queue_size=2).start()
+    writer.submit(_frame(1))
+    assert writer.started.wait(5)  # frame 1 is stuck in the worker
+    for v in range(2, 7):
+        writer.submit(_frame(v))
+    writer.release.set()
+    stats = writer.close()
+    # Queue held 2 frames: the newest ones survive
+    assert writer.values == [1, 5, 6]
+    assert stats["dropped"] == 3
+
+
+def test_drop_newest_keeps_backlog(tmp_path):
+    writer = BlockedWriter(tmp_path, workers=1, queue_size=2, drop="newest").start()
+    writer.submit(_frame(1))
+    assert writer.started.wait(5)
+    results = [writer.submit(_frame(v)) for v in range(2, 7)]
+    writer.release.set()
+    writer.close()
+    assert results == [True, True, False, False, False]
+    assert writer.values == [1, 2, 3]
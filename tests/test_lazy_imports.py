@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ml import lazy_imports
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def test_adapter_import_does_not_load_ml_stack(tmp_path):
+    # A stand-in deepface package is importable, so only laziness keeps it out
+    pkg = tmp_path / "deepface"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "DeepFace.py").write_text("def analyze(*a, **k):\n    return {}\n")
+    script = textwrap.dedent(
+        f"""
+        import sys
+        sys.path[:0] = [{str(tmp_path)!r}, {SRC_PATH!r}, {REPO_ROOT!r}]
+        import voteguard.adapters.ml_analytics_optional as m
+        loaded = m.models_loaded()
+        assert loaded["emotion"] and loaded["demographics"], loaded
+        for name in ("deepface", "onnxruntime", "ml.emotion_recognizer",
+                     "ml.demographics_recognizer"):
+            assert name not in sys.modules, name
+        print("ok")
+        """
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, timeout=120
+    )
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "ok"
+
+
+def test_optional_import_is_cached_and_timed():
+    mod = lazy_imports.optional_import("json")
+    assert mod is sys.modules["json"]
+    assert lazy_imports.optional_import("json") is mod
+    assert lazy_imports.import_times()["json"] >= 0.0
+    assert lazy_imports.is_available("json")
+
+
+def test_missing_module_returns_none_and_records_error():
+    name = "voteguard_no_such_module"
+    assert not lazy_imports.is_available(name)
+    assert lazy_imports.optional_import(name) is None
+    assert "ModuleNotFoundError" in lazy_imports.import_errors()[name]
+    assert lazy_imports.optional_import(name) is None
@@ -0,0 +1,72 @@
+import os
+import time
+
+import numpy as np
+
+from voteguard.adapters.ml_worker import MLWorkerClient
+
+
+def _analyzer():
+    def analyze(frame):
+        if frame[0, 0, 0] == 255:
+            os._exit(1)  # simulate a native crash in the model
+        if frame[0, 0, 0] == 254:
+            time.sleep(3600)  # simulate a hang in native code
+        return [{"bbox": (0, 0, 1, 1), "mean": float(frame.mean())}]
+
+    return analyze
+
+
+def _wait(client, predicate, timeout=20.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        out = client.poll()
+        if predicate(out):
+            return out
+        time.sleep(0.02)
+    raise AssertionError("worker did not respond in time")
+
+
+def test_worker_round_trip_and_restart():
+    client = MLWorkerClient(analyzer_factory=_analyzer)
+    client.restart_backoff = 0.0
+    try:
+        client.submit(np.full((4, 4, 3), 7, dtype=np.uint8))
+        out = _wait(client, lambda o: bool(o))
+        assert out[0]["mean"] == 7.0
+
+        client.submit(np.full((4, 4, 3), 255, dtype=np.uint8))
+        _wait(client, lambda o: client.stats["restarts"] == 1)
+
+        client.submit(np.full((4, 4, 3), 9, dtype=np.uint8))
+        out = _wait(client, lambda o: o and o[0]["mean"] == 9.0)
+        assert client.alive()
+    finally:
+        client.stop()
+
+
+def test_pending_frame_is_replaced_by_newer_one():
+    client = MLWorkerClient(analyzer_factory=_analyzer)
+    try:
+        for value in (1, 2, 3):
+            client.submit(np.full((2, 2, 3), value, dtype=np.uint8))
+        # One in flight, frame 2 replaced by frame 3 while pending
+        assert client.stats["dropped"] == 1
+        _wait(client, lambda o: o and o[0]["mean"] == 3.0)
+    finally:
+        client.stop()
+
+
+def test_hung_worker_is_killed_and_respawned():
+    client = MLWorkerClient(analyzer_factory=_analyzer, hang_timeout=1.0)
+    client.restart_backoff = 0.0
+    try:
+        client.submit(np.full((4, 4, 3), 254, dtype=np.uint8))
+        _wait(client, lambda o: client.stats["restarts"] == 1)
+        assert client.stats["hung"] == 1
+
+        client.submit(np.full((4, 4, 3), 5, dtype=np.uint8))
+        _wait(client, lambda o: o and o[0]["mean"] == 5.0)
+        assert client.alive()
+    finally:
+        client.stop()
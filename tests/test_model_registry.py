@@ -0,0 +1,51 @@
+import threading
+
+from voteguard.adapters.model_registry import ModelRegistry
+
+
+def test_registry_loads_once_and_unloads():
+    reg = ModelRegistry()
+    built = []
+
+    class Model:
+        warmed = False
+
+        def warm_up(self):
+            self.warmed = True
+
+    def factory():
+        built.append(1)
+        return Model()
+
+    reg.register("m", factory)
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(reg.get("m"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(built) == 1
+    assert all(m is seen[0] for m in seen)
+
+    assert reg.warm_up(["m"]) == {"m": True}
+    assert reg.get("m").warmed
+
+    reg.unload("m")
+    assert not reg.is_loaded("m")
+    assert reg.get("m") is not seen[0]
+    assert len(built) == 2
+
+
+def test_registry_remembers_failed_factory():
+    reg = ModelRegistry()
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise RuntimeError("no model")
+
+    reg.register("bad", broken)
+    assert reg.get("bad") is None
+    assert reg.get("bad") is None
+    assert len(calls) == 1
+    assert reg.get("unregistered") is None
@@ -0,0 +1,85 @@
+import os
+import sys
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ml import model_store
+from ml.model_store import ModelStore
+
+
+def test_record_and_verify(tmp_path, monkeypatch):
+    monkeypatch.delenv("ML_MODEL_STRICT", raising=False)
+    model = tmp_path / "ferplus.onnx"
+    model.write_bytes(b"weights-v1")
+    store = ModelStore(tmp_path)
+    # Unlisted files are accepted unless strict
+    assert store.verify(model)
+    monkeypatch.setenv("ML_MODEL_STRICT", "1")
+    assert not store.verify(model)
+
+    store.record("ferplus.onnx")
+    reopened = ModelStore(tmp_path)
+    assert reopened.models["ferplus.onnx"]["size"] == len(b"weights-v1")
+    assert reopened.verify(model)
+    assert reopened.available("ferplus.onnx") == model.resolve()
+
+    # Tampered (same size) and truncated files are rejected
+    model.write_bytes(b"weights-v2")
+    os.utime(model, ns=(1, 1))
+    assert not reopened.verify(model)
+    model.write_bytes(b"w")
+    assert not reopened.verify(model)
+    assert not reopened.verify(tmp_path / "missing.onnx")
+
+
+def test_prefetch_never_called_by_constructors(tmp_path, monkeypatch):
+    import urllib.request
+
+    def no_network(*_a, **_k):
+        raise AssertionError("network access")
+
+    monkeypatch.setattr(urllib.request, "urlopen", no_network)
+    from ml.demographics_recognizer import DemographicsRecognizer
+    from ml.emotion_recognizer import EmotionRecognizer
+
+    er = EmotionRecognizer(model_path=tmp_path / "ferplus.onnx")
+    assert not er.available()
+    DemographicsRecognizer()
+
+
+def test_prefetch_pins_recorded_hash(tmp_path, monkeypatch):
+    import io
+    import urllib.request
+
+    payload = {"data": b"model-bytes"}
+
+    class _Resp(io.BytesIO):
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(
+        urllib.request, "urlopen", lambda url, timeout=None: _Resp(payload["data"])
+    )
+    monkeypatch.setattr(model_store, "REMOTE_MODELS", {"ferplus.onnx": ["http://mirror/x"]})
+    store = ModelStore(tmp_path)
+    assert store.prefetch() == {"ferplus.onnx": "downloaded"}
+    assert store.prefetch() == {"ferplus.onnx": "ok"}
+
+    payload["data"] = b"changed-upstream"
+    assert store.prefetch(force=True) == {"ferplus.onnx": "hash-mismatch"}
+    assert (tmp_path / "ferplus.onnx").read_bytes() == b"model-bytes"
+    assert not (tmp_path / "ferplus.onnx.part").exists()
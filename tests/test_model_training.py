@@ -0,0 +1,91 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ml.model_training import FraudDetectionModel, load_frame
+
+
+def _write(path, n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "votes_per_minute": rng.random(n) * 10,
+            "session_seconds": rng.integers(5, 300, n),
+            "retries": rng.integers(0, 4, n),
+        }
+    )
+    df["label"] = ((df["votes_per_minute"] > 7) | (df["session_seconds"] < 20)).astype(int)
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_load_frame_downcasts(tmp_path):
+    path = tmp_path / "fraud.csv"
+    _write(path)
+    data = load_frame(path)
+    assert data["votes_per_minute"].dtype == np.float32
+    assert data["session_seconds"].dtype == np.uint16
+    assert data["retries"].dtype == np.uint8
+
+
+def test_train_save_load_and_score(tmp_path):
+    data_path = tmp_path / "fraud.csv"
+    model_path = tmp_path / "models" / "fraud.joblib"
+    df = _write(data_path)
+
+    model = FraudDetectionModel.train_or_load(
+        data_path, model_path, n_estimators=20, n_jobs=2
+    )
+    assert model_path.exists()
+    events = df.drop(columns="label").head(50)
+    expected = model.model.predict_proba(events.to_numpy(np.float32))[:, 1]
+
+    loaded = FraudDetectionModel.train_or_load(data_path, model_path, n_jobs=2)
+    assert loaded.features == model.features
+    assert loaded.schema_hash == model.schema_hash
+    np.testing.assert_allclose(loaded.score_batch(events), expected)
+    dicts = events[["retries", "session_seconds", "votes_per_minute"]].to_dict("records")
+    np.testing.assert_allclose(loaded.score_batch(dicts), expected)
+    assert loaded.score_batch(np.empty((0, 3))).shape == (0,)
+    assert loaded.model.n_jobs is None
+
+    with pytest.raises(ValueError, match="retries"):
+        loaded.score_batch(events.drop(columns="retries"))
+    with pytest.raises(ValueError, match="retries"):
+        loaded.score_batch([{"session_seconds": 30, "votes_per_minute": 1.0}])
+
+    with pytest.raises(ValueError):
+        FraudDetectionModel.load(model_path, features=["retries", "votes_per_minute"])
+
+
+def test_artifact_from_other_sklearn_is_retrained(tmp_path):
+    import joblib
+
+    data_path = tmp_path / "fraud.csv"
+    model_path = tmp_path / "fraud.joblib"
+    _write(data_path)
+    FraudDetectionModel.train_or_load(data_path, model_path, n_estimators=5, n_jobs=1)
+    artifact = joblib.load(model_path)
+    artifact["sklearn_version"] = "0.0.1"
+    joblib.dump(artifact, model_path)
+
+    with pytest.raises(ValueError, match="scikit-learn 0.0.1"):
+        FraudDetectionModel.load(model_path)
+    FraudDetectionModel.train_or_load(data_path, model_path, n_estimators=5, n_jobs=1)
+    assert joblib.load(model_path)["sklearn_version"] != "0.0.1"
@@ -0,0 +1,43 @@
+import os
+import sys
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ml.onnx_session import quantized_path, resolve_model, session_config
+
+
+def test_int8_variant_is_preferred_when_present(tmp_path, monkeypatch):
+    model = tmp_path / "ferplus.onnx"
+    model.write_bytes(b"fp32")
+    assert quantized_path(model).name == "ferplus.int8.onnx"
+    assert resolve_model(model) == model
+
+    quantized_path(model).write_bytes(b"int8")
+    assert resolve_model(model) == quantized_path(model)
+    assert resolve_model(model, prefer_int8=False) == model
+    monkeypatch.setenv("ONNX_PREFER_INT8", "0")
+    assert resolve_model(model) == model
+
+
+def test_session_config_from_env(monkeypatch):
+    monkeypatch.setenv("ORT_INTRA_OP_THREADS", "2")
+    monkeypatch.setenv("ORT_INTER_OP_THREADS", "bogus")
+    monkeypatch.setenv("ORT_GRAPH_OPT", "Extended")
+    monkeypatch.setenv("ORT_MEM_ARENA", "0")
+    cfg = session_config()
+    assert cfg["intra_op_threads"] == 2
+    assert cfg["inter_op_threads"] == 0
+    assert cfg["graph_optimization"] == "extended"
+    assert cfg["mem_arena"] is False
+    assert cfg["execution_mode"] == "sequential"
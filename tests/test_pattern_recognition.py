@@ -0,0 +1,84 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ml.pattern_recognition import PatternRecognition
+
+
+def _write(path, n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    cons = np.array([f"C{i:03d}" for i in range(40)])
+    reg = rng.integers(0, len(cons), n)
+    cast = np.where(rng.random(n) < 0.02, rng.integers(0, len(cons), n), reg)
+    df = pd.DataFrame(
+        {
+            "voter_id": [f"V{i:08d}" for i in rng.integers(0, 4 * n, n)],
+            "casted_constituency": cons[cast],
+            "registered_constituency": cons[reg],
+            "booth": rng.integers(0, 10, n),
+        }
+    )
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_chunked_counts_match_full_pass(tmp_path):
+    path = tmp_path / "votes.csv"
+    df = _write(path)
+    pr = PatternRecognition(chunksize=700)
+    found = pr.detect_irregularities(path)
+    assert pr.last_report == {
+        "rows": len(df),
+        "duplicate_voter_ids": int(df["voter_id"].duplicated().sum()),
+        "outside_constituency": int(
+            (df["casted_constituency"] != df["registered_constituency"]).sum()
+        ),
+    }
+    assert found == [
+        "Duplicate voter IDs detected.",
+        "Votes cast outside registered constituency detected.",
+    ]
+
+
+def test_clean_dataset(tmp_path):
+    path = tmp_path / "clean.csv"
+    pd.DataFrame(
+        {
+            "voter_id": ["A", "B", "C"],
+            "casted_constituency": ["X", "Y", "X"],
+            "registered_constituency": ["X", "Y", "X"],
+        }
+    ).to_csv(path, index=False)
+    pr = PatternRecognition(chunksize=2)
+    assert pr.detect_irregularities(path) == []
+    assert pr.last_report["rows"] == 3
+
+
+def test_missing_constituencies_are_flagged(tmp_path):
+    path = tmp_path / "missing.csv"
+    pd.DataFrame(
+        {
+            "voter_id": ["A", "B", "C", "D"],
+            "casted_constituency": ["X", None, None, "X"],
+            "registered_constituency": ["X", None, "X", None],
+        }
+    ).to_csv(path, index=False)
+    pr = PatternRecognition(chunksize=3)
+    pr.detect_irregularities(path)
+    # Same as comparing the strings: NaN never equals anything
+    assert pr.last_report["outside_constituency"] == 3
@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ml.real_time_analytics import LedgerTail, RealTimeAnalytics
+from voteguard.adapters.audit_log_hashchain import HashChainedAudit
+from voteguard.app import bootstrap
+from voteguard.core.domain import AuditEvent
+
+
+def _event(audit, kind, at, **details):
+    audit.append_event(AuditEvent(kind=kind, details=details, at=at))
+
+
+def test_metrics_follow_ledgers(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("VOTEGUARD_DATA", str(tmp_path))
+    t0 = time.time()
+    now = [t0 + 1]
+    rta = RealTimeAnalytics(tmp_path, window_seconds=60, clock=lambda: now[0])
+    assert rta.poll() == 0
+
+    cv = bootstrap()
+    audit = HashChainedAudit(tmp_path / "audit_ledger.json")
+    _event(audit, "SESSION_STARTED", t0 - 10, session_id="s1")
+    cv.execute("GENERAL", "Party-A", aadhaar="123456789012", voter_id="X0001")
+    _event(audit, "VOTE_STORED", t0, session_id="s1")
+    with pytest.raises(ValueError):
+        cv.execute("GENERAL", "Party-B", aadhaar="123456789012", voter_id="X0001")
+    _event(audit, "SESSION_STARTED", t0, session_id="s2")
+
+    rta.poll()
+    snap = rta.snapshot()
+    assert snap["totals"]["votes"] == 1 and snap["totals"]["ballots"] == 1
+    assert snap["totals"]["double_votes_blocked"] == 1
+    assert snap["votes_per_minute"] == 1.0
+    assert snap["sessions_open"] == 1
+    assert snap["session_duration"]["count"] == 1
+    assert abs(snap["session_duration"]["mean"] - 10.0) < 1e-6
+
+    # Only the appended bytes are read on later polls
+    read_before = rta.audit.bytes_read
+    size_before = (tmp_path / "audit_ledger.json").stat().st_size
+    _event(audit, "SESSION_RESET", t0 + 1, session_id="s2")
+    assert rta.poll() == 1
+    grown = (tmp_path / "audit_ledger.json").stat().st_size - size_before
+    assert rta.audit.bytes_read - read_before < grown + 128
+    assert rta.totals["sessions_abandoned"] == 1
+
+    # Window slides: vote rate drops, totals remain
+    now[0] = t0 + 1000
+    snap = rta.snapshot()
+    assert snap["votes_per_minute"] == 0.0
+    assert snap["session_duration"]["count"] == 0
+    assert snap["totals"]["votes"] == 1
+
+
+def test_tail_restarts_on_replaced_ledger(tmp_path: Path):
+    path = tmp_path / "audit_ledger.json"
+    audit = HashChainedAudit(path)
+    for i in range(3):
+        _event(audit, "X", float(i))
+    tail = LedgerTail(path)
+    assert [r["seq"] for r in tail.poll()] == [1, 2, 3]
+    assert tail.poll() == []
+
+    path.unlink()
+    audit = HashChainedAudit(path)
+    for i in range(5):
+        _event(audit, "Y", float(i))
+    assert [r["seq"] for r in tail.poll()] == [1, 2, 3, 4, 5]
+    assert tail.resets == 1
+
+
+def test_replaced_audit_ledger_is_not_counted_twice(tmp_path: Path):
+    path = tmp_path / "audit_ledger.json"
+    audit = HashChainedAudit(path)
+    t0 = time.time()
+    rta = RealTimeAnalytics(tmp_path, window_seconds=60, clock=lambda: t0 + 1)
+    _event(audit, "SESSION_STARTED", t0 - 5, session_id="s1")
+    _event(audit, "VOTE_STORED", t0, session_id="s1")
+    _event(audit, "vote_stored", t0)
+    _event(audit, "SESSION_STARTED", t0, session_id="s2")
+    rta.poll()
+    assert rta.totals["votes"] == 1 and rta.totals["sessions_completed"] == 1
+
+    # Restore: the same history, rewritten as a new file
+    data = path.read_bytes()
+    path.unlink()
+    path.write_bytes(data.replace(b"\n", b"\n "))
+    rta.poll()
+    assert rta.audit.resets == 1
+    snap = rta.snapshot()
+    assert snap["totals"]["votes"] == 1
+    assert snap["totals"]["sessions_started"] == 2
+    assert snap["totals"]["sessions_completed"] == 1
+    assert snap["votes_per_minute"] == 1.0
+    assert snap["sessions_open"] == 1
+    assert snap["session_duration"]["count"] == 1
@@ -0,0 +1,83 @@
+import os
+import sys
+
+import numpy as np
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ml.demographics_recognizer import DemographicsRecognizer
+from ml.emotion_recognizer import EmotionRecognizer
+
+
+class FakeSession:
+    """Stands in for an ONNX session; class index follows mean brightness."""
+
+    class _Input:
+        name = "input"
+
+    def __init__(self):
+        self.calls = []
+
+    def get_inputs(self):
+        return [self._Input()]
+
+    def run(self, _outputs, feed):
+        batch = feed["input"]
+        self.calls.append(len(batch))
+        logits = np.zeros((len(batch), 8), dtype=np.float32)
+        for i, face in enumerate(batch):
+            logits[i, 1 if face.mean() > 0.5 else 0] = 8.0
+        return [logits]
+
+
+def test_emotion_predict_batch_runs_one_session_call(tmp_path):
+    er = EmotionRecognizer(model_path=tmp_path / "missing.onnx")
+    er.session = FakeSession()
+    faces = [
+        np.full((80, 80, 3), 255, dtype=np.uint8),
+        np.zeros((60, 70, 3), dtype=np.uint8),
+        np.full((90, 90, 3), 255, dtype=np.uint8),
+    ]
+    out = er.predict_batch(faces)
+    assert er.session.calls == [3]
+    assert [label for label, _ in out] == ["Happiness", "Neutral", "Happiness"]
+    assert all(0.9 < conf <= 1.0 for _, conf in out)
+
+
+class FixedBatchAgeGenderSession(FakeSession):
+    """Age/gender model exported with a fixed batch dimension of 1."""
+
+    def run(self, _outputs, feed):
+        batch = feed["input"]
+        self.calls.append(len(batch))
+        if len(batch) != 1:
+            raise RuntimeError("Got invalid dimensions for input: expected 1")
+        bright = batch.mean() > 0
+        age = np.zeros((1, 8), dtype=np.float32)
+        age[0, 7 if bright else 0] = 8.0
+        gender = np.zeros((1, 2), dtype=np.float32)
+        gender[0, 1 if bright else 0] = 8.0
+        return [age, gender]
+
+
+def test_demographics_falls_back_to_per_face_runs_for_fixed_batch_model():
+    dr = DemographicsRecognizer()
+    dr.ort_sess = FixedBatchAgeGenderSession()
+    dr.age_net = dr.gender_net = None
+    faces = [np.full((80, 80, 3), 255, dtype=np.uint8), np.zeros((60, 70, 3), dtype=np.uint8)]
+    out = dr.predict_batch(faces)
+    assert [(o[0], o[2]) for o in out] == [("(60-100)", "Female"), ("(0-2)", "Male")]
+    # The failed batched call is not retried on later frames
+    dr.predict_batch(faces)
+    assert dr.ort_sess.calls == [2, 1, 1, 1, 1]
@@ -0,0 +1,52 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from voteguard.app import bootstrap
+from voteguard.core.tally_cache import TallyCache, cached_tally, ledger_tail
+
+
+def test_cache_hit_and_invalidation(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("VOTEGUARD_DATA", str(tmp_path))
+    cv = bootstrap()
+    ledger = tmp_path / "ballot_ledger.json"
+    key = Path("./key.key")
+    cache = TallyCache(tmp_path / "tally_cache.json")
+    cv.execute("GENERAL", "Party-A", aadhaar="123456789012", voter_id="X0001")
+
+    first = cached_tally(ledger, key, cache=cache)
+    assert first == {"GENERAL": {"Party-A": 1}}
+    assert ledger_tail(ledger)["records"] == 1
+    # A hit is served from the cache without touching the tally
+    cached = TallyCache.cache_key(ledger, key)
+    assert cache.get(ledger, cached) == first
+
+    cv.execute("GENERAL", "Party-B", aadhaar="123456789013", voter_id="X0002")
+    assert cache.get(ledger, TallyCache.cache_key(ledger, key)) is None
+    second = cached_tally(ledger, key, cache=cache)
+    assert second == {"GENERAL": {"Party-A": 1, "Party-B": 1}}
+
+
+def test_edit_before_tail_invalidates_entry(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("VOTEGUARD_DATA", str(tmp_path))
+    cv = bootstrap()
+    ledger = tmp_path / "ballot_ledger.json"
+    key = Path("./key.key")
+    cache = TallyCache(tmp_path / "tally_cache.json")
+    cv.execute("GENERAL", "Party-A", aadhaar="123456789012", voter_id="X0001")
+    cv.execute("GENERAL", "Party-B", aadhaar="123456789013", voter_id="X0002")
+    cached_tally(ledger, key, cache=cache)
+
+    # Tamper with the first record only; the tail (count, last hash) is unchanged
+    stat = ledger.stat()
+    data = json.loads(ledger.read_text("utf-8"))
+    data["records"][0]["ciphertext"] = data["records"][0]["ciphertext"][::-1]
+    ledger.write_text(json.dumps(data, indent=2))
+    os.utime(ledger, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert ledger_tail(ledger)["record_hash"] == data["records"][-1]["record_hash"]
+
+    assert cache.get(ledger, TallyCache.cache_key(ledger, key)) is None
+    with pytest.raises(ValueError):
+        cached_tally(ledger, key, cache=cache)
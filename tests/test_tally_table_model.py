@@ -0,0 +1,45 @@
+import os
+import sys
+
+from PyQt5.QtWidgets import QApplication
+
+# Add src to sys.path for absolute imports
+SRC_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "Phase 1A - Foundation",
+    "Month 3 - Prototype Development",
+    "EVM IoT Application",
+    "src",
+)
+SRC_PATH = os.path.abspath(SRC_PATH)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from ui.tally_table_model import TallyFilterProxy, TallyTableModel
+
+
+def test_model_emits_only_changed_rows_and_filters():
+    app = QApplication.instance() or QApplication([])
+    model = TallyTableModel()
+    proxy = TallyFilterProxy()
+    proxy.setSourceModel(model)
+    proxy.sort(0)
+    model.set_counts({"GENERAL": {"A": 2, "B": 1}, "STATE": {"C": 1}})
+    assert model.rowCount() == 5
+
+    changed_rows = []
+    resets = []
+    model.dataChanged.connect(lambda tl, br, roles: changed_rows.append(tl.row()))
+    model.modelReset.connect(lambda: resets.append(True))
+    model.set_counts({"GENERAL": {"A": 2, "B": 3}, "STATE": {"C": 1}})
+    assert not resets
+    assert {model.election(r) for r in changed_rows} == {"GENERAL"}
+
+    # Proxy orders by count within an election, TOTAL last
+    shown = [proxy.index(r, 1).data() for r in range(proxy.rowCount())]
+    assert shown[:3] == ["B", "A", "TOTAL"]
+    assert proxy.index(0, 3).data() == "60.0%"
+
+    proxy.set_election("STATE")
+    assert [proxy.index(r, 1).data() for r in range(proxy.rowCount())] == ["C", "TOTAL"]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import cv2  # type: ignore
+except Exception:
+    cv2 = None
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None
+
+
+class FacePreprocessor:
+    """
+    Builds the recognizers' input tensors for all faces of a frame at once.
+
+    Each tensor is computed once per face straight from the frame the
+    tracker already converted (grayscale for emotion, BGR for demographics),
+    so no per-recognizer RGB copies are made. Results are written into
+    buffers that are reused across frames and only grow with the face count;
+    the returned arrays are views that stay valid until the next call of the
+    same method.
+    """
+
+    def __init__(self):
+        self._buffers: Dict[Tuple[Any, ...], Any] = {}
+
+    def _buffer(self, key: Tuple[Any, ...], n: int, shape: Tuple[int, ...], dtype):
+        buf = self._buffers.get(key)
+        if buf is None or buf.shape[0] < n:
+            cap = max(n, 2 * buf.shape[0] if buf is not None else 4)
+            buf = np.empty((cap,) + shape, dtype=dtype)
+            self._buffers[key] = buf
+        return buf[:n]
+
+    def gray_tensor(self, gray, boxes: Sequence[Sequence[int]], size: int = 64):
+        """(N,1,size,size) float32 in [0,1]: `EmotionRecognizer.preprocess`."""
+        n = len(boxes)
+        small = self._buffer(("gray8", size), n, (size, size), np.uint8)
+        out = self._buffer(("gray", size), n, (1, size, size), np.float32)
+        for i, (x, y, w, h) in enumerate(boxes):
+            cv2.resize(
+                gray[y : y + h, x : x + w],
+                (size, size),
+                dst=small[i],
+                interpolation=cv2.INTER_AREA,
+            )
+        np.divide(small, np.float32(255.0), out=out[:, 0], dtype=np.float32)
+        return out
+
+    def rgb_blob(
+        self,
+        frame_bgr,
+        boxes: Sequence[Sequence[int]],
+        size: int = 227,
+        mean: Sequence[float] = (0.0, 0.0, 0.0),
+    ):
+        """
+        (N,3,size,size) float32 RGB-ordered, mean-subtracted blob: what
+        `cv2.dnn.blobFromImages(rgb_rois, 1.0, (size, size), mean)` gives,
+        without converting the crops to RGB first.
+        """
+        n = len(boxes)
+        small = self._buffer(("bgr8", size), n, (size, size, 3), np.uint8)
+        out = self._buffer(("blob", size), n, (3, size, size), np.float32)
+        for i, (x, y, w, h) in enumerate(boxes):
+            cv2.resize(
+                frame_bgr[y : y + h, x : x + w],
+                (size, size),
+                dst=small[i],
+                interpolation=cv2.INTER_LINEAR,
+            )
+        mean_arr = np.asarray(mean, dtype=np.float32).reshape(1, 3, 1, 1)
+        # NHWC BGR -> NCHW RGB, then subtract the per-channel mean in place
+        np.subtract(
+            small[..., ::-1].transpose(0, 3, 1, 2), mean_arr, out=out, dtype=np.float32
+        )
+        return out
+
+    @staticmethod
+    def rgb_rois(frame_bgr, boxes: Sequence[Sequence[int]]) -> List[Any]:
+        """RGB crops (allocating); only for recognizer fallbacks without a model."""
+        return [
+            cv2.cvtColor(frame_bgr[y : y + h, x : x + w], cv2.COLOR_BGR2RGB)
+            for x, y, w, h in boxes
+        ]
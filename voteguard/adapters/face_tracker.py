@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import itertools
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import cv2  # type: ignore
+except Exception:
+    cv2 = None
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None
+
+BBox = Tuple[int, int, int, int]
+
+# Templates are matched at most this large; keeps per-frame tracking cheap
+_TEMPLATE_SIZE = 32
+# Smallest face (px) the bundled Haar cascades can find: their window size
+_HAAR_WINDOW = 24
+
+
+def iou(a: BBox, b: BBox) -> float:
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union > 0 else 0.0
+
+
+def effective_detect_scale(scale: float, min_size: Tuple[int, int]) -> float:
+    """`scale` raised so that `min_size` stays at least one cascade window."""
+    return min(1.0, max(scale, _HAAR_WINDOW / max(1, min(min_size))))
+
+
+def detect_faces(
+    cascade,
+    gray,
+    scale: float = 1.0,
+    scale_factor: float = 1.1,
+    min_neighbors: int = 5,
+    min_size: Tuple[int, int] = (60, 60),
+) -> List[BBox]:
+    """
+    Run `cascade.detectMultiScale` on `gray` downsampled by `scale` and map
+    the boxes back to full resolution.
+
+    `min_size` is in full-resolution pixels. The scale is raised when needed
+    so that `min_size` does not shrink below the cascade window, which keeps
+    the smallest detectable face the same as at full resolution.
+    """
+    if cascade is None or cv2 is None:
+        return []
+    scale = effective_detect_scale(scale, min_size)
+    small = gray
+    if scale < 1.0:
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    found = cascade.detectMultiScale(
+        small,
+        scaleFactor=scale_factor,
+        minNeighbors=min_neighbors,
+        minSize=(int(min_size[0] * scale), int(min_size[1] * scale)),
+    )
+    H, W = gray.shape[:2]
+    boxes: List[BBox] = []
+    for x, y, w, h in found:
+        x0, y0 = int(x / scale), int(y / scale)
+        boxes.append((x0, y0, min(int(round(w / scale)), W - x0), min(int(round(h / scale)), H - y0)))
+    return boxes
+
+
+class Track:
+    """One tracked face: box, appearance template and per-face history."""
+
+    def __init__(self, track_id: int, bbox: BBox, history: int = 5):
+        self.track_id = track_id
+        self.bbox = bbox
+        self.template = None
+        self.missed = 0
+        self.emotions: Deque[str] = deque(maxlen=history)
+        # Last recognizer outputs (caller-defined), reused while the face's
+        # ROI is unusable
+        self.emotion: Any = None
+        self.demographics: Any = None
+
+    def smooth_emotion(self, label: str) -> str:
+        """Majority vote over this face's recent emotion labels."""
+        self.emotions.append(label)
+        counts: Dict[str, int] = {}
+        for l in self.emotions:
+            counts[l] = counts.get(l, 0) + 1
+        return max(counts, key=counts.get)
+
+
+class FaceTracker:
+    """
+    Detect-then-track face pipeline.
+
+    The (expensive) detector runs every `redetect_every` frames, or on the
+    next frame after any track is lost; detections are associated with
+    existing tracks by IoU so each face keeps a stable `track_id`. In between,
+    every track is followed by normalized template matching in a small
+    search window around its last box. Tracks unmatched for more than
+    `max_missed` detection passes are dropped.
+    """
+
+    def __init__(
+        self,
+        detect: Callable[[Any], Sequence[Sequence[int]]],
+        redetect_every: int = 5,
+        iou_threshold: float = 0.3,
+        match_threshold: float = 0.5,
+        max_missed: int = 1,
+        history: int = 5,
+    ):
+        self.detect = detect
+        self.redetect_every = max(1, redetect_every)
+        self.iou_threshold = iou_threshold
+        self.match_threshold = match_threshold
+        self.max_missed = max_missed
+        self.history = history
+        self.tracks: List[Track] = []
+        self._ids = itertools.count(1)
+        self._since_detect = 0
+        self._force_detect = True
+        self.stats = {"frames": 0, "detections": 0, "lost": 0}
+
+    def reset(self) -> None:
+        self.tracks = []
+        self._force_detect = True
+
+    def update(self, gray) -> List[Track]:
+        """Advance one grayscale frame; returns the live tracks."""
+        self.stats["frames"] += 1
+        self._since_detect += 1
+        if self._force_detect or self._since_detect >= self.redetect_every:
+            self._detect(gray)
+        else:
+            self._follow(gray)
+        return self.tracks
+
+    def _detect(self, gray) -> None:
+        self.stats["detections"] += 1
+        self._since_detect = 0
+        self._force_detect = False
+        boxes = [tuple(int(v) for v in b) for b in self.detect(gray)]
+        # Greedy IoU association, best-overlapping pairs first
+        pairs = sorted(
+            (
+                (iou(t.bbox, b), ti, bi)
+                for ti, t in enumerate(self.tracks)
+                for bi, b in enumerate(boxes)
+            ),
+            reverse=True,
+        )
+        used_t, used_b = set(), set()
+        for score, ti, bi in pairs:
+            if score < self.iou_threshold:
+                break
+            if ti in used_t or bi in used_b:
+                continue
+            used_t.add(ti)
+            used_b.add(bi)
+            track = self.tracks[ti]
+            track.bbox = boxes[bi]
+            track.missed = 0
+        kept: List[Track] = []
+        for ti, track in enumerate(self.tracks):
+            if ti not in used_t:
+                track.missed += 1
+                if track.missed > self.max_missed:
+                    continue
+            kept.append(track)
+        for bi, box in enumerate(boxes):
+            if bi not in used_b:
+                kept.append(Track(next(self._ids), box, self.history))
+        self.tracks = kept
+        for track in self.tracks:
+            track.template = _template(gray, track.bbox)
+
+    def _follow(self, gray) -> None:
+        for track in self.tracks:
+            moved = _match(gray, track, self.match_threshold)
+            if moved is None:
+                # Lost between detections: keep the old box, re-detect next frame
+                self.stats["lost"] += 1
+                self._force_detect = True
+            else:
+                track.bbox = moved
+
+
+def _template(gray, bbox: BBox):
+    if cv2 is None:
+        return None
+    x, y, w, h = bbox
+    roi = gray[max(0, y) : y + h, max(0, x) : x + w]
+    if roi.size == 0:
+        return None
+    scale = min(1.0, _TEMPLATE_SIZE / max(w, h))
+    if scale < 1.0:
+        roi = cv2.resize(roi, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return roi
+
+
+def _match(gray, track: Track, threshold: float) -> Optional[BBox]:
+    if cv2 is None or track.template is None:
+        return None
+    x, y, w, h = track.bbox
+    H, W = gray.shape[:2]
+    # Search window: the last box grown by half its size on each side
+    x0, y0 = max(0, x - w // 2), max(0, y - h // 2)
+    x1, y1 = min(W, x + w + w // 2), min(H, y + h + h // 2)
+    window = gray[y0:y1, x0:x1]
+    scale = min(1.0, _TEMPLATE_SIZE / max(w, h))
+    if scale < 1.0:
+        window = cv2.resize(window, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    th, tw = track.template.shape[:2]
+    if window.shape[0] < th or window.shape[1] < tw:
+        return None
+    scores = cv2.matchTemplate(window, track.template, cv2.TM_CCOEFF_NORMED)
+    _, best, _, (bx, by) = cv2.minMaxLoc(scores)
+    if best < threshold:
+        return None
+    return (x0 + int(round(bx / scale)), y0 + int(round(by / scale)), w, h)
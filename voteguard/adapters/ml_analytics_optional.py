@@ -12,93 +12,120 @@ try:
 except Exception:
     np = None
 
-# Optional project ML modules
-EmotionRecognizer = None
-DemographicsRecognizer = None
+# Optional project ML modules are imported on first use (see ml.lazy_imports),
+# so importing this adapter never pulls in onnxruntime or deepface/TensorFlow
 try:
-    from ml.emotion_recognizer import EmotionRecognizer as _ER  # type: ignore
-
-    EmotionRecognizer = _ER
+    from ml.lazy_imports import is_available, optional_import  # type: ignore
 except Exception:
-    pass
-try:
-    from ml.demographics_recognizer import DemographicsRecognizer as _DR  # type: ignore
+    is_available = optional_import = None
 
-    DemographicsRecognizer = _DR
-except Exception:
-    pass
+_RECOGNIZERS = {
+    "emotion": ("ml.emotion_recognizer", "EmotionRecognizer"),
+    "demographics": ("ml.demographics_recognizer", "DemographicsRecognizer"),
+}
 
-# In-memory smoothing state (not persisted)
-_last_emotions: List[str] = []
-_max_buffer = 5
+from voteguard.config.env import face_detect_scale, face_quality_gate, face_redetect_every
 
+from .face_preprocess import FacePreprocessor
+from .face_quality import QualityGate
+from .face_tracker import FaceTracker, detect_faces
+from .model_registry import haar_cascade, registry
 
-def _smooth_emotion(label: str) -> str:
-    try:
-        _last_emotions.append(label)
-        if len(_last_emotions) > _max_buffer:
-            _last_emotions.pop(0)
-        # majority vote smoothing
-        counts = {}
-        for l in _last_emotions:
-            counts[l] = counts.get(l, 0) + 1
-        return max(counts, key=counts.get)
-    except Exception:
-        return label
+
+def _recognizer_factory(module: str, cls: str):
+    def _build():
+        mod = optional_import(module) if optional_import is not None else None
+        return getattr(mod, cls)() if mod is not None else None
+
+    return _build
+
+
+# Recognizers are built once per process (on first use) and shared by frames
+for _name, (_module, _cls) in _RECOGNIZERS.items():
+    registry.register(_name, _recognizer_factory(_module, _cls))
+
+
+def _detect_faces(gray) -> List[Any]:
+    # Detect on a downscaled frame; ROIs are still cropped at full resolution
+    return detect_faces(haar_cascade(), gray, scale=face_detect_scale())
 
 
-def _detect_faces(frame) -> List[Any]:
+# Per-process face tracker; emotion smoothing lives on each track (not persisted)
+_tracker = FaceTracker(_detect_faces, redetect_every=face_redetect_every())
+_gate = QualityGate() if face_quality_gate() else None
+_prep = FacePreprocessor()
+
+
+def _track_faces(frame):
     if cv2 is None:
-        return []
+        return None, []
     try:
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
-        )
-        faces = cascade.detectMultiScale(
-            gray, scaleFactor=1.1, minNeighbors=5, minSize=(60, 60)
-        )
-        return faces
+        return gray, list(_tracker.update(gray))
     except Exception:
-        return []
+        _tracker.reset()
+        return None, []
 
 
 def analyze(frame) -> List[Dict[str, Any]]:
-    """Return list of analytics per face: bbox + emotion + age + gender.
+    """Return list of analytics per face: track id + bbox + emotion + age + gender.
+    Faces are detected every few frames and tracked in between, so
+    `track_id` stays stable while a face is in view. Faces whose crop fails
+    the quality gate skip inference and keep their last labels.
     If deps/models missing, returns empty list. Never throws.
     """
     results: List[Dict[str, Any]] = []
     if cv2 is None or np is None:
         return results
     try:
-        faces = _detect_faces(frame)
-        if not faces:
+        gray, tracks = _track_faces(frame)
+        if not tracks:
             return results
-        er = EmotionRecognizer() if EmotionRecognizer is not None else None
-        dr = DemographicsRecognizer() if DemographicsRecognizer is not None else None
-        for x, y, w, h in faces:
-            roi = frame[y : y + h, x : x + w]
-            emotion_label = "Unknown"
-            age_bucket, gender_label = "Unknown", "Unknown"
-            try:
-                if er is not None:
-                    lbl, conf = er.predict(cv2.cvtColor(roi, cv2.COLOR_BGR2RGB))
-                    emotion_label = _smooth_emotion(lbl)
-            except Exception:
-                emotion_label = "Unknown"
-            try:
-                if dr is not None:
-                    age_bucket, age_conf, gender_label, gender_conf = dr.predict(
-                        cv2.cvtColor(roi, cv2.COLOR_BGR2RGB)
+        if _gate is not None:
+            usable = _gate.evaluate(gray, [t.bbox for t in tracks])
+        else:
+            usable = [True] * len(tracks)
+        todo = [t for t, ok in zip(tracks, usable) if ok]
+        er = registry.get("emotion")
+        dr = registry.get("demographics")
+        boxes = [t.bbox for t in todo]
+        n = len(boxes)
+        # One batched inference per recognizer, whatever the face count; each
+        # input tensor is built once per face into reused buffers
+        emotions = [("Unknown", 0.0)] * n
+        demographics = [("Unknown", 0.0, "Unknown", 0.0)] * n
+        try:
+            if er is not None and n:
+                if er.available():
+                    emotions = er.predict_tensor(
+                        _prep.gray_tensor(gray, boxes, er.INPUT_SIZE)
                     )
-            except Exception:
-                age_bucket, gender_label = "Unknown", "Unknown"
+                else:
+                    emotions = er.predict_batch(_prep.rgb_rois(frame, boxes))
+        except Exception:
+            pass
+        try:
+            if dr is not None and n:
+                demographics = dr.predict_blob(
+                    _prep.rgb_blob(frame, boxes, dr.INPUT_SIZE, dr.MEAN)
+                )
+        except Exception:
+            pass
+        for track, (lbl, _conf), demo in zip(todo, emotions, demographics):
+            age_bucket, _age_conf, gender_label, _gender_conf = demo
+            track.emotion = track.smooth_emotion(lbl) if er is not None else "Unknown"
+            track.demographics = (age_bucket, gender_label)
+        for track, ok in zip(tracks, usable):
+            x, y, w, h = track.bbox
+            age_bucket, gender_label = track.demographics or ("Unknown", "Unknown")
             results.append(
                 {
+                    "track_id": track.track_id,
                     "bbox": (int(x), int(y), int(w), int(h)),
-                    "emotion": emotion_label,
+                    "emotion": track.emotion or "Unknown",
                     "age": age_bucket,
                     "gender": gender_label,
+                    "quality_ok": bool(ok),
                 }
             )
         return results
@@ -106,9 +133,30 @@ def analyze(frame) -> List[Dict[str, Any]]:
         return []
 
 
+def quality_stats() -> Dict[str, Any]:
+    """Quality-gate counters for this process (empty when the gate is off)."""
+    if _gate is None:
+        return {}
+    stats: Dict[str, Any] = dict(_gate.stats)
+    stats["pass_rate"] = round(_gate.pass_rate(), 4)
+    return stats
+
+
+def warm_up() -> Dict[str, bool]:
+    """Load the face cascade and recognizers ahead of the first frame."""
+    haar_cascade()
+    return registry.warm_up(["emotion", "demographics"])
+
+
+def unload() -> None:
+    """Release cached recognizers; they are rebuilt on next use."""
+    registry.unload("emotion")
+    registry.unload("demographics")
+
+
 def models_loaded() -> Dict[str, bool]:
-    """Indicate availability of optional ML models."""
+    """Indicate availability of optional ML models (without importing them)."""
     return {
-        "emotion": EmotionRecognizer is not None,
-        "demographics": DemographicsRecognizer is not None,
+        name: is_available is not None and is_available(module)
+        for name, (module, _cls) in _RECOGNIZERS.items()
     }
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import itertools
+import multiprocessing as mp
+import queue
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None
+
+
+def _default_analyzer() -> Callable[[Any], List[Dict[str, Any]]]:
+    from voteguard.adapters.ml_analytics_optional import analyze, warm_up
+
+    warm_up()
+    return analyze
+
+
+def _worker_main(requests, results, analyzer_factory) -> None:
+    """Worker process: attach to frame slots and run face analytics."""
+    analyze = analyzer_factory()
+    attached: Dict[str, shared_memory.SharedMemory] = {}
+    try:
+        while True:
+            msg = requests.get()
+            if msg is None:
+                break
+            req_id, shm_name, shape, dtype = msg
+            shm = attached.get(shm_name)
+            if shm is None:
+                # The spawned child shares the parent's resource tracker, so
+                # the segment stays registered until the parent unlinks it
+                shm = shared_memory.SharedMemory(name=shm_name)
+                attached[shm_name] = shm
+            frame = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            try:
+                out = analyze(frame)
+            except Exception:
+                out = []
+            del frame
+            results.put((req_id, out))
+    finally:
+        for shm in attached.values():
+            try:
+                shm.close()
+            except Exception:
+                pass
+
+
+class MLWorkerClient:
+    """
+    Runs `analyze()` in a separate process so inference does not compete
+    with the UI for the GIL.
+
+    Frames are copied into shared-memory slots; only (request id, slot name,
+    shape, dtype) crosses the queue, and per-face results come back on a
+    result queue. At most `max_in_flight` frames are with the worker; newer
+    submissions wait in a single pending slot where each one replaces the
+    previous (drop-oldest). A dead worker is restarted on the next `poll`,
+    and so is one that has not answered a frame within `hang_timeout`
+    seconds (it is killed first).
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 1,
+        analyzer_factory: Callable[[], Callable[[Any], List[Dict[str, Any]]]] = _default_analyzer,
+        hang_timeout: float = 30.0,
+    ):
+        self.max_in_flight = max(1, max_in_flight)
+        self._factory = analyzer_factory
+        self._ctx = mp.get_context("spawn")
+        self._proc = None
+        self._requests = None
+        self._results = None
+        self._ids = itertools.count(1)
+        self._shape: Optional[Tuple[int, ...]] = None
+        self._dtype = None
+        self._free: Deque[shared_memory.SharedMemory] = deque()
+        self._slots: List[shared_memory.SharedMemory] = []
+        self._in_flight: Dict[int, shared_memory.SharedMemory] = {}
+        self._sent_at: Dict[int, float] = {}
+        self._pending: Optional[shared_memory.SharedMemory] = None
+        self.latest: List[Dict[str, Any]] = []
+        self.restart_backoff = 2.0
+        # Includes model warm-up for the first frame after a (re)start
+        self.hang_timeout = hang_timeout
+        self._next_restart = 0.0
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "dropped": 0,
+            "restarts": 0,
+            "hung": 0,
+        }
+
+    # lifecycle
+    def start(self) -> None:
+        if self._proc is not None and self._proc.is_alive():
+            return
+        self._requests = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._proc = self._ctx.Process(
+            target=_worker_main,
+            args=(self._requests, self._results, self._factory),
+            name="voteguard-ml-worker",
+            daemon=True,
+        )
+        self._proc.start()
+
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.is_alive()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        if self._proc is not None:
+            try:
+                self._requests.put(None)
+                self._proc.join(timeout)
+            except Exception:
+                pass
+            if self._proc.is_alive():
+                self._proc.terminate()
+                self._proc.join(timeout)
+            self._proc = None
+        self._release_slots()
+
+    # frames
+    def _release_slots(self) -> None:
+        for shm in self._slots:
+            try:
+                shm.close()
+                shm.unlink()
+            except Exception:
+                pass
+        self._slots = []
+        self._free.clear()
+        self._in_flight.clear()
+        self._sent_at.clear()
+        self._pending = None
+
+    def _ensure_slots(self, frame) -> None:
+        if self._shape == frame.shape and self._dtype == frame.dtype:
+            return
+        if self._in_flight:
+            # Worker may still read the old slots; let them finish first
+            self._drain(block=True)
+        self._release_slots()
+        self._shape, self._dtype = frame.shape, frame.dtype
+        for _ in range(self.max_in_flight + 1):
+            shm = shared_memory.SharedMemory(create=True, size=max(1, frame.nbytes))
+            self._slots.append(shm)
+            self._free.append(shm)
+
+    def submit(self, frame) -> None:
+        """Queue a frame for analysis; never blocks on the worker."""
+        self._ensure_slots(frame)
+        if self._pending is not None:
+            slot = self._pending
+            self.stats["dropped"] += 1
+        else:
+            slot = self._free.popleft()
+        np.ndarray(frame.shape, dtype=frame.dtype, buffer=slot.buf)[...] = frame
+        self._pending = slot
+        self.stats["submitted"] += 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        if self._pending is None or len(self._in_flight) >= self.max_in_flight:
+            return
+        if self._proc is None:
+            # (Re)start, rate-limited so a worker that dies on import does
+            # not respawn on every frame
+            now = time.monotonic()
+            if now < self._next_restart:
+                return
+            self._next_restart = now + self.restart_backoff
+            self.start()
+        elif not self._proc.is_alive():
+            return
+        req_id = next(self._ids)
+        slot, self._pending = self._pending, None
+        self._in_flight[req_id] = slot
+        self._sent_at[req_id] = time.monotonic()
+        self._requests.put((req_id, slot.name, self._shape, self._dtype.str))
+
+    def _drain(self, block: bool = False) -> None:
+        while self._in_flight:
+            try:
+                req_id, out = (
+                    self._results.get(timeout=1.0)
+                    if block
+                    else self._results.get_nowait()
+                )
+            except queue.Empty:
+                if not block or not self.alive():
+                    return
+                continue
+            slot = self._in_flight.pop(req_id, None)
+            self._sent_at.pop(req_id, None)
+            if slot is not None:
+                self._free.append(slot)
+            self.latest = out
+            self.stats["completed"] += 1
+
+    def _hung(self) -> bool:
+        if not self._sent_at or self.hang_timeout is None:
+            return False
+        return time.monotonic() - min(self._sent_at.values()) > self.hang_timeout
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Collect finished results and return the most recent per-face list."""
+        if self._proc is not None and self._proc.is_alive() and self._hung():
+            # Stuck in native code (or deadlocked): it will never answer
+            self.stats["hung"] += 1
+            self._proc.kill()
+            self._proc.join(1.0)
+        if self._proc is not None and not self._proc.is_alive():
+            # Crashed worker: reclaim its slots; _dispatch starts a new one
+            self._free.extend(self._in_flight.values())
+            self._in_flight.clear()
+            self._sent_at.clear()
+            self._proc = None
+            self.stats["restarts"] += 1
+        self._drain()
+        self._dispatch()
+        return self.latest
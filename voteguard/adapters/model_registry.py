@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+try:
+    import cv2  # type: ignore
+except Exception:
+    cv2 = None
+
+_MISSING = object()
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of ML models (cascades, recognizers, sessions).
+
+    Models are registered as factories and built lazily on first `get`, at
+    most once even when several threads ask concurrently. A factory that
+    fails (or returns None) is remembered as unavailable so per-frame
+    callers do not retry it; `unload` drops the instance (and that memory)
+    so the next `get` rebuilds it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._load_times: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        with self._lock:
+            self._factories.setdefault(name, factory)
+            self._load_locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> Optional[Any]:
+        cached = self._models.get(name, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        with self._lock:
+            factory = self._factories.get(name)
+            load_lock = self._load_locks.get(name)
+        if factory is None:
+            return None
+        with load_lock:
+            cached = self._models.get(name, _MISSING)
+            if cached is not _MISSING:
+                return cached
+            started = time.perf_counter()
+            try:
+                model = factory()
+            except Exception:
+                model = None
+            self._load_times[name] = time.perf_counter() - started
+            self._models[name] = model
+            return model
+
+    def is_loaded(self, name: str) -> bool:
+        return self._models.get(name) is not None
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+        """Load the given (default: all registered) models and run a dummy pass."""
+        with self._lock:
+            targets = list(names if names is not None else self._factories)
+        status: Dict[str, bool] = {}
+        for name in targets:
+            model = self.get(name)
+            warm = getattr(model, "warm_up", None)
+            if callable(warm):
+                try:
+                    warm()
+                except Exception:
+                    pass
+            status[name] = model is not None
+        return status
+
+    def unload(self, name: Optional[str] = None) -> None:
+        """Drop one model (or all) so its memory can be reclaimed."""
+        with self._lock:
+            names = [name] if name is not None else list(self._models)
+            for n in names:
+                self._models.pop(n, None)
+                self._load_times.pop(n, None)
+
+    def load_times(self) -> Dict[str, float]:
+        return dict(self._load_times)
+
+
+registry = ModelRegistry()
+
+
+def haar_cascade(filename: str = "haarcascade_frontalface_default.xml"):
+    """Shared `cv2.CascadeClassifier` for a bundled Haar XML, or None."""
+    if cv2 is None:
+        return None
+    name = "haar:" + filename
+
+    def _load():
+        cascade = cv2.CascadeClassifier(cv2.data.haarcascades + filename)
+        return None if cascade.empty() else cascade
+
+    registry.register(name, _load)
+    return registry.get(name)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+# Modules whose presence in sys.modules means startup paid for the ML stack
+HEAVY_MODULES = ("tensorflow", "deepface", "onnxruntime", "torch", "sklearn", "pandas")
+
+
+class StartupProfile:
+    """
+    Wall-clock timeline of application start-up.
+
+    `stage()` times a block and counts the modules it imported; `mark()`
+    records a point (e.g. the first screen becoming ready). The report also
+    lists lazy ML imports done so far and which heavy modules are loaded.
+    """
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = time.perf_counter() if started is None else started
+        self.stages: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        modules = len(sys.modules)
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append(
+                {
+                    "stage": name,
+                    "seconds": time.perf_counter() - begin,
+                    "modules": len(sys.modules) - modules,
+                }
+            )
+
+    def mark(self, name: str) -> float:
+        """Record `name` at the current time; returns seconds since start."""
+        elapsed = time.perf_counter() - self.started
+        self.stages.append({"stage": name, "at": elapsed})
+        return elapsed
+
+    def report(self) -> Dict[str, Any]:
+        try:
+            from ml.lazy_imports import import_errors, import_times  # type: ignore
+
+            lazy, errors = import_times(), import_errors()
+        except Exception:
+            lazy, errors = {}, {}
+        return {
+            "total_seconds": time.perf_counter() - self.started,
+            "stages": list(self.stages),
+            "lazy_imports": lazy,
+            "lazy_import_errors": errors,
+            "heavy_modules_loaded": [m for m in HEAVY_MODULES if m in sys.modules],
+        }
+
+    def format(self) -> str:
+        rep = self.report()
+        lines = [f"[Startup] total {rep['total_seconds'] * 1000:.0f} ms"]
+        for st in rep["stages"]:
+            if "at" in st:
+                lines.append(f"  {st['stage']:<24} at {st['at'] * 1000:7.0f} ms")
+            else:
+                lines.append(
+                    f"  {st['stage']:<24} {st['seconds'] * 1000:7.0f} ms"
+                    f"  (+{st['modules']} modules)"
+                )
+        for name, secs in rep["lazy_imports"].items():
+            status = "failed" if name in rep["lazy_import_errors"] else "ok"
+            lines.append(f"  lazy {name:<19} {secs * 1000:7.0f} ms  ({status})")
+        heavy = ", ".join(rep["heavy_modules_loaded"]) or "none"
+        lines.append(f"  heavy modules loaded: {heavy}")
+        return "\n".join(lines)
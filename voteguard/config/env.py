@@ -31,3 +31,34 @@ def model_dir() -> Path:
 def overlays_enabled() -> bool:
     """Global toggle for camera/UI overlays (text boxes, labels)."""
     return os.getenv("VOTEGUARD_OVERLAYS", "1") == "1"
+
+
+def ml_out_of_process() -> bool:
+    """Run camera ML analytics in a separate worker process (booth UI)."""
+    return os.getenv("ML_OUT_OF_PROCESS", "1") == "1"
+
+
+def face_redetect_every() -> int:
+    """Frames between full face detections; faces are tracked in between."""
+    try:
+        return max(1, int(os.getenv("FACE_REDETECT_EVERY", "5")))
+    except ValueError:
+        return 5
+
+
+def face_detect_scale() -> float:
+    """Downscale factor for face detection; boxes are mapped back to full size."""
+    try:
+        return min(1.0, max(0.1, float(os.getenv("FACE_DETECT_SCALE", "0.5"))))
+    except ValueError:
+        return 0.5
+
+
+def face_quality_gate() -> bool:
+    """Skip face inference on blurred, tiny or badly exposed ROIs."""
+    return os.getenv("FACE_QUALITY_GATE", "1") == "1"
+
+
+def profile_startup() -> bool:
+    """Print a per-stage startup profile (imports, window, first screen)."""
+    return os.getenv("VOTEGUARD_PROFILE_STARTUP", "0") == "1"
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .counting import _read_ledger, tally_records
+from .tally_cache import ledger_tail
+
+LEDGER_NAME = "ballot_ledger.json"
+
+
+def discover_booths(source: Path, default_key: Optional[Path] = None) -> List[Dict[str, str]]:
+    """
+    List booth ledgers from a manifest file or a directory tree.
+
+    Manifest (JSON): {"booths": [{"booth", "constituency", "ledger", "key"}]}
+    with paths relative to the manifest. Directory: every ballot_ledger.json
+    below `source`; booth = its folder, constituency = the folder above
+    (when inside `source`), key = sibling key.key or `default_key`.
+    """
+    booths: List[Dict[str, str]] = []
+    if source.is_file():
+        data = json.loads(source.read_text("utf-8"))
+        base = source.parent
+        for entry in data.get("booths", []):
+            ledger = (base / entry["ledger"]).resolve()
+            # Manifest keys are relative to the manifest; the fallback key
+            # comes from the caller (CLI) and is relative to the cwd
+            if entry.get("key"):
+                key = (base / entry["key"]).resolve()
+            elif default_key is not None:
+                key = Path(default_key).resolve()
+            else:
+                raise ValueError(f"No key for booth {entry.get('booth')}")
+            booths.append(
+                {
+                    "booth": entry.get("booth") or ledger.parent.name,
+                    "constituency": entry.get("constituency", "UNKNOWN"),
+                    "ledger": str(ledger),
+                    "key": str(key),
+                }
+            )
+        return booths
+
+    for ledger in sorted(source.rglob(LEDGER_NAME)):
+        booth_dir = ledger.parent
+        key = booth_dir / "key.key"
+        if not key.exists():
+            if default_key is None:
+                raise ValueError(f"No key for booth ledger {ledger}")
+            key = default_key
+        rel = booth_dir.relative_to(source).parts
+        booths.append(
+            {
+                "booth": "/".join(rel) or booth_dir.name,
+                "constituency": rel[-2] if len(rel) >= 2 else "UNKNOWN",
+                "ledger": str(ledger.resolve()),
+                "key": str(Path(key).resolve()),
+            }
+        )
+    return booths
+
+
+def _tail_of(records: list) -> Dict[str, Any]:
+    last = records[-1] if records else {}
+    return {"records": len(records), "record_hash": last.get("record_hash", "")}
+
+
+def tally_booth(booth: Dict[str, str]) -> Dict[str, Any]:
+    """Verify and tally one booth ledger. Runs in a worker process."""
+    result: Dict[str, Any] = dict(booth)
+    ledger = Path(booth["ledger"])
+    try:
+        # One parse serves both the checkpoint tail and the tally
+        records = _read_ledger(ledger).get("records", [])
+        result.update(_tail_of(records))
+        result["counts"] = tally_records(records, Path(booth["key"]), verify=True)
+        result["status"] = "OK"
+    except Exception as e:
+        result.setdefault("records", 0)
+        result["counts"] = {}
+        result["status"] = "FAIL"
+        result["error"] = str(e)
+    return result
+
+
+def _load_checkpoint(path: Optional[Path]) -> Dict[str, Dict[str, Any]]:
+    done: Dict[str, Dict[str, Any]] = {}
+    if path is None or not path.exists():
+        return done
+    for line in path.read_text("utf-8").splitlines():
+        try:
+            rec = json.loads(line)
+        except Exception:
+            # torn last line after an interruption
+            continue
+        if rec.get("status") == "OK":
+            done[rec["booth"]] = rec
+        else:
+            # failed booths are always re-tallied (the key may be fixed now)
+            done.pop(rec.get("booth"), None)
+    return done
+
+
+def merge_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reduce per-booth tallies into constituency and election totals."""
+    elections: Dict[str, Dict[str, int]] = {}
+    constituencies: Dict[str, Dict[str, Dict[str, int]]] = {}
+    booths: Dict[str, Any] = {}
+    for r in sorted(results, key=lambda r: r["booth"]):
+        booths[r["booth"]] = {
+            k: r[k]
+            for k in ("constituency", "status", "records", "counts", "error")
+            if k in r
+        }
+        if r["status"] != "OK":
+            continue
+        by_const = constituencies.setdefault(r["constituency"], {})
+        for election, choices in r["counts"].items():
+            for target in (
+                elections.setdefault(election, {}),
+                by_const.setdefault(election, {}),
+            ):
+                for choice, c in choices.items():
+                    target[choice] = target.get(choice, 0) + c
+    return {
+        "elections": elections,
+        "constituencies": constituencies,
+        "booths": booths,
+    }
+
+
+def consolidate(
+    booths: List[Dict[str, str]],
+    workers: Optional[int] = None,
+    checkpoint: Optional[Path] = None,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Tally many booth ledgers in parallel worker processes and merge them.
+
+    Each finished booth is appended to `checkpoint` (JSON lines). On a rerun,
+    booths whose ledger tail (record count + last record_hash) still matches
+    the checkpoint (with the same ledger and key paths) are reused instead of
+    being re-tallied; booths that failed are always tallied again.
+    """
+    started = time.perf_counter()
+    done = _load_checkpoint(checkpoint)
+    results: List[Dict[str, Any]] = []
+    pending: List[Dict[str, str]] = []
+    for booth in booths:
+        prev = done.get(booth["booth"])
+        if (
+            prev is not None
+            and prev.get("ledger") == booth["ledger"]
+            and prev.get("key") == booth["key"]
+        ):
+            try:
+                # End-of-file read; the full parse only happens if re-tallied
+                tail = ledger_tail(Path(booth["ledger"]))
+            except Exception:
+                tail = None
+            if tail and all(prev.get(k) == v for k, v in tail.items()):
+                results.append(prev)
+                continue
+        pending.append(booth)
+
+    processed_records = 0
+    if pending:
+        ckpt = checkpoint.open("a", encoding="utf-8") if checkpoint else None
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(tally_booth, b) for b in pending]
+                for fut in as_completed(futures):
+                    r = fut.result()
+                    results.append(r)
+                    processed_records += r.get("records", 0)
+                    if ckpt is not None:
+                        ckpt.write(json.dumps(r, separators=(",", ":")) + "\n")
+                        ckpt.flush()
+                    if on_result is not None:
+                        on_result(r)
+        finally:
+            if ckpt is not None:
+                ckpt.close()
+
+    elapsed = time.perf_counter() - started
+    merged = merge_results(results)
+    merged["stats"] = {
+        "booths": len(booths),
+        "resumed": len(booths) - len(pending),
+        "processed_records": processed_records,
+        "elapsed_s": round(elapsed, 3),
+        "records_per_s": round(processed_records / elapsed, 1) if elapsed else 0.0,
+    }
+    return merged
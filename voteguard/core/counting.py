@@ -3,11 +3,15 @@ from __future__ import annotations
 import hashlib
 import json
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 from cryptography.fernet import Fernet
 
 
+class LedgerIntegrityError(ValueError):
+    """The ledger's hash chain or sequence numbers do not verify."""
+
+
 def _read_ledger(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text("utf-8"))
 
@@ -33,6 +37,16 @@ def _verify_integrity(records: list) -> Tuple[bool, list]:
     return (len(errors) == 0), errors
 
 
+def verify_chain(ledger_path: Path) -> None:
+    """Check the hash chain without decrypting; raises LedgerIntegrityError."""
+    records = _read_ledger(ledger_path).get("records", [])
+    ok, errors = _verify_integrity(records)
+    if not ok:
+        raise LedgerIntegrityError(
+            "Ledger integrity verification failed: " + "; ".join(errors)
+        )
+
+
 def tally(
     ledger_path: Path, key_path: Path, verify: bool = True
 ) -> Dict[str, Dict[str, int]]:
@@ -44,18 +58,30 @@ def tally(
     if not ledger_path.exists():
         raise FileNotFoundError(f"Ledger not found: {ledger_path}")
     data = _read_ledger(ledger_path)
-    records = data.get("records", [])
+    return tally_records(data.get("records", []), key_path, verify=verify)
 
+
+def tally_records(
+    records: list, key_path: Path, verify: bool = True
+) -> Dict[str, Dict[str, int]]:
+    """Tally already-parsed ledger records (see `tally`)."""
     if verify:
         ok, errors = _verify_integrity(records)
         if not ok:
-            raise ValueError(
+            raise LedgerIntegrityError(
                 "Ledger integrity verification failed: " + "; ".join(errors)
             )
 
-    key = key_path.read_bytes()
-    f = Fernet(key)
     result: Dict[str, Dict[str, int]] = {}
+    for election, choice, _ts in _iter_votes(records, Fernet(key_path.read_bytes())):
+        by_election = result.setdefault(election, {})
+        by_election[choice] = by_election.get(choice, 0) + 1
+
+    return result
+
+
+def _iter_votes(records: list, f: Fernet) -> Iterator[Tuple[str, str, float]]:
+    """Decrypt vote records, yielding (election, choice, ts) per valid vote."""
     for rec in records:
         ct = rec.get("ciphertext")
         if not ct:
@@ -69,7 +95,90 @@ def tally(
         if not election or not choice:
             # malformed; skip without failing the tally
             continue
-        by_election = result.setdefault(election, {})
+        ts = obj.get("meta", {}).get("ts") or 0.0
+        yield election, choice, float(ts)
+
+
+def turnout_bucket(ts: float, bucket_seconds: int) -> str:
+    """Start of the bucket containing `ts`, as a JSON-friendly key."""
+    return str(int(ts // bucket_seconds) * bucket_seconds)
+
+
+def tally_with_turnout(
+    ledger_path: Path,
+    key_path: Path,
+    verify: bool = True,
+    bucket_seconds: int = 60,
+    previous: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Tally votes and build per-election turnout time series in one pass.
+
+    Returns a dict with:
+      - "counts": election -> choice -> count (same as `tally`)
+      - "turnout": election -> bucket start (epoch seconds, str) -> count
+      - "bucket_seconds": bucket width used for "turnout"
+      - "watermark": {"seq", "record_hash"} of the last record folded in
+
+    If `previous` aggregates are given and their watermark still matches the
+    ledger (same record hash at that seq, same bucket width), only records
+    after the watermark are decrypted and folded into copies of them.
+    """
+    if not ledger_path.exists():
+        raise FileNotFoundError(f"Ledger not found: {ledger_path}")
+    data = _read_ledger(ledger_path)
+    records = data.get("records", [])
+
+    if verify:
+        ok, errors = _verify_integrity(records)
+        if not ok:
+            raise LedgerIntegrityError(
+                "Ledger integrity verification failed: " + "; ".join(errors)
+            )
+
+    start = 0
+    counts: Dict[str, Dict[str, int]] = {}
+    turnout: Dict[str, Dict[str, int]] = {}
+    if previous and previous.get("bucket_seconds") == bucket_seconds:
+        mark = previous.get("watermark") or {}
+        seq = mark.get("seq", 0)
+        if 0 < seq <= len(records) and (
+            records[seq - 1].get("record_hash") == mark.get("record_hash")
+        ):
+            start = seq
+            counts = {e: dict(c) for e, c in previous.get("counts", {}).items()}
+            turnout = {e: dict(t) for e, t in previous.get("turnout", {}).items()}
+
+    f = Fernet(key_path.read_bytes())
+    for election, choice, ts in _iter_votes(records[start:], f):
+        by_election = counts.setdefault(election, {})
         by_election[choice] = by_election.get(choice, 0) + 1
+        series = turnout.setdefault(election, {})
+        bucket = turnout_bucket(ts, bucket_seconds)
+        series[bucket] = series.get(bucket, 0) + 1
 
-    return result
+    last = records[-1] if records else {}
+    return {
+        "counts": counts,
+        "turnout": turnout,
+        "bucket_seconds": bucket_seconds,
+        "watermark": {
+            "seq": last.get("seq", 0),
+            "record_hash": last.get("record_hash", "0" * 64),
+        },
+    }
+
+
+def load_aggregates(path: Path) -> Optional[Dict[str, Any]]:
+    """Load aggregates saved by `save_aggregates`; None if missing/unreadable."""
+    try:
+        return json.loads(path.read_text("utf-8"))
+    except Exception:
+        return None
+
+
+def save_aggregates(path: Path, aggregates: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(aggregates, indent=2))
+    tmp.replace(path)
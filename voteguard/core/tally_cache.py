@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .counting import _read_ledger, tally
+
+# Ledger writers use json.dumps(indent=2); the tail record sits in the last KBs.
+_TAIL_BYTES = 8192
+_SEQ_RE = re.compile(rb'"seq":\s*(\d+)')
+_HASH_RE = re.compile(rb'"record_hash":\s*"([0-9a-f]{64})"')
+
+
+def key_fingerprint(key_path: Path) -> str:
+    return hashlib.sha256(key_path.read_bytes()).hexdigest()[:16]
+
+
+def ledger_digest(ledger_path: Path, chunk: int = 1 << 20) -> str:
+    """SHA-256 of the ledger bytes (a sequential read; no JSON parse or decryption)."""
+    digest = hashlib.sha256()
+    with ledger_path.open("rb") as fh:
+        for block in iter(lambda: fh.read(chunk), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def ledger_tail(ledger_path: Path) -> Dict[str, Any]:
+    """
+    Return {"records", "record_hash"} for the last ledger record.
+
+    Reads only the end of the file; falls back to a full parse when the tail
+    cannot be located (e.g. compact JSON or an empty ledger).
+    """
+    size = ledger_path.stat().st_size
+    with ledger_path.open("rb") as fh:
+        fh.seek(max(0, size - _TAIL_BYTES))
+        tail = fh.read()
+    seqs = _SEQ_RE.findall(tail)
+    hashes = _HASH_RE.findall(tail)
+    if seqs and hashes:
+        return {"records": int(seqs[-1]), "record_hash": hashes[-1].decode("ascii")}
+    records = _read_ledger(ledger_path).get("records", [])
+    last = records[-1] if records else {}
+    return {"records": len(records), "record_hash": last.get("record_hash", "")}
+
+
+class TallyCache:
+    """
+    Persistent tally results keyed by (ledger path, last record_hash,
+    record count, size, mtime, SHA-256 of the ledger bytes, key
+    fingerprint). A hit is only possible for byte-identical ledger content,
+    so an edit anywhere in the file (not just at the tail) or a key change
+    invalidates the entry for that ledger.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def _read_json(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.path.read_text("utf-8"))
+        except Exception:
+            return {}
+
+    def _write_json(self, obj) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(obj, indent=2))
+        tmp.replace(self.path)
+
+    @staticmethod
+    def cache_key(ledger_path: Path, key_path: Path) -> Dict[str, Any]:
+        st = ledger_path.stat()
+        key = ledger_tail(ledger_path)
+        key["size"] = st.st_size
+        key["mtime_ns"] = st.st_mtime_ns
+        key["sha256"] = ledger_digest(ledger_path)
+        key["key_fp"] = key_fingerprint(key_path)
+        return key
+
+    def get(
+        self, ledger_path: Path, key: Dict[str, Any], verify: bool = True
+    ) -> Optional[Dict[str, Dict[str, int]]]:
+        """Stored counts if `key` (from `cache_key`) matches the entry."""
+        entry = self._read_json().get(str(ledger_path.resolve()))
+        if not entry or (verify and not entry.get("verified")):
+            return None
+        if any(entry.get(k) != v for k, v in key.items()):
+            return None
+        return entry.get("counts")
+
+    def put(
+        self,
+        ledger_path: Path,
+        key: Dict[str, Any],
+        counts: Dict[str, Dict[str, int]],
+        verified: bool = True,
+    ) -> None:
+        data = self._read_json()
+        entry = dict(key)
+        entry.update({"verified": verified, "counts": counts})
+        data[str(ledger_path.resolve())] = entry
+        self._write_json(data)
+
+
+def cached_tally(
+    ledger_path: Path,
+    key_path: Path,
+    verify: bool = True,
+    cache: Optional[TallyCache] = None,
+) -> Dict[str, Dict[str, int]]:
+    """`tally()` that returns the stored result while the ledger is byte-identical."""
+    if cache is None:
+        return tally(ledger_path, key_path, verify=verify)
+    if not ledger_path.exists():
+        raise FileNotFoundError(f"Ledger not found: {ledger_path}")
+    # Key taken before tallying: a concurrent append then only causes a miss
+    key = TallyCache.cache_key(ledger_path, key_path)
+    hit = cache.get(ledger_path, key, verify=verify)
+    if hit is not None:
+        return hit
+    counts = tally(ledger_path, key_path, verify=verify)
+    try:
+        cache.put(ledger_path, key, counts, verified=verify)
+    except Exception:
+        # cache is an optimization only
+        pass
+    return counts